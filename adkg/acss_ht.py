@@ -6,7 +6,11 @@ from adkg.polynomial import polynomials_over
 from adkg.symmetric_crypto import SymmetricCrypto
 from adkg.utils.misc import wrap_send, subscribe_recv
 from adkg.broadcast.optqrbc import optqrbc
+from adkg.broadcast.ecdispersal import ECDispersal
 from adkg.utils.serilization import Serial
+from adkg.utils.fixed_base import fixed_base
+from adkg.utils.commitment_store import CommitmentStore, DealerCommitments
+from pypairing import G1 as blsG1, blsbatchpow, curve25519batchpow
 
 
 import logging
@@ -25,14 +29,153 @@ class HbAVSSMessageType:
     RECOVERY2 = 6
     KDIBROADCAST = 7
 
+def decode_proposal(sr, n, t, sc, my_id, proposal):
+    g_size = sr.g_size
+    c_size = 32
+    # slices of the view are parsed in place, without copying the payload
+    view = memoryview(proposal)
+
+    # commitments are only decoded on first access
+    com_size = g_size*(t+1)*(sc)
+    commits = DealerCommitments(sr, sc, t, view[0:com_size])
+
+    # deserializing ciphertexts
+    # IMPORTANT: Here 32 additional bytes are used in the ciphertext for padding
+    ctx_size = c_size*2*sc*n
+    my_ctx_start = com_size + c_size*2*sc*my_id
+    my_ctx_end = my_ctx_start + c_size*2*sc
+    ctx_bytes = bytes(view[my_ctx_start:my_ctx_end])
+
+    # deserializing the ephemeral public key
+    ephkey = sr.deserialize_gs(view[com_size+ctx_size:])[0]
+    
+    return (ctx_bytes, commits, ephkey)
+
+
+def decode_piece(sr, t, sc, header, piece):
+    """
+    Decodes this node's view of an erasure-coded dispersal: the header holds
+    the commitments and the ephemeral public key, the piece this node's
+    ciphertext. Returns None if either has the wrong size.
+    """
+    com_size = sr.g_size*(t+1)*(sc)
+    if len(header) != com_size + sr.g_size or len(piece) != 32*2*sc:
+        return None
+    view = memoryview(header)
+    commits = DealerCommitments(sr, sc, t, view[0:com_size])
+    ephkey = sr.deserialize_gs(view[com_size:])[0]
+    return (bytes(piece), commits, ephkey)
+
+
+def check_shares(private_key, my_id, sc, poly_commit, sr, dispersal_msg, commits, ephkey):
+    """
+    Decrypts this node's shares and checks them against the dealer's commitments.
+    Returns (phis, phis_hat, shared_key), or None if the proposal is invalid.
+    Touches no protocol state, so it can run on a worker thread or process.
+    """
+    shared_key = ephkey**private_key
+
+    try:
+        sharesb = SymmetricCrypto.decrypt(shared_key.__getstate__(), dispersal_msg)
+        shares = sr.deserialize_fs(sharesb)
+    except ValueError as e:  # TODO: more specific exception
+        logger.warn(f"Implicate due to failure in decrypting: {e}")
+        return None
+
+    phis, phis_hat = shares[:sc], shares[sc:]
+    # the first secret has a feldman commitment, the rest are hybrid
+    if not poly_commit.verify_eval_many(commits, my_id + 1, phis, [None] + phis_hat):
+        # the per-secret checks only locate the failing index
+        for i in range(sc):
+            if not poly_commit.verify_eval(commits[i], my_id + 1, phis[i], phis_hat[i-1] if i > 0 else None):
+                logger.warn(f"Implicate due to invalid share for secret {i}")
+                break
+        return None
+    return phis, phis_hat, shared_key
+
+
+def check_proposal(params, dispersal_msg, commits, ephkey):
+    """
+    Executor entry point: checks this node's shares of a decoded proposal.
+    `params` is (private_key, my_id, sc, poly_commit, sr).
+    """
+    private_key, my_id, sc, poly_commit, sr = params
+    return check_shares(private_key, my_id, sc, poly_commit, sr, dispersal_msg, commits, ephkey)
+
+
+class DealerBundle:
+    """
+    The part of a dealer's proposal that does not depend on the secrets: the
+    sharing polynomials (as their evaluations at 1..n), their commitments,
+    and the ephemeral key pair with its DH keys for every node. The
+    polynomials share the random `secrets`; `with_values` moves them onto
+    the secrets actually dealt. A bundle must be dealt at most once.
+    """
+    def __init__(self, secrets, commitments, evals, ephemeral_public_key, shared_keys):
+        self.secrets = secrets
+        self.commitments = commitments
+        # evals[k][i] is the k-th share of node i; phis first, then phi_hats
+        self.evals = evals
+        self.ephemeral_public_key = ephemeral_public_key
+        self.shared_keys = shared_keys
+
+    def with_values(self, values, fixed_g):
+        """
+        Shifts phi_k by values[k] - secrets[k]; only the constant-term
+        commitment and the n shares of each changed secret are updated.
+        """
+        for k, value in enumerate(values):
+            if value == self.secrets[k]:
+                continue
+            delta = value - self.secrets[k]
+            self.commitments[k][0] = self.commitments[k][0] * fixed_g.pow(delta)
+            self.evals[k] = [e + delta for e in self.evals[k]]
+            self.secrets[k] = value
+        return self
+
+
+def prepare_dealer_bundle(public_keys, g, n, t, sc, pc, field, G1):
+    """
+    Samples a `DealerBundle` for `sc` secrets. Touches no protocol state, so
+    it can be run ahead of time, e.g. by a `PrecomputePool`.
+    """
+    poly = polynomials_over(field)
+    fixed_g = fixed_base(g)
+    batch_pow = blsbatchpow if G1 is blsG1 else curve25519batchpow
+
+    # Sample B random degree-(t) polynomials of form φ(·)
+    # such that each φ_i(0) = si and φ_i(j) is Pj’s share of si
+    phi = [None]*sc
+    phi_hat = [None]*sc
+    commitments = [None]*sc
+    # BatchPolyCommit
+    #   Cs  <- BatchPolyCommit(SP,φ(·,k))
+    for k in range(sc):
+        phi[k] = poly.random(t)
+        if k == 0:
+            commitments[k] = pc.commit(phi[k], None)
+        else:
+            phi_hat[k] = poly.random(t, field.rand())
+            commitments[k] = pc.commit(phi[k], phi_hat[k])
+
+    ephemeral_secret_key = field.rand()
+    ephemeral_public_key = fixed_g.pow(ephemeral_secret_key)
+    evals = poly.evaluate_many(phi + phi_hat[1:], range(1, n + 1))
+    shared_keys = batch_pow(public_keys[:n], ephemeral_secret_key)
+    return DealerBundle(
+        [phi[k](0) for k in range(sc)], commitments, evals, ephemeral_public_key, shared_keys
+    )
+
+
 class ACSS_HT:
     #@profile
     def __init__(
-            self, public_keys, private_key, g, h, n, t, deg, sc, my_id, send, recv, pc, field, G1
+            self, public_keys, private_key, g, h, n, t, deg, sc, my_id, send, recv, pc, field, G1, executor=None, encrypt_workers=1, commitment_store=None, dispersal="rbc", stripe_threshold=None
     ):  # (# noqa: E501)
         self.public_keys, self.private_key = public_keys, private_key
         self.n, self.t, self.deg, self.my_id = n, t, deg, my_id
         self.g, self.h = g, h 
+        self.fixed_g = fixed_base(g)
         self.sr = Serial(G1)
         self.sc = sc 
         self.poly_commit = pc
@@ -58,6 +201,22 @@ class ACSS_HT:
         self.tagvars = {}
         self.tasks = []
         self.data = {}
+        # Optional concurrent.futures executor for proposal verification
+        self.executor = executor
+        self._verify_tail = None
+        # Threads used by the dealer to encrypt the dispersal message
+        self.encrypt_workers = encrypt_workers
+        # Verified commitments per dealer, shared with the caller if given
+        self.commitments = commitment_store
+        if self.commitments is None:
+            self.commitments = CommitmentStore(self.sr, sc, t)
+        # "rbc" broadcasts the whole proposal; "avid" erasure-codes it so each
+        # node only receives the commitments and its own ciphertext
+        assert dispersal in ("rbc", "avid")
+        self.dispersal = dispersal
+        # "rbc" proposals of at least this many bytes are dispersed in
+        # stripes by `optqrbc`
+        self.stripe_threshold = stripe_threshold
 
     def __enter__(self):
         return self
@@ -66,6 +225,7 @@ class ACSS_HT:
     def kill(self):
         # self.benchmark_logger.info("ACSS kill called")
         self.subscribe_recv_task.cancel()
+        self.subscribe_recv.close()
         # self.benchmark_logger.info("ACSS recv task cancelled")
         for task in self.tasks:
             task.cancel()
@@ -84,7 +244,7 @@ class ACSS_HT:
         """
         commitments =  self.tagvars[tag]['commitments']
         # discard if PKj ! = g^SKj
-        if self.public_keys[j] != self.g**j_sk:
+        if self.public_keys[j] != self.fixed_g.pow(j_sk):
             return False
         # decrypt and verify
         implicate_msg = None #FIXME: IMPORTANT!!
@@ -161,53 +321,46 @@ class ACSS_HT:
             multicast((HbAVSSMessageType.OK, ""))
     
     def decode_proposal(self, proposal):
-        g_size = self.sr.g_size
-        c_size = 32
-
-        # deserializing commitments
-        com_size = g_size*(self.t+1)*(self.sc)
-        commits_all = self.sr.deserialize_gs(proposal[0:com_size])
-        commits = [commits_all[i*(self.t+1):(i+1)*(self.t+1)] for i in range(self.sc)]
-
-        # deserializing ciphertexts
-        # IMPORTANT: Here 32 additional bytes are used in the ciphertext for padding
-        ctx_size = c_size*2*self.sc*self.n
-        my_ctx_start = com_size + c_size*2*self.sc*self.my_id
-        my_ctx_end = my_ctx_start + c_size*2*self.sc
-        ctx_bytes = proposal[my_ctx_start:my_ctx_end]
-
-        # deserializing the ephemeral public key
-        ephkey = self.sr.deserialize_g(proposal[com_size+ctx_size:])
-        
-        return (ctx_bytes, commits, ephkey)
+        return decode_proposal(self.sr, self.n, self.t, self.sc, self.my_id, proposal)
 
-    
     def verify_proposal(self, dealer_id, dispersal_msg, commits, ephkey):
-        shared_key = ephkey**self.private_key
-
-        try:
-            sharesb = SymmetricCrypto.decrypt(shared_key.__getstate__(), dispersal_msg)
-        except ValueError as e:  # TODO: more specific exception
-            logger.warn(f"Implicate due to failure in decrypting: {e}")
-            self.acss_status[dealer_id] = False
-            return False
+        result = check_shares(self.private_key, self.my_id, self.sc, self.poly_commit, self.sr, dispersal_msg, commits, ephkey)
+        return self._record_proposal(dealer_id, commits, ephkey, result)
 
-        shares = self.sr.deserialize_fs(sharesb)
-        phis, phis_hat = shares[:self.sc], shares[self.sc:]
-        # check the feldman commitment of the first secret
-        if not self.poly_commit.verify_eval(commits[0], self.my_id + 1, phis[0], None): 
+    def _record_proposal(self, dealer_id, commits, ephkey, result):
+        if result is None:
             self.acss_status[dealer_id] = False
             return False
-        for i in range(1, self.sc):
-            if not self.poly_commit.verify_eval(commits[i], self.my_id + 1, phis[i], phis_hat[i-1]): 
-                self.acss_status[dealer_id] = False
-                return False
-        
+        phis, phis_hat, shared_key = result
         self.acss_status[dealer_id] = True
-        self.data[dealer_id] = [commits, phis, phis_hat, ephkey, shared_key]
+        self.commitments.add(dealer_id, commits)
+        self.data[dealer_id] = [phis, phis_hat, ephkey, shared_key]
         return True
 
-    
+    async def _verify_proposal_async(self, dealer_id, dispersal_msg, commits, ephkey):
+        """
+        Verifies a decoded proposal on `self.executor`. Results are recorded
+        on the event loop in the order proposals were submitted, so the
+        delivery order matches the sequential mode.
+        """
+        loop = asyncio.get_event_loop()
+        prev, done = self._verify_tail, loop.create_future()
+        self._verify_tail = done
+        try:
+            # A process pool decodes its own pickled copy of the commitments;
+            # ours stays undecoded until a later phase reads it.
+            result = await loop.run_in_executor(
+                self.executor, check_proposal,
+                (self.private_key, self.my_id, self.sc, self.poly_commit, self.sr),
+                dispersal_msg, commits, ephkey,
+            )
+            if prev is not None:
+                await prev
+            return self._record_proposal(dealer_id, commits, ephkey, result)
+        finally:
+            if not done.done():
+                done.set_result(None)
+
     #@profile    
     async def _process_avss_msg(self, avss_id, dealer_id, rbc_msg):
         tag = f"{dealer_id}-{avss_id}-B-AVSS"
@@ -272,55 +425,53 @@ class ACSS_HT:
             if (len(ok_set) == 3 * self.t + 1) and output:
                 logger.debug("[%d] exit", self.my_id)
                 break
+        # late messages of this instance are not needed anymore
+        self.subscribe_recv.unsubscribe(tag)
     #@profile
-    def _get_dealer_msg(self, values, n):
-        # Sample B random degree-(t) polynomials of form φ(·)
-        # such that each φ_i(0) = si and φ_i(j) is Pj’s share of si
-        # The same as B (batch_size)
-        """
-        while len(values) % (batch_size) != 0:
-            values.append(0)
-        """
-        phi = [None]*self.sc
-        phi_hat = [None]*self.sc
-        commitments = [None]*self.sc
-        # BatchPolyCommit
-        #   Cs  <- BatchPolyCommit(SP,φ(·,k))
-        # TODO: Whether we should keep track of that or not
-        for k in range(self.sc):
-            if k == 0:
-                phi[k] = self.poly.random(self.t, values[k])
-                commitments[k] = self.poly_commit.commit(phi[k], None)
-            else:
-                phi[k] = self.poly.random(self.t, values[k])
-                phi_hat[k] = self.poly.random(self.t, self.field.rand())
-                commitments[k] = self.poly_commit.commit(phi[k], phi_hat[k])
-
-
-        ephemeral_secret_key = self.field.rand()
-        ephemeral_public_key = self.g**ephemeral_secret_key
-        dispersal_msg_list = bytearray()
-        for i in range(n):
-            shared_key = self.public_keys[i]**ephemeral_secret_key
-            phis_i = [phi[k](i + 1) for k in range(self.sc)]
-            phis_hat_i = [phi_hat[k](i + 1) for k in range(1, self.sc)]
-            ciphertext = SymmetricCrypto.encrypt(shared_key.__getstate__(), self.sr.serialize_fs(phis_i+ phis_hat_i))
-            dispersal_msg_list.extend(ciphertext)
-
-        g_commits = commitments[0]
+    def _get_dealer_parts(self, values, n, bundle=None):
+        if bundle is None:
+            bundle = prepare_dealer_bundle(self.public_keys, self.g, n, self.t, self.sc, self.poly_commit, self.field, self.sr.G1)
+        bundle.with_values(values, self.fixed_g)
+        evals = bundle.evals
+        plaintexts = [self.sr.serialize_fs([evals_k[i] for evals_k in evals]) for i in range(n)]
+        dispersal_msg_list = SymmetricCrypto.encrypt_many(
+            [shared_key.__getstate__() for shared_key in bundle.shared_keys], plaintexts, self.encrypt_workers
+        )
+
+        g_commits = bundle.commitments[0]
         for k in range(1, self.sc):
-            g_commits = g_commits + commitments[k]
-        datab = self.sr.serialize_gs(g_commits) # Serializing commitments
-        datab.extend(dispersal_msg_list)
-        datab.extend(self.sr.serialize_g(ephemeral_public_key))
+            g_commits = g_commits + bundle.commitments[k]
+        # (commitments, ciphertexts of nodes 0..n-1, ephemeral public key)
+        return (
+            self.sr.serialize_gs(g_commits),
+            dispersal_msg_list,
+            self.sr.serialize_g(bundle.ephemeral_public_key),
+        )
 
+    def _get_dealer_msg(self, values, n, bundle=None):
+        datab, dispersal_msg_list, ephkeyb = self._get_dealer_parts(values, n, bundle)
+        datab.extend(dispersal_msg_list)
+        datab.extend(ephkeyb)
         return bytes(datab)
+
+    def _get_dealer_pieces(self, values, n, bundle=None):
+        """
+        Splits the proposal for `ECDispersal`: a header with the commitments
+        and the ephemeral public key, and node i's ciphertext as its piece.
+        """
+        commitsb, dispersal_msg_list, ephkeyb = self._get_dealer_parts(values, n, bundle)
+        ctx_size = SymmetricCrypto.ciphertext_size(self.sr.f_size*(2*self.sc-1))
+        view = memoryview(dispersal_msg_list)
+        pieces = [bytes(view[i*ctx_size:(i+1)*ctx_size]) for i in range(n)]
+        return (bytes(commitsb + ephkeyb), pieces)
     
     #@profile
     def _handle_dealer_msgs(self, tag, dealer_id):
-        commits, phis, phis_hat, ephkey, shared_key = self.data[dealer_id]
+        if dealer_id not in self.data:
+            return False
+        phis, phis_hat, ephkey, shared_key = self.data[dealer_id]
         self.tagvars[tag]['shared_key'] = shared_key
-        self.tagvars[tag]['commitments'] = commits
+        self.tagvars[tag]['commitments'] = self.commitments[dealer_id]
         self.tagvars[tag]['ephemeral_public_key'] = ephkey
         
         # shares = self.sr.deserialize_fs(sharesb)
@@ -332,9 +483,10 @@ class ACSS_HT:
         return False
 
     #@profile
-    async def avss(self, avss_id, values=None, dealer_id=None):
+    async def avss(self, avss_id, values=None, dealer_id=None, bundle=None):
         """
-        An acss with share recovery
+        An acss with share recovery. The dealer may pass a precomputed
+        `DealerBundle`, which is then shifted onto `values`.
         """
         # If `values` is passed then the node is a 'Sender'
         # `dealer_id` must be equal to `self.my_id`
@@ -362,31 +514,54 @@ class ACSS_HT:
         self.tagvars[acsstag] = {}
         self.tagvars[acsstag]['tasks'] = []
 
-        broadcast_msg = None
-        if self.my_id == dealer_id:
-            broadcast_msg = self._get_dealer_msg(values, n)
-
         send, recv = self.get_send(rbctag), self.subscribe_recv(rbctag)
         logger.debug("[%d] Starting reliable broadcast", self.my_id)
 
-        async def predicate(_m):
-            dispersal_msg, commits, ephkey = self.decode_proposal(_m)
+        async def verify(dispersal_msg, commits, ephkey):
+            if self.executor is not None:
+                return await self._verify_proposal_async(dealer_id, dispersal_msg, commits, ephkey)
             return self.verify_proposal(dealer_id, dispersal_msg, commits, ephkey)
-        
+
         output = asyncio.Queue()
-        asyncio.create_task(
-        optqrbc(
-            rbctag,
-            self.my_id,
-            self.n,
-            self.t,
-            dealer_id,
-            predicate,
-            broadcast_msg,
-            output.put_nowait,
-            send,
-            recv,
-        ))
+        if self.dispersal == "avid":
+            dealer_pieces = None
+            if self.my_id == dealer_id:
+                dealer_pieces = self._get_dealer_pieces(values, n, bundle)
+
+            async def piece_predicate(header, piece):
+                decoded = decode_piece(self.sr, self.t, self.sc, header, piece)
+                if decoded is None:
+                    return False
+                return await verify(*decoded)
+
+            ecd = ECDispersal(rbctag, self.my_id, self.n, self.t, dealer_id, send, recv)
+            # keeps serving retrievals for the other nodes until `kill`
+            self.tasks.append(asyncio.create_task(
+                ecd.disperse(piece_predicate, dealer_pieces, lambda header, piece: output.put_nowait(piece))
+            ))
+        else:
+            broadcast_msg = None
+            if self.my_id == dealer_id:
+                broadcast_msg = self._get_dealer_msg(values, n, bundle)
+
+            async def predicate(_m):
+                return await verify(*self.decode_proposal(_m))
+
+            # keeps serving the fallback for the other nodes until `kill`
+            self.tasks.append(asyncio.create_task(
+            optqrbc(
+                rbctag,
+                self.my_id,
+                self.n,
+                self.t,
+                dealer_id,
+                predicate,
+                broadcast_msg,
+                output.put_nowait,
+                send,
+                recv,
+                stripe_threshold=self.stripe_threshold,
+            )))
         rbc_msg = await output.get()
 
         # avss processing
@@ -2,13 +2,24 @@ from adkg.polynomial import polynomials_over
 from adkg.utils.poly_misc import interpolate_g1_at_x
 from adkg.utils.misc import wrap_send, subscribe_recv
 import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import hashlib, time
 from math import ceil
 import logging
 from adkg.utils.bitmap import Bitmap
-from adkg.acss_ht import ACSS_HT
+from adkg.utils.readiness import DealerReadiness
+from adkg.utils.tracing import NULL_TRACER
+from adkg.acss_ht import ACSS_HT, prepare_dealer_bundle
+from adkg.utils.precompute import PrecomputePool
+from functools import partial
+from adkg.incremental_reconstruction import IncrementalReconstruction
+from adkg.utils.fixed_base import fixed_base
+from adkg.utils.commitment_store import CommitmentStore
+from adkg.utils.serilization import Serial
 
 from adkg.broadcast.tylerba import tylerba
+from adkg.broadcast.vectorba import VectorABA
+from adkg.broadcast.dleqcoin import ThresholdCoinKey
 from adkg.broadcast.optqrbc import optqrbc
 
 import logging
@@ -22,79 +33,185 @@ class ADKGMsgType:
     PREKEY = "P"
     KEY = "K"
     
+def hash_to_zr(ZR, *elems):
+    """
+    Hashes group/field elements to ZR using their canonical byte encodings.
+    """
+    hs = hashlib.sha256(b"".join(elem.__getstate__() for elem in elems)).digest()
+    return ZR.hash(hs)
+
+def dealer_pool(public_keys, g, n, t, deg, pc, curve_params, depth, executor=None, batches=1):
+    """
+    Returns a `PrecomputePool` of `depth` ACSS dealer bundles for ADKG runs
+    with these parameters; pass it to every run as `dealer_pool`.
+    """
+    ZR, G1 = curve_params[0], curve_params[1]
+    sc = 1 + batches*ceil((deg+1)/(t+1))
+    make = partial(prepare_dealer_bundle, public_keys, g, n, t, sc, pc, ZR, G1)
+    return PrecomputePool(make, depth, executor)
+
 class CP:
-    def __init__(self, g, h, ZR):
+    def __init__(self, g, h, ZR, multiexp, fixed_h=True):
         self.g  = g
         self.h = h
         self.ZR = ZR
+        self.multiexp = multiexp
+        # a one-off h (e.g. a coin's per-round base) is not worth a table
+        self.fixed_g = fixed_base(g)
+        self.fixed_h = fixed_base(h) if fixed_h else None
 
     def dleq_derive_chal(self, x, y, a1, a2):
-        commit = str(x)+str(y)+str(a1)+str(a2)
-        try:
-            commit = commit.encode()
-        except AttributeError:
-            pass 
-        hs =  hashlib.sha256(commit).digest() 
-        return self.ZR.hash(hs)
-
-    def dleq_verify(self, x, y, chal, res):
-        a1 = self.multiexp([x, self.g],[chal, res])
-        a2 = self.multiexp([y, self.h],[chal, res])
-
-        eLocal = self.dleq_derive_chal(x, a1, y, a2)
-        return eLocal == chal
+        return hash_to_zr(self.ZR, self.g, self.h, x, y, a1, a2)
+
+    def dleq_verify(self, x, y, proof):
+        a1, a2, res = proof
+        chal = self.dleq_derive_chal(x, y, a1, a2)
+        return self.multiexp([x, self.g],[chal, res]) == a1 and self.multiexp([y, self.h],[chal, res]) == a2
+
+    def dleq_batch_verify(self, proofs):
+        """
+        Verifies a list of (x, y, proof) tuples with a single random linear
+        combination. Returns a list of booleans, one per proof; proofs are
+        checked individually only when the combined check fails.
+        """
+        if len(proofs) == 0:
+            return []
+        bases, exps = [self.g, self.h], [self.ZR(0), self.ZR(0)]
+        for x, y, (a1, a2, res) in proofs:
+            chal = self.dleq_derive_chal(x, y, a1, a2)
+            rho1, rho2 = self.ZR.rand(), self.ZR.rand()
+            exps[0] = exps[0] + rho1*res
+            exps[1] = exps[1] + rho2*res
+            bases.extend([x, a1, y, a2])
+            exps.extend([rho1*chal, -rho1, rho2*chal, -rho2])
+        if self.multiexp(bases, exps) == type(self.g).identity():
+            return [True]*len(proofs)
+        return [self.dleq_verify(x, y, proof) for x, y, proof in proofs]
 
     def dleq_prove(self, alpha, x, y):
-        w = self.ZR.random()
-        a1 = self.g**w
-        a2 = self.h**w
-        e = self.dleq_derive_chal(x, a1, y, a2)
-        return  e, w - e*alpha # return (challenge, response)
+        w = self.ZR.rand()
+        a1 = self.fixed_g.pow(w)
+        a2 = self.fixed_h.pow(w) if self.fixed_h is not None else self.h ** w
+        e = self.dleq_derive_chal(x, y, a1, a2)
+        return  a1, a2, w - e*alpha # return (commitments, response)
 
 class PoK:
     def __init__(self, g, ZR, multiexp):
         self.g  = g
         self.ZR = ZR
         self.multiexp = multiexp
+        self.fixed_g = fixed_base(g)
 
     def pok_derive_chal(self, x, a):
-        commit = str(x)+str(a)
-        try:
-            commit = commit.encode()
-        except AttributeError:
-            pass 
-        hs =  hashlib.sha256(commit).digest() 
-        return self.ZR.hash(hs)
-
-    def pok_verify(self, x, chal, res):
-        a = self.multiexp([x, self.g],[chal, res])
-        eLocal = self.pok_derive_chal(x, a)
-        return eLocal == chal
+        return hash_to_zr(self.ZR, self.g, x, a)
+
+    def pok_verify(self, x, proof):
+        a, res = proof
+        chal = self.pok_derive_chal(x, a)
+        return self.multiexp([x, self.g],[chal, res]) == a
+
+    def batch_pok_verify(self, proofs):
+        """
+        Verifies a list of (x, proof) tuples with a single random linear
+        combination. Returns a list of booleans, one per proof; proofs are
+        checked individually only when the combined check fails.
+        """
+        if len(proofs) == 0:
+            return []
+        bases, exps = [self.g], [self.ZR(0)]
+        for x, (a, res) in proofs:
+            chal = self.pok_derive_chal(x, a)
+            rho = self.ZR.rand()
+            exps[0] = exps[0] + rho*res
+            bases.extend([x, a])
+            exps.extend([rho*chal, -rho])
+        if self.multiexp(bases, exps) == type(self.g).identity():
+            return [True]*len(proofs)
+        return [self.pok_verify(x, proof) for x, proof in proofs]
 
     def pok_prove(self, alpha, x):
         w = self.ZR.rand()
-        a = self.g**w
+        a = self.fixed_g.pow(w)
         e = self.pok_derive_chal(x, a)
-        return  e, w - e*alpha # return (challenge, response)
+        return  a, w - e*alpha # return (commitment, response)
     
+class CoinKeys:
+    """
+    Threshold coin keys for the ABA instances of one ADKG. An ABA's coin is
+    keyed by the first secret shared by the dealers its RBC proposed, whose
+    commitments are g^coeffs, so the coin works on the ADKG's own curve; the
+    keys of each dealer set are derived once and shared by every instance
+    that uses that set.
+    """
+    def __init__(self, n, t, my_id, g, ZR, multiexp, commitments, acss_outputs):
+        self.n, self.t, self.my_id = n, t, my_id
+        self.g, self.ZR, self.multiexp = g, ZR, multiexp
+        self.commitments, self.acss_outputs = commitments, acss_outputs
+        self._keys = {}
+
+    def get(self, dealers):
+        """
+        Returns the `ThresholdCoinKey` for `dealers`.
+        """
+        dealers = frozenset(dealers)
+        if dealers not in self._keys:
+            skj = self.ZR(0)
+            for dealer in dealers:
+                skj = skj + self.acss_outputs[dealer]['shares']['msg'][0]
+            pkj = self.commitments.eval_sum_all(dealers, 0, self.n)
+            self._keys[dealers] = ThresholdCoinKey(self.g, pkj, skj, self.ZR, self.multiexp)
+        return self._keys[dealers]
+
 class ADKG:
-    def __init__(self, public_keys, private_key, g, h, n, t, deg, my_id, send, recv, pc, curve_params, matrices):
+    def __init__(self, public_keys, private_key, g, h, n, t, deg, my_id, send, recv, pc, curve_params, matrices, tracer=NULL_TRACER, verify_workers=0, verify_mode="thread", dispersal="rbc", dealer_pool=None, batches=1, stripe_threshold=None, aba="tylerba", encrypt_workers=1):
         self.public_keys, self.private_key, self.g, self.h = (public_keys, private_key, g, h)
         self.n, self.t, self.deg, self.my_id = (n, t, deg, my_id)
+        # Secrets per key: `sc-1` for the key plus secret 0, which seeds the
+        # ABA coins. With several `batches`, every dealer shares the coin
+        # secret once and then sc-1 secrets for each key, all in one ACSS.
         self.sc = ceil((deg+1)/(t+1)) + 1
+        self.batches = batches
+        self.acss_sc = 1 + batches*(self.sc-1)
         self.send, self.recv, self.pc = (send, recv, pc)
-        self.ZR, self.G1, self.multiexp, self.dotprod = curve_params
+        self.ZR, self.G1, self.multiexp, self.dotprod, self.matvec = curve_params
         self.poly = polynomials_over(self.ZR)
         self.poly.clear_cache() #FIXME: Not sure why we need this.
         # Create a mechanism to split the `recv` channels based on `tag`
         self.subscribe_recv_task, self.subscribe_recv = subscribe_recv(recv)
         self.matrix = matrices
+        # Row i stacks the i-th rows of all sc-1 extraction matrices so that
+        # every PREKEY share is a single matrix-vector product.
+        self.stacked_rows = [
+            [m for sec in range(self.sc-1) for m in self.matrix[sec][i]] for i in range(self.n)
+        ]
 
         # Create a mechanism to split the `send` channels based on `tag`
         def _send(tag):
             return wrap_send(tag, send)
         self.get_send = _send
         self.output_queue = asyncio.Queue()
+        self.tracer = tracer
+        self.rbc_tasks = []
+        # Dealers' ACSS commitments, decoded once and shared by all phases
+        self.commitments = CommitmentStore(Serial(self.G1), self.acss_sc, self.t, self.ZR, self.multiexp)
+        # ACSS proposals are verified on the event loop unless workers are
+        # configured; "thread" relies on pypairing releasing the GIL.
+        self.verify_executor = None
+        if verify_workers > 0:
+            assert verify_mode in ("thread", "process")
+            executor_cls = ThreadPoolExecutor if verify_mode == "thread" else ProcessPoolExecutor
+            self.verify_executor = executor_cls(max_workers=verify_workers)
+        # How ACSS proposals are dispersed, see `ACSS_HT`
+        self.dispersal = dispersal
+        self.stripe_threshold = stripe_threshold
+        # Threads the dealer encrypts its dispersal message with
+        self.encrypt_workers = encrypt_workers
+        # Optional PrecomputePool of DealerBundles for this node's ACSS
+        self.dealer_pool = dealer_pool
+        # "tylerba" runs one task per ABA instance, "vector" drives all n
+        # from one `VectorABA`
+        assert aba in ("tylerba", "vector")
+        self.aba = aba
 
 
         self.benchmark_logger = logging.LoggerAdapter(
@@ -102,8 +219,13 @@ class ADKG:
         )
             
     def kill(self):
+        if self.verify_executor is not None:
+            self.verify_executor.shutdown(wait=False)
         try:
             self.subscribe_recv_task.cancel()
+            self.subscribe_recv.close()
+            for task in self.rbc_tasks:
+                task.cancel()
             for task in self.acss_tasks:
                 task.cancel()
             self.acss.kill()
@@ -118,28 +240,27 @@ class ADKG:
     def __exit__(self, type, value, traceback):
         return self
 
-    async def acss_step(self, outputs, values, acss_signal):
+    async def acss_step(self, outputs, values, acss_ready, bundle=None):
         acsstag = ADKGMsgType.ACSS
         acsssend, acssrecv = self.get_send(acsstag), self.subscribe_recv(acsstag)
-        self.acss = ACSS_HT(self.public_keys, self.private_key, self.g, self.h, self.n, self.t, self.deg, self.sc, self.my_id, acsssend, acssrecv, self.pc, self.ZR, self.G1)
+        self.acss = ACSS_HT(self.public_keys, self.private_key, self.g, self.h, self.n, self.t, self.deg, self.acss_sc, self.my_id, acsssend, acssrecv, self.pc, self.ZR, self.G1, executor=self.verify_executor, encrypt_workers=self.encrypt_workers, commitment_store=self.commitments, dispersal=self.dispersal, stripe_threshold=self.stripe_threshold)
         self.acss_tasks = [None] * self.n
         for i in range(self.n):
             if i == self.my_id:
-                self.acss_tasks[i] = asyncio.create_task(self.acss.avss(0, values=values))
+                self.acss_tasks[i] = asyncio.create_task(self.acss.avss(0, values=values, bundle=bundle))
             else:
                 self.acss_tasks[i] = asyncio.create_task(self.acss.avss(0, dealer_id=i))
 
         while True:
             (dealer, _, shares, commitments) = await self.acss.output_queue.get()
             outputs[dealer] = {'shares':shares, 'commits':commitments}
-            if len(outputs) >= self.n - self.t:
-                # print("Player " + str(self.my_id) + " Got shares from: " + str([output for output in outputs]))
-                acss_signal.set()
+            self.tracer.event("acss", "output", dealer=dealer)
+            acss_ready.mark_ready(dealer)
 
             if len(outputs) == self.n:
                 return    
 
-    async def commonsubset(self, rbc_out, acss_outputs, acss_signal, rbc_signal, rbc_values, coin_keys, aba_in, aba_out):
+    async def commonsubset(self, rbc_out, acss_outputs, acss_ready, rbc_signal, rbc_values, coin_keys, aba_in, aba_out):
         assert len(rbc_out) == self.n
         assert len(aba_in) == self.n
         assert len(aba_out) == self.n
@@ -160,16 +281,8 @@ class ADKG:
                 aba_inputted[j] = True
                 aba_in[j](1)
             
-            subset = True
-            while True:
-                acss_signal.clear()
-                for k in rbc_values[j]:
-                    if k not in acss_outputs.keys():
-                        subset = False
-                if subset:
-                    coin_keys[j]((acss_outputs, rbc_values[j]))
-                    return
-                await acss_signal.wait()
+            await acss_ready.wait_subset(rbc_values[j])
+            coin_keys[j]((self.coin_keys, rbc_values[j]))
 
         r_threads = [asyncio.create_task(_recv_rbc(j)) for j in range(self.n)]
 
@@ -198,12 +311,13 @@ class ADKG:
 
         rbc_signal.set()
 
-    async def agreement(self, key_proposal, acss_outputs, acss_signal):
+    async def agreement(self, key_proposal, acss_outputs, acss_ready):
         aba_inputs = [asyncio.Queue() for _ in range(self.n)]
         aba_outputs = [asyncio.Queue() for _ in range(self.n)]
         rbc_outputs = [asyncio.Queue() for _ in range(self.n)]
         
         coin_keys = [asyncio.Queue() for _ in range(self.n)]
+        self.coin_keys = CoinKeys(self.n, self.t, self.my_id, self.g, self.ZR, self.multiexp, self.commitments, acss_outputs)
 
         async def predicate(_key_proposal):
             kp = Bitmap(self.n, _key_proposal)
@@ -214,16 +328,8 @@ class ADKG:
             if len(kpl) <= self.t:
                 return False
         
-            while True:
-                subset = True
-                for kk in kpl:
-                    if kk not in acss_outputs.keys():
-                        subset = False
-                if subset:
-                    acss_signal.clear()    
-                    return True
-                acss_signal.clear()
-                await acss_signal.wait()
+            await acss_ready.wait_subset(kpl)
+            return True
 
         async def _setup(j):
             
@@ -239,7 +345,7 @@ class ADKG:
                 rbc_input = bytes(riv.array)
 
             # rbc_outputs[j] = 
-            asyncio.create_task(
+            self.rbc_tasks.append(asyncio.create_task(
                 optqrbc(
                     rbctag,
                     self.my_id,
@@ -251,8 +357,12 @@ class ADKG:
                     rbc_outputs[j].put_nowait,
                     rbcsend,
                     rbcrecv,
+                    tracer=self.tracer,
                 )
-            )
+            ))
+
+            if self.aba == "vector":
+                return None
 
             abatag = ADKGMsgType.ABA + str(j) # (B, msg)
             # abatag = j # (B, msg)
@@ -273,11 +383,28 @@ class ADKG:
                     aba_outputs[j].put_nowait,
                     bcast,
                     abarecv,
+                    tracer=self.tracer,
                 )
             )
             return aba_task
 
         work_tasks = await asyncio.gather(*[_setup(j) for j in range(self.n)])
+        aba_in = [_.put_nowait for _ in aba_inputs]
+        if self.aba == "vector":
+            abasend, abarecv = self.get_send(ADKGMsgType.ABA), self.subscribe_recv(ADKGMsgType.ABA)
+            vaba = VectorABA(
+                ADKGMsgType.ABA,
+                self.my_id,
+                self.n,
+                self.t,
+                [_.get for _ in coin_keys],
+                [_.put_nowait for _ in aba_outputs],
+                abasend,
+                abarecv,
+                tracer=self.tracer,
+            )
+            work_tasks = [asyncio.create_task(vaba.run())]
+            aba_in = [partial(vaba.input, j) for j in range(self.n)]
         rbc_signal = asyncio.Event()
         rbc_values = [None for i in range(self.n)]
 
@@ -285,23 +412,33 @@ class ADKG:
             self.commonsubset(
                 rbc_outputs,
                 acss_outputs,
-                acss_signal,
+                acss_ready,
                 rbc_signal,
                 rbc_values,
                 [_.put_nowait for _ in coin_keys],
-                [_.put_nowait for _ in aba_inputs],
+                aba_in,
                 [_.get for _ in aba_outputs],
             ),
-            self.derive_key(
+            self.derive_keys(
                 acss_outputs,
-                acss_signal,
+                acss_ready,
                 rbc_values,
                 rbc_signal,
             ),
             work_tasks,
         )
 
-    async def derive_key(self, acss_outputs, acss_signal, rbc_values, rbc_signal):
+    def key_offset(self, batch):
+        """
+        Index of the first ACSS secret of key `batch`.
+        """
+        return 1 + batch*(self.sc-1)
+
+    async def derive_keys(self, acss_outputs, acss_ready, rbc_values, rbc_signal):
+        """
+        Derives all `batches` keys from the agreed dealer set, concurrently.
+        Returns one (mks, secret, pk) per key.
+        """
         await rbc_signal.wait()
         rbc_signal.clear()
 
@@ -313,112 +450,129 @@ class ADKG:
                     break
         
         # Waiting for all ACSS to terminate
-        for k in self.mks:
-            if k not in acss_outputs:
-                await acss_signal.wait()
-                acss_signal.clear()
-
-        secrets = [[self.ZR(0)]*self.n for _ in range(self.sc-1)]
-        randomness = [[self.ZR(0)]*self.n for _ in range(self.sc-1)]
-        commits = [[self.G1.identity()]*self.n for _ in range(self.sc-1)]
+        await acss_ready.wait_subset(self.mks)
+
+        return await asyncio.gather(
+            *[self.derive_key(acss_outputs, batch) for batch in range(self.batches)]
+        )
+
+    async def derive_key(self, acss_outputs, batch=0):
+        offset = self.key_offset(batch)
+        zero = self.ZR(0)
+        secrets = [zero]*(self.n*(self.sc-1))
+        randomness = [zero]*(self.n*(self.sc-1))
         for idx in range(self.sc-1):
-            for node in range(self.n):
-                if node in self.mks:
-                    secrets[idx][node] = acss_outputs[node]['shares']['msg'][idx+1]
-                    randomness[idx][node] = acss_outputs[node]['shares']['rand'][idx]
-                    commits[idx][node] = acss_outputs[node]['commits'][idx+1][0]
-        
-    
-        z_shares = [self.ZR(0)]*self.n
-        r_shares = [self.ZR(0)]*self.n
-        for i in range(self.n):
-            for sec in range(self.sc-1):
-                z_shares[i] = z_shares[i] + self.dotprod(self.matrix[sec][i], secrets[sec])
-                r_shares[i] = r_shares[i] + self.dotprod(self.matrix[sec][i], randomness[sec])
+            for node in self.mks:
+                secrets[idx*self.n + node] = acss_outputs[node]['shares']['msg'][offset+idx]
+                randomness[idx*self.n + node] = acss_outputs[node]['shares']['rand'][offset-1+idx]
+
+        z_shares = self.matvec(self.stacked_rows, secrets)
+        r_shares = self.matvec(self.stacked_rows, randomness)
 
-        
         # Sending PREKEY messages
-        keytag = ADKGMsgType.PREKEY
+        keytag = ADKGMsgType.PREKEY + str(batch)
         send, recv = self.get_send(keytag), self.subscribe_recv(keytag)
 
         for i in range(self.n):
             send(i, (z_shares[i], r_shares[i]))
+        self.tracer.mark("prekey_sent")
         
-        sk_shares = []
-        rk_shares = []
-
-        secret, random = None, None
-        while True:
+        # Commitments to the coefficients of the polynomial that shares my
+        # key share, computed once before any PREKEY message is processed.
+        mks = sorted(self.mks)
+        weights = [self.matrix[sec][self.my_id][node] for sec in range(self.sc-1) for node in mks]
+        coeff_commits = []
+        for k in range(self.t+1):
+            bases = [self.commitments[node][offset+sec][k] for sec in range(self.sc-1) for node in mks]
+            coeff_commits.append(self.multiexp(bases, weights))
+
+        recon = IncrementalReconstruction(coeff_commits, self.g, self.h, self.t, self.ZR, self.multiexp)
+        while not recon.done():
             (sender, msg) = await recv()
             sk_share, rk_share = msg
-
-            sk_shares.append([sender+1, sk_share])
-            rk_shares.append([sender+1, rk_share])
-
-            # Interpolating the share
-            if len(sk_shares) >= self.t+1:    
-                secret =  self.poly.interpolate_at(sk_shares, 0)
-                random =  self.poly.interpolate_at(rk_shares, 0)
-                commit = self.G1.identity()
-                for sec in range(self.sc-1):
-                    commit = commit*self.multiexp(commits[sec], self.matrix[sec][self.my_id])
-                if self.multiexp([self.g, self.h],[secret, random]) == commit:
-                    break
-                # FIXME! Implement the fallback path
-
-        mx = self.g**secret
-        my = self.h**random
+            accepted = recon.add_share(sender+1, sk_share, rk_share)
+            self.tracer.event("prekey", "share", sender=sender, accepted=accepted)
+        secret, random = recon.reconstruct()
+        self.subscribe_recv.unsubscribe(ADKGMsgType.PREKEY + str(batch))
+        self.tracer.event("prekey", "interpolate", shares=len(recon.xs))
+        self.tracer.mark("prekey_done")
+
+        mx = fixed_base(self.g).pow(secret)
+        my = fixed_base(self.h).pow(random)
         gpok = PoK(self.g, self.ZR, self.multiexp)
         hpok = PoK(self.h, self.ZR, self.multiexp)
-        gchal, gres = gpok.pok_prove(secret, mx)
-        hchal, hres = hpok.pok_prove(random, my)
+        gproof = gpok.pok_prove(secret, mx)
+        hproof = hpok.pok_prove(random, my)
 
-        keytag = ADKGMsgType.KEY
+        keytag = ADKGMsgType.KEY + str(batch)
         send, recv = self.get_send(keytag), self.subscribe_recv(keytag)
 
         for i in range(self.n):
-            send(i, (mx, my, gchal, gres, hchal, hres))
+            send(i, (mx, my, gproof, hproof))
         
         pk_shares = [[self.my_id+1, mx]]
         rk_shares = [[self.my_id+1, my]]
-        while True:
+        seen = set([self.my_id])
+        pending = []
+        while len(pk_shares) <= self.deg:
             (sender, msg) = await recv()
-            if sender != self.my_id:
-                x, y, gchal, gres, hchal, hres = msg
-                valid_pok = gpok.pok_verify(x, gchal, gres) and hpok.pok_verify(y, hchal, hres)
-                if valid_pok:
-                    pk_shares.append([sender+1, x])
-                    rk_shares.append([sender+1, y])
-
-            if len(pk_shares) > self.deg:
-                break
+            if sender in seen:
+                continue
+            seen.add(sender)
+            pending.append((sender, msg))
+            if len(pk_shares) + len(pending) <= self.deg:
+                continue
+            # Verify all pending proofs at once; only the failing batch falls
+            # back to per-proof checks.
+            gvalid = gpok.batch_pok_verify([(x, gp) for _, (x, _, gp, _) in pending])
+            hvalid = hpok.batch_pok_verify([(y, hp) for _, (_, y, _, hp) in pending])
+            self.tracer.event("key", "verify", size=len(pending), valid=sum(gv and hv for gv, hv in zip(gvalid, hvalid)))
+            for (node, (x, y, _, _)), gv, hv in zip(pending, gvalid, hvalid):
+                if gv and hv:
+                    pk_shares.append([node+1, x])
+                    rk_shares.append([node+1, y])
+            pending = []
+
+        self.subscribe_recv.unsubscribe(keytag)
         pk =  interpolate_g1_at_x(pk_shares, 0, self.G1, self.ZR)
         rk =  interpolate_g1_at_x(rk_shares, 0, self.G1, self.ZR)
-        com0 = self.multiexp(commits[0], [self.ZR(1)]*self.n)
+        com0 = self.commitments.sum_coeffs(self.mks, offset)[0]
         # FIXME! Add the fallback path
         assert pk*rk == com0
+        self.tracer.mark("key_done")
         return (self.mks, secret, pk)
 
     async def run_adkg(self, start_time):
         logging.info(f"Run ADKG called")
         acss_outputs = {}
-        acss_signal = asyncio.Event()
+        acss_ready = DealerReadiness(self.n)
 
         acss_start_time = time.time()
-        values =[self.ZR.rand() for _ in range(self.sc)]
-        self.acss_task = asyncio.create_task(self.acss_step(acss_outputs, values, acss_signal))
-        await acss_signal.wait()
-        acss_signal.clear()
+        self.tracer.mark("start")
+        # A precomputed bundle already carries random secrets; without one
+        # the dealer samples everything on the critical path
+        bundle = self.dealer_pool.get_nowait() if self.dealer_pool is not None else None
+        if bundle is not None:
+            values = list(bundle.secrets)
+        else:
+            values =[self.ZR.rand() for _ in range(self.acss_sc)]
+        self.acss_task = asyncio.create_task(self.acss_step(acss_outputs, values, acss_ready, bundle))
+        await acss_ready.wait_count(self.n - self.t)
         acss_time = time.time() - acss_start_time
         self.benchmark_logger.info(f"ACSS time: {(acss_time)}")
+        self.tracer.mark("acss_quorum")
         key_proposal = list(acss_outputs.keys())
-        create_acs_task = asyncio.create_task(self.agreement(key_proposal, acss_outputs, acss_signal))
+        create_acs_task = asyncio.create_task(self.agreement(key_proposal, acss_outputs, acss_ready))
         acs, key_task, work_tasks = await create_acs_task
         await acs
+        self.tracer.mark("acs_done")
         output = await key_task
         adkg_time = time.time()-start_time
         logging.info("ADKG time 2: %f", adkg_time)
         self.benchmark_logger.info("ADKG time: %f", adkg_time)
+        if self.batches > 1:
+            self.benchmark_logger.info("ADKG keys/s: %f", self.batches/adkg_time)
         await asyncio.gather(*work_tasks)
-        mks, sk, pk = output
-        self.output_queue.put_nowait((values[1], mks, sk, pk))
\ No newline at end of file
+        # one output per key, in batch order
+        for batch, (mks, sk, pk) in enumerate(output):
+            self.output_queue.put_nowait((values[self.key_offset(batch)], mks, sk, pk))
\ No newline at end of file
@@ -0,0 +1,107 @@
+from adkg.adkg import ADKG, dealer_pool
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.NOTSET)
+
+
+class ADKGService:
+    """
+    Runs many ADKG sessions concurrently over a single network channel.
+
+    Every session gets its own tagged `send`/`recv` pair from `get_send_recv`
+    (e.g. `ProcessProgramRunner.get_send_recv`), so all sessions share the
+    runner's `subscribe_recv` dispatcher. At most `max_in_flight` sessions run
+    at once; the remaining ones wait in session-id order. All nodes must
+    submit the same session ids. With `precompute_depth` > 0, this node's
+    ACSS dealer work for upcoming sessions is done in the background.
+    `unsubscribe(tag)`, if given, releases a finished session's channel
+    (e.g. `ProcessProgramRunner.unsubscribe`).
+    """
+    def __init__(self, get_send_recv, public_keys, private_key, g, h, n, t, deg, my_id, pc, curve_params, matrices, max_in_flight=8, precompute_depth=0, unsubscribe=None):
+        self.get_send_recv = get_send_recv
+        self.unsubscribe = unsubscribe
+        self.public_keys, self.private_key, self.g, self.h = (public_keys, private_key, g, h)
+        self.n, self.t, self.deg, self.my_id = (n, t, deg, my_id)
+        self.pc, self.curve_params, self.matrices = (pc, curve_params, matrices)
+
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.sessions = {}
+        # sid -> {'start', 'end', 'latency'} for every finished session
+        self.stats = {}
+        self.output_queue = asyncio.Queue()
+        self.start_time = None
+        self.dealer_pool = None
+        if precompute_depth > 0:
+            self.dealer_pool = dealer_pool(public_keys, g, n, t, deg, pc, curve_params, precompute_depth)
+
+        self.benchmark_logger = logging.LoggerAdapter(
+            logging.getLogger("benchmark_logger"), {"node_id": self.my_id}
+        )
+
+    def kill(self):
+        for task in self.sessions.values():
+            task.cancel()
+        if self.dealer_pool is not None:
+            self.dealer_pool.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.kill()
+        return self
+
+    def session_tag(self, sid):
+        return f"ADKG{sid}-"
+
+    async def _run_session(self, sid):
+        async with self.slots:
+            send, recv = self.get_send_recv(self.session_tag(sid))
+            adkg = ADKG(self.public_keys, self.private_key, self.g, self.h, self.n, self.t, self.deg, self.my_id, send, recv, self.pc, self.curve_params, self.matrices, dealer_pool=self.dealer_pool)
+            begin_time = time.time()
+            try:
+                await adkg.run_adkg(begin_time)
+                output = await adkg.output_queue.get()
+            finally:
+                adkg.kill()
+                if self.unsubscribe is not None:
+                    self.unsubscribe(self.session_tag(sid))
+            end_time = time.time()
+
+        self.stats[sid] = {'start': begin_time, 'end': end_time, 'latency': end_time - begin_time}
+        self.benchmark_logger.info("ADKG session %s time: %f", sid, end_time - begin_time)
+        self.output_queue.put_nowait((sid, output))
+        return output
+
+    def submit(self, sid):
+        """
+        Schedules the session `sid` and returns its task. The task resolves
+        to the ADKG output `(secret, mks, sk, pk)`.
+        """
+        assert sid not in self.sessions, f"session {sid} already submitted"
+        if self.start_time is None:
+            self.start_time = time.time()
+        task = asyncio.create_task(self._run_session(sid))
+        self.sessions[sid] = task
+        return task
+
+    async def run(self, sids):
+        """
+        Runs all sessions in `sids` and returns their outputs keyed by sid.
+        """
+        tasks = [self.submit(sid) for sid in sids]
+        outputs = await asyncio.gather(*tasks)
+        self.benchmark_logger.info("ADKG service throughput: %f keys/s", self.throughput())
+        return dict(zip(sids, outputs))
+
+    def throughput(self):
+        """
+        Completed sessions per second since the first submission.
+        """
+        if not self.stats:
+            return 0.0
+        elapsed = max(s['end'] for s in self.stats.values()) - self.start_time
+        return len(self.stats) / elapsed if elapsed > 0 else 0.0
@@ -3,9 +3,8 @@ import logging
 import math
 import asyncio
 from adkg.exceptions import adkgError
+from adkg.broadcast.erasure import encode, decode
 from adkg.broadcast.reliablebroadcast import (
-    encode,
-    decode,
     merkle_tree,
     get_merkle_branch,
     merkle_verify,
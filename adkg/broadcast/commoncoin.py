@@ -38,7 +38,40 @@ async def shared_coin(sid, pid, n, f, pk, sk, broadcast, receive):
     assert pk.k == f + 1
     assert pk.l == n  # noqa: E741
     received = defaultdict(dict)
+    verified = defaultdict(set)
+    rejected = defaultdict(set)
     output_queue = defaultdict(lambda: asyncio.Queue(1))
+    done = set()
+
+    def _combine(r, h):
+        """Returns the signature for round r, or None if there are not enough
+        valid shares yet.
+        """
+        while len(received[r]) >= f + 1:
+            # Optimistically combine f+1 shares without verifying them: a
+            # valid combined signature is the unique signature on h, whatever
+            # shares went into it
+            sigs = dict(list(received[r].items())[: f + 1])
+            sig = pk.combine_shares(sigs)
+            try:
+                pk.verify_signature(sig, h)
+                return sig
+            except AssertionError:
+                pass
+
+            # Some share is bad: find it by batch verifying the shares not
+            # yet known to be good, drop it and try again
+            unchecked = {j: s for j, s in received[r].items() if j not in verified[r]}
+            bad = pk.verify_shares(unchecked, h)
+            if not bad:
+                logger.error(f"Combined signature failed! {(sid, pid, r)}")
+                return None
+            verified[r].update(set(unchecked) - bad)
+            for j in bad:
+                logger.error(f"Signature share failed! {(sid, pid, j, r)}")
+                del received[r][j]
+                rejected[r].add(j)
+        return None
 
     async def _recv():
         while True:  # main receive loop
@@ -52,42 +85,30 @@ async def shared_coin(sid, pid, n, f, pk, sk, broadcast, receive):
             )
             assert i in range(n)
             assert r >= 0
-            if i in received[r]:
+            if i in received[r] or i in rejected[r]:
                 logger.error(f"redundant coin sig received {(sid, pid, i, r)}")
                 continue
-
-            h = pk.hash_message(str((sid, r)))
-
-            # TODO: Accountability: Optimistically skip verifying
-            # each share, knowing evidence available later
-            try:
-                pk.verify_share(sig, i, h)
-            except AssertionError:
-                logger.error(f"Signature share failed! {(sid, pid, i, r)}")
+            if r in done:
                 continue
 
+            # Shares are only verified if the combined signature fails
             received[r][i] = sig
+            if len(received[r]) < f + 1:
+                continue
+
+            h = pk.hash_message(str((sid, r)))
+            sig = _combine(r, h)
+            if sig is None:
+                continue
 
-            # After reaching the threshold, compute the output and
-            # make it available locally
+            # Compute the bit from the least bit of the hash
+            bit = hash(serialize(sig))[0] % 2
             logger.debug(
-                f"[{pid}] if len(received[r]) == f + 1: {len(received[r]) == f + 1}",
+                f"[{pid}] put bit {bit} in output queue",
                 extra={"nodeid": pid, "epoch": r},
             )
-            if len(received[r]) == f + 1:
-
-                # Verify and get the combined signature
-                sigs = dict(list(received[r].items())[: f + 1])
-                sig = pk.combine_shares(sigs)
-                assert pk.verify_signature(sig, h)
-
-                # Compute the bit from the least bit of the hash
-                bit = hash(serialize(sig))[0] % 2
-                logger.debug(
-                    f"[{pid}] put bit {bit} in output queue",
-                    extra={"nodeid": pid, "epoch": r},
-                )
-                output_queue[r].put_nowait(bit)
+            done.add(r)
+            output_queue[r].put_nowait(bit)
 
     recv_task = asyncio.create_task(_recv())
 
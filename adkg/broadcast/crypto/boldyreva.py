@@ -123,6 +123,32 @@ class TBLSPublicKey(object):
         assert pair(sig, g2) == pair(h, b)
         return True
 
+    def verify_shares(self, sigs, h):
+        """Batch-verifies signature shares on ``h``.
+
+        Checks a random linear combination of the shares against the same
+        combination of the verification keys, which costs two pairings. If
+        that fails, the shares are split in halves that are checked
+        recursively.
+
+        :param sigs: a mapping from idx -> sig
+        :return: the set of indices of the invalid shares
+        """
+        if not sigs:
+            return set()
+        rs = {j: ZR.rand() for j in sigs}
+        sig = reduce(mul, [s ** rs[j] for j, s in sigs.items()])
+        vk = reduce(mul, [self.VKs[j] ** rs[j] for j in sigs])
+        if pair(sig, g2) == pair(h, vk):
+            return set()
+        if len(sigs) == 1:
+            return set(sigs)
+        items = sorted(sigs.items())
+        half = len(items) // 2
+        return self.verify_shares(dict(items[:half]), h) | self.verify_shares(
+            dict(items[half:]), h
+        )
+
     def verify_signature(self, sig, h):
         """ """
         assert pair(sig, g2) == pair(h, self.VK)
@@ -0,0 +1,151 @@
+import logging
+import asyncio
+from collections import defaultdict
+import hashlib
+
+from adkg.utils.poly_misc import interpolate_g1_at_x
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Uncomment this when you want logs from this file.
+# logger.setLevel(logging.NOTSET)
+
+
+class ThresholdCoinKey:
+    """
+    A node's key for `dleq_coin`: the generator `g`, the verification keys
+    `vks[i] = g^sk_i` of all nodes and this node's share `sk`, all on the
+    curve of `g` (e.g. `Curve25519G`).
+    """
+    def __init__(self, g, vks, sk, ZR, multiexp):
+        self.g, self.vks, self.sk = g, vks, sk
+        self.ZR, self.multiexp = ZR, multiexp
+
+    def hash_message(self, m):
+        return type(self.g).hash(hashlib.sha256(m.encode()).digest())
+
+
+async def dleq_coin(sid, pid, n, f, key, broadcast, receive):
+    """A shared coin from a threshold VRF, without pairings
+
+    In round r every node sends its share ``H(sid, r)^sk_i`` with a
+    Chaum-Pedersen proof that it has the same discrete log as ``vks[i]``.
+    The proofs of the first :math:`f+1` shares are checked in one batch, and
+    the valid shares are interpolated in the exponent to ``H(sid, r)^sk``,
+    whose hash gives the coin.
+
+    :param sid: a unique instance id
+    :param pid: my id number
+    :param n: number of parties
+    :param f: fault tolerance, :math:`f+1` shares needed to get the coin
+    :param key: a ``ThresholdCoinKey``
+    :param broadcast: broadcast channel
+    :param receive: receive channel
+    :return: a function ``getCoin()``, where ``getCoin(r)`` blocks, and the
+        receive task
+    """
+    from adkg.adkg import CP
+
+    assert len(key.vks) == n
+    G = type(key.g)
+    received = defaultdict(dict)
+    pending = defaultdict(dict)
+    seen = defaultdict(set)
+    output_queue = defaultdict(lambda: asyncio.Queue(1))
+    done = set()
+    provers = {}
+
+    def _prover(r):
+        # h changes every round, so it does not get a fixed-base table
+        if r not in provers:
+            h = key.hash_message(str((sid, r)))
+            provers[r] = CP(key.g, h, key.ZR, key.multiexp, fixed_h=False)
+        return provers[r]
+
+    def _parse(msg):
+        # messages come from peers, so check everything before using it
+        i, (tag, r, (share, proof)) = msg
+        if type(i) is not int or i not in range(n):
+            raise ValueError(f"bad sender {i!r}")
+        if tag != "COIN" or type(r) is not int or r < 0:
+            raise ValueError(f"bad round {r!r}")
+        if not isinstance(share, G) or type(proof) is not tuple or len(proof) != 3:
+            raise ValueError("bad share or proof")
+        a1, a2, res = proof
+        if not isinstance(a1, G) or not isinstance(a2, G) or not isinstance(res, key.ZR):
+            raise ValueError("bad proof")
+        return i, r, share, proof
+
+    def _verify(cp, batch):
+        proofs = [(key.vks[j], share, proof) for j, (share, proof) in batch]
+        try:
+            return cp.dleq_batch_verify(proofs)
+        except Exception as e:
+            logger.error(f"Coin share batch verification failed: {e}")
+        valid = []
+        for proof in proofs:
+            try:
+                valid.append(cp.dleq_verify(*proof))
+            except Exception:
+                valid.append(False)
+        return valid
+
+    async def _recv():
+        while True:  # main receive loop
+            msg = await receive()
+            try:
+                i, r, share, proof = _parse(msg)
+            except Exception as e:
+                logger.error(f"Dropping malformed coin message {(sid, pid)}: {e}")
+                continue
+            if i in seen[r]:
+                logger.error(f"redundant coin share received {(sid, pid, i, r)}")
+                continue
+            seen[r].add(i)
+            if r in done:
+                continue
+
+            pending[r][i] = (share, proof)
+            if len(received[r]) + len(pending[r]) < f + 1:
+                continue
+
+            cp = _prover(r)
+            batch = list(pending[r].items())
+            pending[r].clear()
+            valid = _verify(cp, batch)
+            for (j, (share, _)), ok in zip(batch, valid):
+                if ok:
+                    received[r][j] = share
+                else:
+                    logger.error(f"Coin share proof failed! {(sid, pid, j, r)}")
+            if len(received[r]) < f + 1:
+                continue
+
+            shares = [[j + 1, share] for j, share in received[r].items()]
+            sig = interpolate_g1_at_x(shares, 0, G, key.ZR, order=f + 1)
+            bit = hashlib.sha256(sig.__getstate__()).digest()[0] % 2
+            logger.debug(
+                f"[{pid}] put bit {bit} in output queue",
+                extra={"nodeid": pid, "epoch": r},
+            )
+            done.add(r)
+            del received[r]
+            provers.pop(r, None)
+            output_queue[r].put_nowait(bit)
+
+    recv_task = asyncio.create_task(_recv())
+
+    async def get_coin(round):
+        """Gets a coin.
+
+        :param round: the epoch/round.
+        :returns: a coin.
+        """
+        cp = _prover(round)
+        share = cp.h ** key.sk
+        proof = cp.dleq_prove(key.sk, key.vks[pid], share)
+        broadcast(("COIN", round, (share, proof)))
+        return await output_queue[round].get()
+
+    return get_coin, recv_task
@@ -0,0 +1,293 @@
+"""
+Validated dispersal of a dealer payload made of a header shared by all
+parties plus one private piece per party (e.g. the ACSS commitments and the
+per-party ciphertexts).
+
+Instead of sending the whole payload to everyone (as `optqrbc` does), the
+dealer sends each party the header, that party's own piece and one
+erasure-coded stripe of the full payload. Pieces are authenticated by a
+Merkle tree over the pieces and stripes by a Merkle tree over the stripes;
+parties then run Bracha's broadcast on the hash of the two roots. Any
+f+1 honest stripes suffice to retrieve the full payload, which is only
+needed when a party did not get its piece from the dealer or some piece has
+to be checked by others.
+"""
+from collections import defaultdict
+import asyncio
+import logging
+import struct
+from adkg.broadcast.erasure import encode, decode
+from adkg.broadcast.reliablebroadcast import (
+    hash,
+    merkle_tree,
+    get_merkle_branch,
+    merkle_verify,
+)
+from adkg.utils.tracing import NULL_TRACER
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Uncomment this when you want logs from this file.
+# logger.setLevel(logging.NOTSET)
+
+
+class DispersalMsgType:
+    VAL = 1
+    ECHO = 2
+    READY = 3
+    RETRIEVE = 4
+    RESPONSE = 5
+
+
+def pack_pieces(pieces):
+    """
+    Frames `pieces` (header first) into one payload, each prefixed with its
+    4-byte length.
+    """
+    payload = bytearray()
+    for piece in pieces:
+        payload.extend(struct.pack(">I", len(piece)))
+        payload.extend(piece)
+    return bytes(payload)
+
+
+def unpack_pieces(payload):
+    pieces, offset = [], 0
+    while offset < len(payload):
+        if offset + 4 > len(payload):
+            raise ValueError("truncated piece length")
+        (size,) = struct.unpack_from(">I", payload, offset)
+        offset += 4
+        if offset + size > len(payload):
+            raise ValueError("truncated piece")
+        pieces.append(payload[offset:offset + size])
+        offset += size
+    return pieces
+
+
+class ECDispersal:
+    def __init__(self, sid, pid, n, f, leader, send, receive, tracer=NULL_TRACER):
+        """
+        :param sid: session identifier
+        :param int pid: ``0 <= pid < n``
+        :param int n: at least 3f+1
+        :param int f: fault tolerance
+        :param int leader: ``0 <= leader < n``
+        :param send: ``send(i, msg)`` sends (without blocking) to party i
+        :param receive: ``receive()`` blocks until a ``(sender, msg)`` arrives
+        """
+        assert n >= 3 * f + 1
+        assert f >= 0
+        assert 0 <= leader < n
+        assert 0 <= pid < n
+
+        self.sid, self.pid, self.n, self.f, self.leader = sid, pid, n, f, leader
+        self.send, self.receive, self.tracer = send, receive, tracer
+        self.k = f + 1  # stripes needed to decode the payload
+
+        # (sroot, proot, sbranch, stripe) received from the leader
+        self.my_stripe = None
+        self.committed = None
+        # Full list of pieces once retrieved; None if the stripes are inconsistent
+        self.payload = None
+        self._retrieved = False
+        self._retrieve_sent = False
+        self._waiters = []
+
+    def broadcast(self, o):
+        for i in range(self.n):
+            self.send(i, o)
+
+    @staticmethod
+    def dealer_messages(n, k, header, pieces):
+        """
+        Builds the VAL message for each of the n parties; `pieces[i]` is the
+        private piece of party i.
+        """
+        assert len(pieces) == n
+        leaves = [header] + list(pieces)
+        stripes = encode(k, n, pack_pieces(leaves))
+        smt, pmt = merkle_tree(stripes), merkle_tree(leaves)
+        header_branch = get_merkle_branch(0, pmt)
+        return [
+            (
+                DispersalMsgType.VAL, smt[1], pmt[1],
+                get_merkle_branch(i, smt), stripes[i],
+                header, header_branch,
+                pieces[i], get_merkle_branch(i + 1, pmt),
+            )
+            for i in range(n)
+        ]
+
+    def _verify_val(self, msg):
+        (_, sroot, proot, sbranch, stripe, header, hbranch, piece, pbranch) = msg
+        try:
+            return (
+                merkle_verify(self.n, stripe, sroot, sbranch, self.pid)
+                and merkle_verify(self.n + 1, header, proot, hbranch, 0)
+                and merkle_verify(self.n + 1, piece, proot, pbranch, self.pid + 1)
+            )
+        except Exception as e:
+            logger.info(f"[{self.pid}] Failed to validate VAL message: {e}")
+            return False
+
+    def _reconstruct(self, sroot, proot, stripes):
+        """
+        Decodes the payload and checks that it re-encodes to the committed
+        stripes and pieces. Every honest party gets the same verdict.
+        """
+        try:
+            payload = decode(self.k, self.n, stripes)
+            if merkle_tree(encode(self.k, self.n, payload))[1] != sroot:
+                raise ValueError("stripes do not match the stripe root")
+            pieces = unpack_pieces(payload)
+            if len(pieces) != self.n + 1 or merkle_tree(pieces)[1] != proot:
+                raise ValueError("payload does not match the piece root")
+            return pieces
+        except Exception as e:
+            logger.warning(f"[{self.pid}] Inconsistent dispersal from {self.leader}: {e}")
+            return None
+
+    async def retrieve(self):
+        """
+        Returns the full list of pieces (header first, then one per party),
+        or None if the dealer dispersed inconsistent stripes. Must be called
+        while `disperse` is running.
+        """
+        if self._retrieved:
+            return self.payload
+        if not self._retrieve_sent:
+            self._retrieve_sent = True
+            self.broadcast((DispersalMsgType.RETRIEVE,))
+        fut = asyncio.get_event_loop().create_future()
+        self._waiters.append(fut)
+        return await fut
+
+    async def disperse(self, predicate, input, output):
+        """
+        Runs the dispersal. ``input`` is ``(header, pieces)`` at the leader.
+        ``predicate(header, piece)`` validates this party's view before it
+        echoes; ``output(header, piece)`` is called once on delivery, with
+        ``(None, None)`` if the payload turns out to be inconsistent. Keeps
+        serving retrievals afterwards, so the caller cancels it when done.
+        """
+        n, f, pid = self.n, self.f, self.pid
+        echo_threshold = 2 * f + 1
+        ready_threshold = f + 1
+        output_threshold = 2 * f + 1
+
+        if pid == self.leader:
+            header, pieces = input
+            for i, msg in enumerate(self.dealer_messages(n, self.k, header, pieces)):
+                self.send(i, msg)
+
+        echo_counter = defaultdict(int)
+        ready_counter = defaultdict(int)
+        echo_senders, ready_senders = set(), set()
+        ready_sent = False
+        leader_digest, my_view = None, None
+        delivered = False
+        pending_retrievals = []
+        responses = {}  # sender -> stripe, for the committed roots
+
+        def respond(dest):
+            sroot, proot, sbranch, stripe = self.my_stripe
+            self.send(dest, (DispersalMsgType.RESPONSE, sroot, proot, sbranch, stripe))
+
+        def deliver(header, piece):
+            nonlocal delivered
+            delivered = True
+            self.tracer.event("rbc", "deliver", sid=self.sid, leader=self.leader,
+                              path="leader" if leader_digest == self.committed else "retrieved")
+            output(header, piece)
+
+        async def on_retrieved(pieces):
+            self._retrieved, self.payload = True, pieces
+            for fut in self._waiters:
+                if not fut.done():
+                    fut.set_result(pieces)
+            self._waiters = []
+            if not delivered:
+                if pieces is None:
+                    deliver(None, None)
+                else:
+                    header, piece = pieces[0], pieces[pid + 1]
+                    await predicate(header, piece)
+                    deliver(header, piece)
+
+        while True:
+            sender, msg = await self.receive()
+            if msg[0] == DispersalMsgType.VAL and self.my_stripe is None:
+                if sender != self.leader:
+                    logger.info(f"[{pid}] VAL message from other than leader: {sender}")
+                    continue
+                if not self._verify_val(msg):
+                    continue
+                (_, sroot, proot, sbranch, stripe, header, _, piece, _) = msg
+                self.my_stripe = (sroot, proot, sbranch, stripe)
+                valid = await predicate(header, piece)
+                self.tracer.event("rbc", "propose", sid=self.sid, leader=self.leader, valid=bool(valid))
+                if valid:
+                    leader_digest = hash(sroot + proot)
+                    my_view = (header, piece)
+                    self.broadcast((DispersalMsgType.ECHO, leader_digest))
+                if self.committed is not None:
+                    for dest in pending_retrievals:
+                        respond(dest)
+                    pending_retrievals = []
+                    if self.committed == leader_digest and not delivered:
+                        deliver(*my_view)
+
+            elif msg[0] == DispersalMsgType.ECHO:
+                (_, digest) = msg
+                if sender in echo_senders:
+                    continue
+                echo_senders.add(sender)
+                echo_counter[digest] += 1
+                if echo_counter[digest] >= echo_threshold and not ready_sent:
+                    ready_sent = True
+                    self.broadcast((DispersalMsgType.READY, digest))
+
+            elif msg[0] == DispersalMsgType.READY:
+                (_, digest) = msg
+                if sender in ready_senders:
+                    continue
+                ready_senders.add(sender)
+                ready_counter[digest] += 1
+                if ready_counter[digest] >= ready_threshold and not ready_sent:
+                    ready_sent = True
+                    self.broadcast((DispersalMsgType.READY, digest))
+                if ready_counter[digest] >= output_threshold and self.committed is None:
+                    self.committed = digest
+                    if self.my_stripe is not None:
+                        for dest in pending_retrievals:
+                            respond(dest)
+                        pending_retrievals = []
+                    if digest == leader_digest:
+                        deliver(*my_view)
+                    elif not self._retrieve_sent:
+                        # Our piece did not come from the leader (or does not
+                        # match): rebuild it from the stripes
+                        self._retrieve_sent = True
+                        self.broadcast((DispersalMsgType.RETRIEVE,))
+
+            elif msg[0] == DispersalMsgType.RETRIEVE:
+                # Only answer once the stripe is known to be the committed one
+                if self.committed is not None and self.my_stripe is not None:
+                    respond(sender)
+                else:
+                    pending_retrievals.append(sender)
+
+            elif msg[0] == DispersalMsgType.RESPONSE:
+                if self._retrieved or sender in responses or self.committed is None:
+                    continue
+                (_, sroot, proot, sbranch, stripe) = msg
+                try:
+                    if hash(sroot + proot) != self.committed or not merkle_verify(n, stripe, sroot, sbranch, sender):
+                        continue
+                except Exception:
+                    continue
+                responses[sender] = stripe
+                if len(responses) >= self.k:
+                    stripes = [responses.get(i) for i in range(n)]
+                    await on_retrieved(self._reconstruct(sroot, proot, stripes))
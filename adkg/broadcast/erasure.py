@@ -0,0 +1,83 @@
+"""
+Systematic erasure coding of byte strings, shared by the broadcast protocols
+(`reliablebroadcast`, `qrbc`, `optqrbc`, `AVID`, `ECDispersal`).
+
+The message is padded to a multiple of k bytes and split into k contiguous
+blocks, which are the first k stripes; zfec computes the other n-k natively.
+Any k stripes recover the message. The code only corrects erasures, so
+callers authenticate stripes (e.g. with a Merkle tree) or check the decoded
+message against a committed hash.
+"""
+from functools import lru_cache
+import zfec
+
+
+@lru_cache(maxsize=None)
+def _encoder(k, n):
+    return zfec.Encoder(k, n)
+
+
+@lru_cache(maxsize=None)
+def _decoder(k, n):
+    return zfec.Decoder(k, n)
+
+
+def encode(k, n, m):
+    """Erasure encodes string ``m`` into ``n`` blocks, such that any ``k``
+    can reconstruct.
+    :param int k: k
+    :param int n: number of blocks to encode string ``m`` into.
+    :param bytes m: bytestring to encode.
+    :return list: the ``n`` stripes, as ``bytes`` of equal length.
+    """
+    try:
+        m = m.encode()
+    except AttributeError:
+        pass
+    assert k <= 256  # TODO: Record this assumption!
+    # pad m to a multiple of K bytes, in a single copy
+    padlen = k - (len(m) % k)
+    padded = bytearray(len(m) + padlen)
+    padded[:len(m)] = m
+    padded[len(m):] = padlen * bytes([k - padlen])
+    padded = bytes(padded)
+    step = len(padded) // k
+    view = memoryview(padded)
+    blocks = tuple(view[i * step : (i + 1) * step] for i in range(k))
+    stripes = _encoder(k, n).encode(blocks)
+    # the first k stripes are copied out of `padded`, so callers get bytes
+    return [padded[i * step : (i + 1) * step] for i in range(k)] + list(stripes[k:])
+
+
+def decode(k, n, stripes):
+    """Decodes an erasure-encoded string from a subset of stripes
+    :param stripes: either a list of :math:`n` elements, each a stripe or
+        ``None``, or a dict from stripe index to stripe; at least :math:`k`
+        stripes of the same length are present
+    :raises ValueError: if there are too few stripes, they differ in
+        length or the padding is malformed
+    """
+    if isinstance(stripes, dict):
+        present = sorted((i, s) for i, s in stripes.items() if s is not None)
+    else:
+        assert len(stripes) == n
+        present = [(i, s) for i, s in enumerate(stripes) if s is not None]
+    if len(present) < k:
+        raise ValueError("Too few to recover")
+    if len(set(len(s) for _, s in present)) != 1:
+        raise ValueError("Stripes of unequal length")
+
+    primary = dict(present[:k]) if present[k - 1][0] == k - 1 else None
+    if primary is not None:
+        # all data stripes are present, nothing to decode
+        rec = [primary[i] for i in range(k)]
+    else:
+        present = present[:k]
+        rec = _decoder(k, n).decode([s for _, s in present], [i for i, _ in present])
+    m = b"".join(rec)
+    if not m:
+        raise ValueError("Empty stripes")
+    padlen = k - m[-1]
+    if not 1 <= padlen <= k or padlen > len(m):
+        raise ValueError("Malformed padding")
+    return m[:-padlen]
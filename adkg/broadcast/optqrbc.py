@@ -2,70 +2,15 @@ from collections import defaultdict
 import logging
 import hashlib
 import math
-from reedsolo import RSCodec, ReedSolomonError
-import numpy as np
 import asyncio
+from adkg.broadcast.erasure import encode, decode
+from adkg.broadcast.reliablebroadcast import merkle_tree, get_merkle_branch, merkle_verify
+from adkg.utils.tracing import NULL_TRACER
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
 
-# NOTE: This is not very optimized as it is never triggered in the normal case operation
-def encode(k, n, m):
-    """encodes string ``m`` into ``n`` blocks, such that any ``k``
-    can reconstruct.
-    :param int k: k
-    :param int n: number of blocks to encode string ``m`` into.
-    :param bytes m: bytestring to encode.
-    :return list: Return encoding of ``m`` into
-        ``n`` blocks using ``reedsolo`` lib.
-    """
-    rsc = RSCodec(n-k)
-    padlen = k - (len(m) % k)
-    m += padlen * chr(k - padlen).encode()
-    mlen = len(m)//k
-    blocks = [m[i * k : (i + 1) * k] for i in range(mlen)]
-    
-    stripes = [None]*mlen
-    for i in range(mlen):
-        stripes[i] = rsc.encode(blocks[i])
-
-    nstripes = np.array(stripes)
-    return nstripes.T
-
-# NOTE: This is not very optimized as it is never triggered in the normal case operation
-def decode(k, n, stripes):
-    """Decodes an error corrected encoded string from a subset of stripes
-    :param list stripes: a container of :math:`n` elements,
-        each of which is either a string or ``None``
-        at least :math:`k` elements are strings
-        all string elements are the same length
-    """
-    rsc = RSCodec(n-k)
-    elen = len(list(stripes.values())[0])
-    
-    erasure_pos = []
-    columns = []
-    
-    for i in range(n):
-        if i in stripes:
-            columns.append(stripes[i])
-        else:
-            zeros = np.array([0]*elen)
-            columns.append(zeros)
-            erasure_pos.append(i)
-            
-    code_words = np.array(columns).T
-    message = []
-    for val in code_words:
-        message.append(rsc.decode(list(val))[0])
-        
-    m = list(np.array(message).flatten())
-    padlen = k - m[-1]
-    m = m[:-padlen]
-    
-    return bytes(m)
-        
 def hash(x):
     assert isinstance(x, (str, bytes))
     try: 
@@ -86,9 +31,11 @@ class RBCMsgType:
     ADD_TRIGGER = 5
     ADD_DISPERSE = 6
     ADD_RECONSTRUCT = 7
+    STRIPE = 8
+    STRIPE_ECHO = 9
 
 
-async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receive):
+async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receive, tracer=NULL_TRACER, stripe_threshold=None):
     """
     Implementation of Validated Reliable Broadcast from DXL21 with good case optimization.
     Briefly, the protocol proceeds as follows:
@@ -96,6 +43,21 @@ async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receiv
     2. Nodes run Bracha's RBC on hash
     3. Node i output once the RBC on hash terminates and if it has received a matching proposal from leader
     4. Otherwise, node i triggers a fallback protocol that uses ADD to help node i recover the proposal.
+
+    After its output a node keeps serving the fallback for the others, so
+    the caller cancels the task once the broadcast is no longer needed.
+
+    The stripes of the fallback are erasure-coded (see `erasure`), so they
+    are authenticated by a Merkle root: a node accepts the root sent by f+1
+    nodes, i.e. by at least one honest node holding the committed message,
+    and only decodes from stripes matching it.
+
+    With `stripe_threshold` set, a leader whose message has at least that
+    many bytes replaces step 1 by a dispersal, so its uplink carries about
+    n/(f+1) times the message instead of n times: party i gets stripe i with
+    its Merkle branch and echoes it to all, as in Cachin-Tessaro RBC, and
+    every party decodes the proposal from f+1 echoed stripes. The proposal
+    then goes through the predicate and step 2 as usual.
     """
     assert n >= 3 * f + 1
     assert f >= 0
@@ -117,48 +79,172 @@ async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receiv
         assert isinstance(m, (str, bytes))
         logger.debug("[%d] Input received: %d bytes" % (pid, len(m)))
         
-        broadcast((RBCMsgType.PROPOSE, m))
+        if stripe_threshold is not None and len(m) >= stripe_threshold:
+            _stripes = encode(k, n, m)
+            _mt = merkle_tree(_stripes)
+            for i in range(n):
+                send(i, (RBCMsgType.STRIPE, _mt[1], _stripes[i], get_merkle_branch(i, _mt)))
+        else:
+            broadcast((RBCMsgType.PROPOSE, m))
         
-    stripes = [None for _ in range(n)]
-    
     echo_counter = defaultdict(lambda: 0)
     ready_counter = defaultdict(lambda: 0)
     echo_senders = set()
     ready_senders = set()
     ready_sent = False
-    ready_digest = None
     leader_hash = None
-    reconstructed_hash = None
     leader_msg = None
-    reconstructed_msg = None
+    committed_hash = None
+    delivered = False
 
-    add_ready_sent = False
-    terminate_senders = set()
+    # ADD, at nodes that delivered: stripes of the message and their tree
+    add_stripes, add_mt = None, None
     add_trigger_senders = set()
+    pending_triggers = []
+    # ADD, at nodes that did not: votes for the stripe root, stripes waiting
+    # for the root, and verified stripes
+    add_triggered = False
+    add_root = None
+    add_root_votes = defaultdict(lambda: 0)
     add_disperse_senders = set()
     add_reconstruct_senders = set()
-    add_disperse_counter = defaultdict(lambda: 0)
-    committed_hash = None
-    committed = False
+    add_unverified = []
+    add_verified = {}
+    add_ready_sent = False
+    terminate_senders = set()
+
+    # Dispersed proposal: my stripe is echoed once; stripes echoed under
+    # each root, until one of them decodes
+    stripe_echoed = False
+    stripe_echo_senders = set()
+    echoed_stripes = defaultdict(dict)
+    stripe_proposal = False
+
+    def deliver(msg, path):
+        nonlocal delivered, leader_msg
+        delivered, leader_msg = True, msg
+        tracer.event("rbc", "deliver", sid=sid, leader=leader, path=path)
+        output(msg)
+        for dest in pending_triggers:
+            add_disperse(dest)
+        pending_triggers.clear()
+
+    def add_disperse(dest):
+        nonlocal add_stripes, add_mt
+        if add_stripes is None:
+            add_stripes = encode(k, n, leader_msg)
+            add_mt = merkle_tree(add_stripes)
+        send(dest, (
+            RBCMsgType.ADD_DISPERSE, add_mt[1],
+            add_stripes[dest], get_merkle_branch(dest, add_mt),
+            add_stripes[pid], get_merkle_branch(pid, add_mt),
+        ))
+
+    async def add_accept(index, stripe, branch):
+        """ Verifies a stripe against the accepted root; reconstructs once
+        k stripes are verified. """
+        nonlocal add_ready_sent
+        if delivered or index in add_verified:
+            return
+        try:
+            if not merkle_verify(n, stripe, add_root, branch, index):
+                return
+        except Exception:
+            return
+        add_verified[index] = stripe
+        if index == pid and not add_ready_sent:
+            add_ready_sent = True
+            broadcast((RBCMsgType.ADD_RECONSTRUCT, stripe, branch))
+        if len(add_verified) >= k:
+            try:
+                msg = decode(k, n, add_verified)
+            except ValueError:
+                msg = None
+            # the root comes from an honest node, so this only fails if that
+            # node was given inconsistent data, which it would not commit to
+            if msg is not None and hash(msg) == committed_hash:
+                # runs the predicate's side effects (e.g. recording the
+                # verified proposal) as on the leader path
+                await predicate(msg)
+                deliver(msg, "reconstructed")
+
+    async def on_proposal(proposal):
+        nonlocal leader_msg, leader_hash
+        valid = await predicate(proposal)
+        tracer.event("rbc", "propose", sid=sid, leader=leader, valid=bool(valid))
+        if valid:
+            leader_msg = proposal
+            leader_hash = hash(proposal)
+            broadcast((RBCMsgType.ECHO, leader_hash))
+            if leader_hash == committed_hash:
+                deliver(leader_msg, "leader")
 
     while True:  # main receive loop
         try:
             sender, msg = await receive()
-            if msg[0] == RBCMsgType.PROPOSE and leader_hash is None:
-                (_, leader_msg) = msg
+            if msg[0] == RBCMsgType.ADD_TRIGGER:
+                if sender in add_trigger_senders:
+                    logger.info("[{pid}] Redundant ADD_TRIGGER")
+                    continue
+                add_trigger_senders.add(sender)
+                if delivered:
+                    add_disperse(sender)
+                else:
+                    pending_triggers.append(sender)
+
+            elif delivered:
+                # only the fallback is served after the output
+                continue
+
+            elif msg[0] == RBCMsgType.PROPOSE and leader_hash is None:
+                (_, proposal) = msg
                 if sender != leader:
                     logger.info(f"[{pid}] PROPOSE message from other than leader: {sender}")
                     continue
-            
-                valid = await predicate(leader_msg)
-                if valid:
-                    leader_hash = hash(leader_msg)
-                    broadcast((RBCMsgType.ECHO, leader_hash))
-
-                    # TODO: double check this
-                    if leader_hash == committed_hash:
-                        broadcast((RBCMsgType.TERMINATE, 0))
-                    
+                await on_proposal(proposal)
+
+            elif msg[0] == RBCMsgType.STRIPE and not stripe_echoed:
+                (_, root, stripe, branch) = msg
+                if sender != leader:
+                    logger.info(f"[{pid}] STRIPE message from other than leader: {sender}")
+                    continue
+                try:
+                    if not merkle_verify(n, stripe, root, branch, pid):
+                        continue
+                except Exception:
+                    continue
+                stripe_echoed = True
+                broadcast((RBCMsgType.STRIPE_ECHO, root, stripe, branch))
+
+            elif msg[0] == RBCMsgType.STRIPE_ECHO:
+                if sender in stripe_echo_senders or stripe_proposal:
+                    continue
+                (_, root, stripe, branch) = msg
+                try:
+                    if not merkle_verify(n, stripe, root, branch, sender):
+                        continue
+                except Exception:
+                    continue
+                stripe_echo_senders.add(sender)
+                echoed_stripes[root][sender] = stripe
+                if len(echoed_stripes[root]) < k:
+                    continue
+                # k stripes under one root include an honest one, so the
+                # root came from the leader; it fixes the proposal only if
+                # the decoded message re-encodes to it
+                stripe_proposal = True
+                try:
+                    proposal = decode(k, n, echoed_stripes[root])
+                    if merkle_tree(encode(k, n, proposal))[1] != root:
+                        raise ValueError("stripes do not match the root")
+                except ValueError as e:
+                    logger.info(f"[{pid}] Inconsistent dispersal from {leader}: {e}")
+                    continue
+                finally:
+                    echoed_stripes.clear()
+                if leader_hash is None:
+                    await on_proposal(proposal)
+
             elif msg[0] == RBCMsgType.ECHO:
                 (_, _digest) = msg
                 if sender in echo_senders:
@@ -182,21 +268,14 @@ async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receiv
                     ready_sent = True
                     broadcast((RBCMsgType.READY, _digest))
                 
-                if ready_counter[_digest] >= output_threshold:
+                if ready_counter[_digest] >= output_threshold and committed_hash is None:
                     committed_hash = _digest
                     if _digest == leader_hash:
-                        committed = True
-                        output(leader_msg)
-                        return
-                        broadcast((RBCMsgType.TERMINATE, 0))
-                    elif _digest == reconstructed_hash:
-                        committed = True
-                        output(reconstructed_msg)  
-                        return
-                        broadcast((RBCMsgType.TERMINATE, 0))
-                    else:
+                        deliver(leader_msg, "leader")
+                    elif not add_triggered:
+                        add_triggered = True
+                        tracer.event("rbc", "add_trigger", sid=sid, leader=leader)
                         broadcast((RBCMsgType.ADD_TRIGGER, 0))
-                        
 
             elif msg[0] == RBCMsgType.TERMINATE:
                 if sender in terminate_senders:
@@ -206,50 +285,36 @@ async def optqrbc(sid, pid, n, f, leader, predicate, input, output, send, receiv
                 if len(terminate_senders) == n:
                     return
 
- 
-            elif msg[0] == RBCMsgType.ADD_TRIGGER:
-                if sender in add_trigger_senders:
-                    logger.info("[{pid}] Redundant ADD_TRIGGER")
-                    continue
-                add_trigger_senders.add(sender)
-                if committed:
-                    if stripes is None:
-                        stripes = encode(k,n,m)
-                    send(sender, (RBCMsgType.ADD_DISPERSE, stripes[sender], stripes[pid]))
-
             elif msg[0] == RBCMsgType.ADD_DISPERSE:
-                if committed:
-                    continue
-                (_, my_stripe, sender_stripe) = msg
                 if sender in add_disperse_senders:
                     logger.info("[{pid}] Redundant ADD_DISPERSE")
                     continue
                 add_disperse_senders.add(sender)
-                add_reconstruct_senders.add(sender)
-                add_disperse_counter[my_stripe] = add_disperse_counter[my_stripe]+1
-                stripes[sender] = sender_stripe
-
-                if add_disperse_senders[my_stripe] >= f + 1 and not add_ready_sent:
-                    add_ready_sent = True
-                    broadcast((RBCMsgType.ADD_RECONSTRUCT, my_stripe))
+                (_, root, my_stripe, my_branch, sender_stripe, sender_branch) = msg
+                if add_root is None:
+                    add_unverified.append((pid, my_stripe, my_branch, root))
+                    add_unverified.append((sender, sender_stripe, sender_branch, root))
+                    add_root_votes[root] = add_root_votes[root]+1
+                    if add_root_votes[root] >= f + 1:
+                        add_root = root
+                        unverified, add_unverified = add_unverified, []
+                        for (index, stripe, branch, _root) in unverified:
+                            # stripes of ADD_RECONSTRUCT carry no root
+                            if _root in (root, None):
+                                await add_accept(index, stripe, branch)
+                elif root == add_root:
+                    await add_accept(pid, my_stripe, my_branch)
+                    await add_accept(sender, sender_stripe, sender_branch)
 
             elif msg[0] == RBCMsgType.ADD_RECONSTRUCT:
-                if committed:
-                    continue
-                (_, stripe) = msg
                 if sender in add_reconstruct_senders:
                     logger.info("[{pid}] Redundant ADD_RECONSTRUCT")
                     continue
                 add_reconstruct_senders.add(sender)
-                stripes[sender] = stripe
-                
-                if len(add_reconstruct_senders) >= output_threshold:
-                    reconstructed_msg = decode(k, n, stripes)
-                    reconstructed_hash = hash(reconstructed_msg)
-                    if reconstructed_hash == committed_hash:
-                        committed = True
-                        output(reconstructed_msg)  
-                        return
-                        broadcast((RBCMsgType.TERMINATE, 0))
+                (_, stripe, branch) = msg
+                if add_root is None:
+                    add_unverified.append((sender, stripe, branch, None))
+                else:
+                    await add_accept(sender, stripe, branch)
         except Exception as e:
-            print(e)
\ No newline at end of file
+            print(e)
@@ -7,7 +7,8 @@ from collections import defaultdict
 import logging
 
 from adkg.exceptions import RedundantMessageError, AbandonedNodeError
-from adkg.broadcast.commoncoin import shared_coin
+from adkg.broadcast.dleqcoin import dleq_coin
+from adkg.utils.tracing import NULL_TRACER
 
 
 logger = logging.getLogger(__name__)
@@ -113,7 +114,7 @@ def parse_msg(msg):
 def encode_msg(tag, v, r):
     return r*100 + v*10 + tag
 
-async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, receive):
+async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, receive, tracer=NULL_TRACER):
     """ Implementation of Tyler20 ABA. Tyler20 has two nice properties:
         1. If all honest node input 0 to an ABA, then that ABA can terminate without a coin.
         2. An honest node can locally decide that no other honest node would require a coin.
@@ -121,11 +122,13 @@ async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, recei
     :param pid: my id number
     :param N: the number of parties
     :param f: the number of byzantine parties
-    :param coin: a ``common coin(r)`` is called to block until receiving a bit
+    :param coin_keys: ``coin_keys()`` blocks until it returns ``(keys, dealers)``,
+        where ``keys.get(dealers)`` gives the ``ThresholdCoinKey`` of the coin
     :param input: ``input()`` is called to receive an input
     :param decide: ``decide(0)`` or ``decide(1)`` is eventually called
     :param broadcast: broadcast channel
     :param receive: receive channel
+    :param tracer: records round, decision and coin events
     :return: blocks until
     """
     # Messages received are routed to either a shared coin, the broadcast, or AUX
@@ -144,49 +147,41 @@ async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, recei
     bv_signal = asyncio.Event()
     aux_signal = asyncio.Event()
     auxset_signal = asyncio.Event()
-    coin_init = False
 
     def coin_bcast(o):
         broadcast(("AC", o))
 
     coin_recvs = asyncio.Queue()
+    coin_state = {}
+    coin_tasks = []
 
-    async def _coin(r, coin_init):
-        from pypairing import G1, ZR
-        if not coin_init:
-            acss_outputs, rbc_values = await coin_keys()
-        
-        skj = 0
-        coeffs = [G1.identity() for _ in range(f+1)]
-        for kk in rbc_values:
-            skj = skj + acss_outputs[kk][0][0]
-            commitments = acss_outputs[kk][1]
-            for i in range(len(coeffs)):
-                coeffs[i] = coeffs[i]*commitments[0][i] #TODO: Optimize this
-        
-        pkj = [G1.identity() for _ in range(n)] #TODO: Optimize this
-        for i in range(n):
-            exp = ZR(1)
-            pkji = G1.identity()
-            for j in range(len(coeffs)):
-                pkji*=coeffs[j]**exp
-                exp *= (i+1)
-            pkj[i] = pkji
-        bpk = TBLSPublicKey(n, f, pkj[j], pkj)
-        bsk = TBLSPrivateKey(n, f, pkj[j], pkj, skj, j)
-
-        # FIXME: Generate coin object only once!
-        coin, _ = await shared_coin(
-            "COIN" + str(sid), pid, n, f, bpk, bsk, coin_bcast, coin_recvs.get
+    async def _make_coin():
+        keys, dealers = await coin_keys()
+        coin, recv_task = await dleq_coin(
+            "COIN" + str(sid), pid, n, f, keys.get(dealers), coin_bcast, coin_recvs.get
         )
+        coin_tasks.append(recv_task)
+        return coin
+
+    async def _coin(r):
+        tracer.event("coin", "request", sid=sid, round=r)
+        # The coin is set up on first use and then reused for later rounds
+        if "coin" not in coin_state:
+            coin_state["coin"] = asyncio.create_task(_make_coin())
+            coin_tasks.append(coin_state["coin"])
+        coin = await coin_state["coin"]
         b = await coin(r)
-        print("Coin requested!!")
+        tracer.event("coin", "output", sid=sid, round=r)
         return b
 
 
     async def _recv():
         while True: # not finished
             (sender, msg) = await receive()
+            if type(msg) is tuple and msg[0] == "AC":
+                # coin shares, see coin_bcast
+                coin_recvs.put_nowait((sender, msg[1]))
+                continue
             tag, v, r = parse_msg(msg)
             logger.debug(
                 f"[{pid}] receive {msg} from node {sender}",
@@ -328,6 +323,7 @@ async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, recei
         r = 0
         already_decided = None
         while True: # Unbounded number of rounds
+            tracer.event("aba", "round", sid=sid, round=r)
             logger.debug(
                 f"[{pid}] Starting with est = {est}", extra={"nodeid": pid, "epoch": r}
             )
@@ -473,11 +469,11 @@ async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, recei
                 if len(values2) == 1:
                     v = next(iter(values2))
                     if v == 2:
-                        est = await _coin(r, coin_init)
-                        coin_init = True
+                        est = await _coin(r)
                     else:
                         if already_decided is None:
                             already_decided = v
+                            tracer.event("aba", "decide", sid=sid, round=r, value=v)
                             decide(v)
                         elif already_decided == v:
                             # Here corresponds to a proof that if one party
@@ -495,15 +491,19 @@ async def tylerba(sid, pid, n, f, coin_keys, input_msg, decide, broadcast, recei
                         est = next(iter(values2))
                     else:
                         est = v
-                    _coin(r)
+                    # contribute a coin share for the nodes that need it
+                    coin_tasks.append(asyncio.create_task(_coin(r)))
             except AbandonedNodeError:
                 # print('[sid:%s] [pid:%d] QUITTING in round %d' % (sid,pid,r))
                 logger.debug(f"[{pid}] QUIT!", extra={"nodeid": pid, "epoch": r})
+                tracer.event("aba", "terminate", sid=sid, round=r)
                 return
             r += 1
     finally:
         if asyncio.get_event_loop().is_running():
                 _thread_recv.cancel()
+                for task in coin_tasks:
+                    task.cancel()
 
 
 async def run_binary_agreement(config, pbk, pvk, n, f, nodeid):
@@ -0,0 +1,392 @@
+"""
+n instances of Tyler20 ABA (see `tylerba`) driven by one coroutine.
+"""
+import asyncio
+from collections import defaultdict
+import logging
+
+from adkg.broadcast.tylerba import ABAMsgType, parse_msg, encode_msg
+from adkg.broadcast.dleqcoin import dleq_coin
+from adkg.utils.tracing import NULL_TRACER
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Uncomment this when you want logs from this file.
+# logger.setLevel(logging.NOTSET)
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class Phase:
+    INPUT = 0
+    EST = 1
+    AUX = 2
+    AUXSET = 3
+    EST2 = 4
+    AUX2 = 5
+    COIN = 6
+    DONE = 7
+
+
+# AUXSET values as sent by `wait_for_auxset_values`, as bitmasks of {0, 1}
+AUXSET_VALUES = (0b01, 0b10, 0b11)
+
+
+class _Instance:
+    """
+    The state of one ABA instance. Sets of senders are bitmasks over node
+    ids and sets of values are bitmasks over {0, 1, 2 (i.e. bottom)}, so a
+    round's state is a handful of ints.
+    """
+    def __init__(self):
+        self.phase = Phase.INPUT
+        self.r = 0
+        self.est = None
+        self.decided = None
+        self.est_values = defaultdict(lambda: [0, 0])
+        self.est_sent = defaultdict(lambda: [False, False])
+        self.bin_values = defaultdict(int)
+        self.aux_values = defaultdict(lambda: [0, 0])
+        self.auxset_values = defaultdict(lambda: [0, 0, 0])
+        self.auxset_sent = defaultdict(bool)
+        self.est_values2 = defaultdict(lambda: [0, 0, 0])
+        self.est_sent2 = defaultdict(lambda: [False, False, False])
+        self.bin_values2 = defaultdict(int)
+        self.aux_values2 = defaultdict(lambda: [0, 0, 0])
+
+
+class VectorABA:
+    """
+    Runs n Tyler20 ABA instances, e.g. the n ABAs of an ADKG's common subset,
+    with one receive loop instead of one task per instance.
+
+    The per-instance protocol is that of `tylerba`. What changes is the
+    transport: every ABA message is a broadcast, so the messages all
+    instances produce within one event-loop tick are sent as a single
+    message to each peer, with one bitmask of instances per
+    `encode_msg(tag, v, r)` code, plus the coin shares of that tick.
+
+    Duplicate or malformed messages are dropped rather than raised, since
+    an exception would stop all n instances at once.
+    """
+    def __init__(self, sid, pid, n, f, coin_keys, decide, send, receive, tracer=NULL_TRACER):
+        """
+        :param coin_keys: one ``coin_keys()`` getter per instance, as for
+            ``tylerba``
+        :param decide: one ``decide(v)`` callback per instance
+        :param send: ``send(j, msg)`` to node ``j``
+        """
+        assert len(coin_keys) == n and len(decide) == n
+        self.sid, self.pid, self.n, self.f = sid, pid, n, f
+        self.coin_keys, self.decide = coin_keys, decide
+        self.send, self.receive, self.tracer = send, receive, tracer
+        self.instances = [_Instance() for _ in range(n)]
+        self.remaining = n
+        self.finished = asyncio.Event()
+
+        self.pending = defaultdict(int)  # code -> bitmask of instances
+        self.pending_coins = []
+        self.flush_scheduled = False
+        self.messages_sent = 0
+
+        self.coins = {}
+        self.coin_recvs = [asyncio.Queue() for _ in range(n)]
+        self.tasks = []
+
+    def input(self, j, v):
+        """
+        Provides the input `v` of instance `j`.
+        """
+        assert v in (0, 1)
+        inst = self.instances[j]
+        if inst.phase != Phase.INPUT:
+            return
+        inst.est = v
+        self._start_round(j)
+        self._advance(j)
+
+    async def run(self):
+        """
+        Returns once every instance has terminated.
+        """
+        recv_task = asyncio.create_task(self._recv())
+        try:
+            await self.finished.wait()
+        finally:
+            recv_task.cancel()
+            for task in self.tasks:
+                task.cancel()
+
+    def _instance_sid(self, j):
+        return self.sid + str(j)
+
+    def _broadcast(self, j, tag, v, r):
+        self.pending[encode_msg(tag, v, r)] |= 1 << j
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            asyncio.get_event_loop().call_soon(self._flush)
+
+    def _flush(self):
+        self.flush_scheduled = False
+        msg = (tuple(self.pending.items()), tuple(self.pending_coins))
+        self.pending = defaultdict(int)
+        self.pending_coins = []
+        for i in range(self.n):
+            self.send(i, msg)
+        self.messages_sent += self.n
+
+    def _decode(self, msg):
+        """
+        Checks the shape of a received message, which may come from a faulty
+        node, and returns ``(sender, [(tag, v, r, mask)], coins)``.
+
+        :raises ValueError: if the message is malformed
+        """
+        n = self.n
+        sender, payload = msg
+        if not isinstance(sender, int) or sender not in range(n):
+            raise ValueError(f"bad sender {sender!r}")
+        bitmaps, coins = payload
+        if not isinstance(bitmaps, tuple) or not isinstance(coins, tuple):
+            raise ValueError("bitmaps and coins must be tuples")
+        entries = []
+        for entry in bitmaps:
+            if not isinstance(entry, tuple) or len(entry) != 2:
+                raise ValueError("bad bitmap entry")
+            code, mask = entry
+            if not isinstance(code, int) or not isinstance(mask, int):
+                raise ValueError("bad bitmap entry")
+            if not 0 <= mask < 1 << n:
+                raise ValueError("bad instance mask")
+            entries.append((*parse_msg(code), mask))
+        for entry in coins:
+            if not isinstance(entry, tuple) or len(entry) != 2:
+                raise ValueError("bad coin entry")
+            j, o = entry
+            if not isinstance(j, int) or j not in range(n) or not isinstance(o, tuple):
+                raise ValueError("bad coin entry")
+        return sender, entries, coins
+
+    async def _recv(self):
+        n = self.n
+        while True:
+            msg = await self.receive()
+            try:
+                sender, entries, coins = self._decode(msg)
+            except Exception as e:
+                logger.warning(f"[{self.pid}] Dropping malformed message: {e}")
+                continue
+            touched = 0
+            for tag, v, r, mask in entries:
+                for j in range(n):
+                    if mask >> j & 1 and self._handle(j, sender, tag, v, r):
+                        touched |= 1 << j
+            for j, o in coins:
+                if self.instances[j].phase != Phase.DONE:
+                    self.coin_recvs[j].put_nowait((sender, o))
+            for j in range(n):
+                if touched >> j & 1:
+                    self._advance(j)
+
+    def _handle(self, j, sender, tag, v, r):
+        """
+        Records one message of instance `j`, as `tylerba`'s receive loop
+        does. Returns whether the instance's state changed.
+        """
+        inst = self.instances[j]
+        if inst.phase == Phase.DONE or r < 0:
+            return False
+        bit = 1 << sender
+        f = self.f
+        if tag == ABAMsgType.EST or tag == ABAMsgType.EST2:
+            first = tag == ABAMsgType.EST
+            if v not in ((0, 1) if first else (0, 1, 2)):
+                return False
+            values = inst.est_values[r] if first else inst.est_values2[r]
+            sent = inst.est_sent[r] if first else inst.est_sent2[r]
+            if values[v] & bit:
+                logger.warning(f"[{self.pid}] Redundant {tag} of {j} from {sender}")
+                return False
+            values[v] |= bit
+            count = popcount(values[v])
+            # Relay after reaching first threshold
+            if count >= f + 1 and not sent[v]:
+                sent[v] = True
+                self._broadcast(j, tag, v, r)
+            # Output after reaching second threshold
+            if count >= 2 * f + 1:
+                if first:
+                    inst.bin_values[r] |= 1 << v
+                else:
+                    inst.bin_values2[r] |= 1 << v
+            return True
+        if tag == ABAMsgType.AUX or tag == ABAMsgType.AUX2:
+            first = tag == ABAMsgType.AUX
+            if v not in ((0, 1) if first else (0, 1, 2)):
+                return False
+            values = inst.aux_values[r] if first else inst.aux_values2[r]
+        elif tag == ABAMsgType.AUXSET:
+            if v not in (0, 1, 2):
+                return False
+            values = inst.auxset_values[r]
+        else:
+            return False
+        if values[v] & bit:
+            logger.warning(f"[{self.pid}] Redundant {tag} of {j} from {sender}")
+            return False
+        values[v] |= bit
+        return True
+
+    def _start_round(self, j):
+        inst = self.instances[j]
+        self.tracer.event("aba", "round", sid=self._instance_sid(j), round=inst.r)
+        inst.phase = Phase.EST
+        if not inst.est_sent[inst.r][inst.est]:
+            inst.est_sent[inst.r][inst.est] = True
+            self._broadcast(j, ABAMsgType.EST, inst.est, inst.r)
+
+    def _advance(self, j):
+        """
+        Moves instance `j` through its round for as long as the messages
+        received so far allow.
+        """
+        inst = self.instances[j]
+        quorum = self.n - self.f
+        while True:
+            r = inst.r
+            if inst.phase == Phase.EST:
+                bins = inst.bin_values[r]
+                if not bins:
+                    return
+                w = 0 if bins & 1 else 1
+                self._broadcast(j, ABAMsgType.AUX, w, r)
+                inst.phase = Phase.AUX
+            elif inst.phase == Phase.AUX:
+                bins, aux = inst.bin_values[r], inst.aux_values[r]
+                if bins & 2 and popcount(aux[1]) >= quorum:
+                    w = 1
+                elif bins & 1 and popcount(aux[0]) >= quorum:
+                    w = 0
+                elif sum(popcount(aux[v]) for v in (0, 1) if bins >> v & 1) >= quorum:
+                    w = 2
+                else:
+                    return
+                if not inst.auxset_sent[r]:
+                    inst.auxset_sent[r] = True
+                    self._broadcast(j, ABAMsgType.AUXSET, w, r)
+                inst.phase = Phase.AUXSET
+            elif inst.phase == Phase.AUXSET:
+                bins, auxset = inst.bin_values[r], inst.auxset_values[r]
+                if bins & 2 and popcount(auxset[1]) >= quorum:
+                    est2 = 1
+                elif bins & 1 and popcount(auxset[0]) >= quorum:
+                    est2 = 0
+                elif sum(
+                    popcount(auxset[w])
+                    for w, values in enumerate(AUXSET_VALUES)
+                    if values & bins == values
+                ) >= quorum:
+                    est2 = 2
+                else:
+                    return
+                if not inst.est_sent2[r][est2]:
+                    inst.est_sent2[r][est2] = True
+                    self._broadcast(j, ABAMsgType.EST2, est2, r)
+                inst.phase = Phase.EST2
+            elif inst.phase == Phase.EST2:
+                bins2 = inst.bin_values2[r]
+                if not bins2:
+                    return
+                w = min(v for v in range(3) if bins2 >> v & 1)
+                self._broadcast(j, ABAMsgType.AUX2, w, r)
+                inst.phase = Phase.AUX2
+            elif inst.phase == Phase.AUX2:
+                bins2, aux2 = inst.bin_values2[r], inst.aux_values2[r]
+                if bins2 & 2 and popcount(aux2[1]) >= quorum:
+                    values2 = [1]
+                elif bins2 & 1 and popcount(aux2[0]) >= quorum:
+                    values2 = [0]
+                elif bins2 & 4 and popcount(aux2[2]) >= quorum:
+                    values2 = [2]
+                elif sum(popcount(aux2[v]) for v in range(3) if bins2 >> v & 1) >= quorum:
+                    values2 = [v for v in range(3) if bins2 >> v & 1 and aux2[v]]
+                else:
+                    return
+                if not self._decide(j, values2):
+                    return
+            else:
+                # waiting for the input or the coin, or terminated
+                return
+
+    def _decide(self, j, values2):
+        """
+        Ends round r of instance `j` with the AUX2 values `values2`. Returns
+        whether the instance moved on to the next round.
+        """
+        inst = self.instances[j]
+        r = inst.r
+        if len(values2) == 1:
+            v = values2[0]
+            if v == 2:
+                inst.phase = Phase.COIN
+                self.tasks.append(asyncio.create_task(self._coin_round(j, r)))
+                return False
+            if inst.decided is None:
+                inst.decided = v
+                self.tracer.event("aba", "decide", sid=self._instance_sid(j), round=r, value=v)
+                self.decide[j](v)
+            elif inst.decided == v:
+                # Everybody proposes v from now on, see `tylerba`
+                self.tracer.event("aba", "terminate", sid=self._instance_sid(j), round=r)
+                inst.phase = Phase.DONE
+                self.remaining -= 1
+                if self.remaining == 0:
+                    self.finished.set()
+                return False
+            inst.est = v
+        else:
+            inst.est = values2[0]
+            # contribute a coin share for the nodes that need it
+            self.tasks.append(asyncio.create_task(self._coin(j, r)))
+        inst.r = r + 1
+        self._start_round(j)
+        return True
+
+    async def _make_coin(self, j):
+        keys, dealers = await self.coin_keys[j]()
+
+        def coin_bcast(o):
+            self.pending_coins.append((j, o))
+            self._schedule_flush()
+
+        coin, recv_task = await dleq_coin(
+            "COIN" + self._instance_sid(j), self.pid, self.n, self.f,
+            keys.get(dealers), coin_bcast, self.coin_recvs[j].get,
+        )
+        self.tasks.append(recv_task)
+        return coin
+
+    async def _coin(self, j, r):
+        self.tracer.event("coin", "request", sid=self._instance_sid(j), round=r)
+        # The coin is set up on first use and then reused for later rounds
+        if j not in self.coins:
+            self.coins[j] = asyncio.create_task(self._make_coin(j))
+            self.tasks.append(self.coins[j])
+        coin = await self.coins[j]
+        b = await coin(r)
+        self.tracer.event("coin", "output", sid=self._instance_sid(j), round=r)
+        return b
+
+    async def _coin_round(self, j, r):
+        b = await self._coin(j, r)
+        inst = self.instances[j]
+        inst.est = b
+        inst.r = r + 1
+        self._start_round(j)
+        self._advance(j)
@@ -0,0 +1,62 @@
+"""
+Provider for the randomness-extraction matrices `(mat1, mat2)` used by ADKG.
+
+The matrices are generated natively by pypairing and persisted to a binary
+cache keyed by (curve, n, t, deg). Later startups memory-map the cached file
+instead of regenerating it. The file holds mat1 followed by mat2, row-major,
+with every entry encoded as 32 little-endian bytes.
+"""
+import mmap
+import os
+import logging
+from pypairing import ZR as blsZR, Curve25519ZR
+from pypairing import extraction_matrices, curve25519extraction_matrices
+
+logger = logging.getLogger(__name__)
+
+MATRIX_CACHE_DIR = "sharedata/matrices/"
+F_SIZE = 32
+
+_generators = {
+    blsZR: ("bls12_381", extraction_matrices),
+    Curve25519ZR: ("curve25519", curve25519extraction_matrices),
+}
+
+
+def matrix_cache_path(ZR, n, t, deg, cache_dir=MATRIX_CACHE_DIR):
+    curve, _ = _generators[ZR]
+    return os.path.join(cache_dir, f"{curve}-{n}-{t}-{deg}.bin")
+
+
+def _load(ZR, data, n):
+    # one native call for both matrices; the view is released before the
+    # mmap is closed
+    with memoryview(data) as view:
+        elements = ZR.from_bytes_many(view[: 2 * n * n * F_SIZE])
+    rows = [elements[i * n : (i + 1) * n] for i in range(2 * n)]
+    return rows[:n], rows[n:]
+
+
+def get_extraction_matrices(ZR, n, t, deg, cache_dir=MATRIX_CACHE_DIR):
+    """
+    Returns `(mat1, mat2)` as lists of rows of `ZR` elements. `cache_dir=None`
+    disables the on-disk cache.
+    """
+    _, generate = _generators[ZR]
+    if cache_dir is None:
+        return _load(ZR, generate(n, t, deg), n)
+
+    path = matrix_cache_path(ZR, n, t, deg, cache_dir)
+    expected_size = 2 * n * n * F_SIZE
+    if not os.path.isfile(path) or os.path.getsize(path) != expected_size:
+        logger.debug("Generating extraction matrices in %s", path)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(generate(n, t, deg))
+        # Atomic, so concurrent nodes on one host never see a partial file
+        os.replace(tmp_path, path)
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _load(ZR, data, n)
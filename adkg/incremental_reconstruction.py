@@ -0,0 +1,68 @@
+from adkg.utils.fixed_base import FixedBasePair
+
+
+class IncrementalReconstruction:
+    """
+    Reconstructs a secret shared with a degree-t polynomial whose coefficients
+    are committed as g^a_k h^b_k.
+
+    Every share is checked on arrival against the commitment evaluated at the
+    sender's point, so invalid shares are discarded immediately. Lagrange
+    weights for the accepted points are maintained incrementally and the
+    secret is interpolated exactly once, when t+1 valid shares are in.
+    """
+    def __init__(self, coeff_commits, g, h, t, ZR, multiexp):
+        self.coeff_commits = coeff_commits
+        self.gh, self.t = FixedBasePair(g, h), t
+        self.ZR, self.multiexp = ZR, multiexp
+
+        self.xs, self.shares, self.rands = [], [], []
+        # dens[i] = prod_{j != i} (x_j - x_i) over the accepted points
+        self.dens = []
+        self.seen = set()
+
+    def verify_share(self, x, share, rand):
+        powers = [self.ZR(x**k) for k in range(len(self.coeff_commits))]
+        expected = self.multiexp(self.coeff_commits, powers)
+        return self.gh.commit(share, rand) == expected
+
+    def add_share(self, x, share, rand):
+        """
+        Adds the share evaluated at point `x`. Returns False if the point was
+        already seen, enough shares are held, or the share does not match the
+        commitment.
+        """
+        if x in self.seen or self.done():
+            return False
+        self.seen.add(x)
+        if not self.verify_share(x, share, rand):
+            return False
+
+        x_new = self.ZR(x)
+        den_new = self.ZR(1)
+        for i, x_i in enumerate(self.xs):
+            self.dens[i] = self.dens[i] * (x_new - x_i)
+            den_new = den_new * (x_i - x_new)
+        self.xs.append(x_new)
+        self.shares.append(share)
+        self.rands.append(rand)
+        self.dens.append(den_new)
+        return True
+
+    def done(self):
+        return len(self.xs) >= self.t + 1
+
+    def reconstruct(self):
+        """
+        Returns the (secret, randomness) pair at x = 0 from the accepted shares.
+        """
+        assert self.done()
+        prod = self.ZR(1)
+        for x_i in self.xs:
+            prod = prod * x_i
+        secret, random = self.ZR(0), self.ZR(0)
+        for i, x_i in enumerate(self.xs):
+            weight = prod / (x_i * self.dens[i])
+            secret = secret + self.shares[i] * weight
+            random = random + self.rands[i] * weight
+        return secret, random
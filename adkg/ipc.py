@@ -16,11 +16,21 @@ from collections import defaultdict
 class NodeCommunicator(object):
     LAST_MSG = None
 
-    def __init__(self, peers_config, my_id, linger_timeout):
+    def __init__(self, peers_config, my_id, linger_timeout, max_frame_bytes=1 << 20, flush_delay=0):
+        """
+        Messages queued for the same peer are coalesced into one multipart
+        frame: everything queued by the time the sender task runs (i.e. within
+        one event-loop tick), plus whatever arrives in the next `flush_delay`
+        seconds, up to about `max_frame_bytes` per frame.
+        """
         self.peers_config = peers_config
         self.my_id = my_id
+        self.max_frame_bytes = max_frame_bytes
+        self.flush_delay = flush_delay
 
         self.bytes_sent = 0
+        self.msgs_sent = 0
+        self.frames_sent = 0
         self.bytes_count = defaultdict(lambda:0)
         self.benchmark_logger = logging.LoggerAdapter(
             logging.getLogger("benchmark_logger"), {"node_id": my_id}
@@ -59,9 +69,17 @@ class NodeCommunicator(object):
         await asyncio.gather(*self._dealer_tasks)
         self.benchmark_logger.debug("Dealer task finished.")
         self._router_task.cancel()
+        try:
+            await self._router_task
+        except asyncio.CancelledError:
+            pass
         self.benchmark_logger.debug("Router task cancelled.")
-        # self.zmq_context.destroy(linger=self.linger_timeout) # wait here
+        # Closes the sockets too, or their io threads keep the process alive
+        self.zmq_context.destroy(linger=self.linger_timeout)
         self.benchmark_logger.info("Total bytes sent out: %d", self.bytes_sent)
+        self.benchmark_logger.info(
+            "Messages sent: %d in %d frames", self.msgs_sent, self.frames_sent
+        )
         for k,v in self.bytes_count.items():
             print(f"[{self.my_id}] Bytes Sent: {k}:{v}, {round((100*v)/self.bytes_sent,2)}%")
 
@@ -97,27 +115,60 @@ class NodeCommunicator(object):
 
     async def _recv_loop(self, router):
         while True:
-            sender_id, raw_msg = await router.recv_multipart()
-            msg = loads(raw_msg)
-            # logging.debug("[RECV] FROM: %s, MSG: %s,", sender_id, msg)
-            self._receiver_queue.put_nowait((int(sender_id), msg))
+            sender_id, *raw_msgs = await router.recv_multipart()
+            sender_id = int(sender_id)
+            for raw_msg in raw_msgs:
+                msg = loads(raw_msg)
+                # logging.debug("[RECV] FROM: %s, MSG: %s,", sender_id, msg)
+                self._receiver_queue.put_nowait((sender_id, msg))
+
+    async def _next_frame(self, node_msg_queue):
+        """
+        Waits for the next message to a peer and returns it pickled, together
+        with the other messages queued behind it, as the parts of one frame.
+        The frame is None once LAST_MSG is reached, and the second value is
+        True in that case.
+        """
+        loop = asyncio.get_event_loop()
+        msg = await node_msg_queue.get()
+        frame, size = [], 0
+        deadline = loop.time() + self.flush_delay
+        while msg is not NodeCommunicator.LAST_MSG:
+            raw_msg = dumps(msg)
+            frame.append(raw_msg)
+            size += len(raw_msg)
+            msg_type = msg[1][0][0:1]
+            self.bytes_count[msg_type] = self.bytes_count[msg_type] + len(raw_msg)
+            if size >= self.max_frame_bytes:
+                return frame, False
+            try:
+                msg = node_msg_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    return frame, False
+                try:
+                    msg = await asyncio.wait_for(node_msg_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return frame, False
+        return frame or None, True
 
     async def _process_node_messages(self, node_id, node_msg_queue, send_to_node):
         while True:
-            msg = await node_msg_queue.get()
-            if msg is NodeCommunicator.LAST_MSG:
+            frame, last = await self._next_frame(node_msg_queue)
+            if frame is not None:
+                self.bytes_sent += sum(len(raw_msg) for raw_msg in frame)
+                self.msgs_sent += len(frame)
+                self.frames_sent += 1
+                # logging.info("[SEND] TO: %d, MSGS: %d", node_id, len(frame))
+                await send_to_node(frame)
+            if last:
                 logging.debug("No more messages to Node: %d can be sent.", node_id)
                 break
-            raw_msg = dumps(msg)
-            self.bytes_sent += len(raw_msg)
-            # logging.info("[SEND] TO: %d, MSG_TYPE: %s", node_id, msg[1][0])
-            msg_type = msg[1][0][0:1]
-            self.bytes_count[msg_type] = self.bytes_count[msg_type] + len(raw_msg)
-            await send_to_node([raw_msg])
 
 
 class ProcessProgramRunner(object):
-    def __init__(self, peers_config, n, t, my_id, mpc_config={}, linger_timeout=2):
+    def __init__(self, peers_config, n, t, my_id, mpc_config={}, linger_timeout=2, **comm_kwargs):
         self.peers_config = peers_config
         self.n = n
         self.t = t
@@ -125,7 +176,9 @@ class ProcessProgramRunner(object):
         self.mpc_config = mpc_config
         self.mpc_config[ConfigVars.Reconstruction] = HbmpcConfig.reconstruction
 
-        self.node_communicator = NodeCommunicator(peers_config, my_id, linger_timeout)
+        self.node_communicator = NodeCommunicator(
+            peers_config, my_id, linger_timeout, **comm_kwargs
+        )
         self.progs = []
 
     def execute(self, sid, program, **kwargs):
@@ -155,6 +208,9 @@ class ProcessProgramRunner(object):
     def get_send_recv(self, tag):
         return wrap_send(tag, self.send), self.subscribe(tag)
 
+    def unsubscribe(self, tag):
+        self.subscribe.unsubscribe(tag)
+
     async def __aenter__(self):
         await self.node_communicator.__aenter__()
         self.subscribe_task, self.subscribe = subscribe_recv(
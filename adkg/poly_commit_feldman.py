@@ -18,6 +18,25 @@ class PolyCommitFeldman:
         #     exp *= i
         return lhs == self.g ** phi_at_i
 
+    def verify_eval_many(self, cs, i, phis_at_i, *args):
+        """
+        Checks verify_eval(cs[k], i, phis_at_i[k]) for every k with a single
+        random-linear-combination multiexp.
+        """
+        x = ZR(i)
+        powers = [ZR(1)]
+        for _ in range(1, max(len(c) for c in cs)):
+            powers.append(powers[-1] * x)
+
+        bases, exps = [self.g], [ZR(0)]
+        for c, phi_at_i in zip(cs, phis_at_i):
+            rho = ZR.rand()
+            bases.extend(c)
+            exps.extend([rho * power for power in powers[:len(c)]])
+            exps[0] = exps[0] - rho * phi_at_i
+        return multiexp(bases, exps) == G1.identity()
+
+
     def create_witness(*args):
         return None
 
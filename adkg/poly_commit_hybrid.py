@@ -1,23 +1,49 @@
 # Implements hybrid between Feldman and Pedersen polynomial commitment. 
+from adkg.utils.fixed_base import FixedBasePair
 
 class PolyCommitHybrid:
     def __init__(self, g, h, field, multiexp):
         self.g, self.h = g, h
         self.ZR = field
         self.multiexp = multiexp
+        self.gh = FixedBasePair(g, h)
 
     def commit(self, phi, phi_hat=None):
         if phi_hat is None:
-            return [self.g ** coeff for coeff in phi.coeffs]
+            return [self.gh.g.pow(coeff) for coeff in phi.coeffs]
 
-        return [self.multiexp([self.g, self.h], [phi.coeffs[i], phi_hat.coeffs[i]]) for i in range(len(phi.coeffs))]
+        return [self.gh.commit(phi.coeffs[i], phi_hat.coeffs[i]) for i in range(len(phi.coeffs))]
 
     def verify_eval(self, c, i, phi_at_i, phi_hat_at_i=None):
         powers = [self.ZR(i**j) for j in range(len(c))]
         lhs = self.multiexp(c, powers)
         if phi_hat_at_i is None:
-            return lhs == self.g ** phi_at_i
-        return lhs == self.multiexp([self.g, self.h],[phi_at_i, phi_hat_at_i])
+            return lhs == self.gh.g.pow(phi_at_i)
+        return lhs == self.gh.commit(phi_at_i, phi_hat_at_i)
+
+
+    def verify_eval_many(self, cs, i, phis_at_i, phis_hat_at_i=None):
+        """
+        Checks verify_eval(cs[k], i, phis_at_i[k], phis_hat_at_i[k]) for every k
+        with a single random-linear-combination multiexp. Entries of
+        `phis_hat_at_i` (or the whole list) are None for Feldman commitments.
+        """
+        if phis_hat_at_i is None:
+            phis_hat_at_i = [None] * len(cs)
+        x = self.ZR(i)
+        powers = [self.ZR(1)]
+        for _ in range(1, max(len(c) for c in cs)):
+            powers.append(powers[-1] * x)
+
+        bases, exps = [self.g, self.h], [self.ZR(0), self.ZR(0)]
+        for c, phi_at_i, phi_hat_at_i in zip(cs, phis_at_i, phis_hat_at_i):
+            rho = self.ZR.rand()
+            bases.extend(c)
+            exps.extend([rho * power for power in powers[:len(c)]])
+            exps[0] = exps[0] - rho * phi_at_i
+            if phi_hat_at_i is not None:
+                exps[1] = exps[1] - rho * phi_hat_at_i
+        return self.multiexp(bases, exps) == type(self.g).identity()
 
 
     def create_witness(*args):
@@ -36,7 +62,7 @@ class PolyCommitHybrid:
         return True
     
     def preprocess(self, level=8):
-        self.g.preprocess(level)
+        self.gh = FixedBasePair(self.g, self.h, level)
 
     #homomorphically add commitments
     def commit_add(self, a, b):
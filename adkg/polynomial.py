@@ -21,6 +21,26 @@ def strip_trailing_zeros(a):
 
 _poly_cache = {}
 
+# Native batched evaluators for the pypairing scalar fields, filled in on
+# first use so that other fields work without pypairing
+_native_evaluators = None
+
+
+def native_evaluator(field):
+    global _native_evaluators
+    if _native_evaluators is None:
+        try:
+            from pypairing import ZR as blsZR, Curve25519ZR
+            from pypairing import polyevalmany, curve25519polyevalmany
+        except ImportError:
+            _native_evaluators = {}
+        else:
+            _native_evaluators = {
+                blsZR: polyevalmany,
+                Curve25519ZR: curve25519polyevalmany,
+            }
+    return _native_evaluators.get(field)
+
 
 #Need to redefine this for now until __radd__ is implementable for ZR
 #basically, sum starts with int(0) + iterable[0], which causes problems
@@ -75,6 +95,19 @@ def polynomials_over(field):
         def __eq__(self, other):
             return type(other) is Polynomial and other.coeffs == self.coeffs
 
+        @classmethod
+        def evaluate_many(cls, polys, xs):
+            """
+            Evaluates every polynomial in `polys` at every point in `xs` and
+            returns evals with evals[k][i] = polys[k](xs[i]). Runs as a single
+            native call for the pypairing fields.
+            """
+            xs = [x if type(x) is field_type else field(x) for x in xs]
+            evaluate = native_evaluator(field)
+            if evaluate is not None:
+                return evaluate([p.coeffs for p in polys], xs)
+            return [[p(x) for x in xs] for p in polys]
+
         @classmethod
         def interpolate_at(cls, shares, x_recomb=field(0)):
             # shares are in the form (x, y=f(x))
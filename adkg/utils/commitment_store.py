@@ -0,0 +1,137 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def forward_differences(ZR, t):
+    """
+    `D[k][i]`, the k-th forward difference of x^i at x = 1, so that the k-th
+    difference at 1 of the polynomial with coefficients `c` is
+    `sum(D[k][i] * c[i])`, for k, i up to `t`.
+    """
+    diffs = [[None] * (t + 1) for _ in range(t + 1)]
+    for i in range(t + 1):
+        vals = []
+        for x in range(1, t + 2):
+            v = ZR(1)
+            for _ in range(i):
+                v = v * ZR(x)
+            vals.append(v)
+        for k in range(t + 1):
+            diffs[k][i] = vals[0]
+            vals = [b - a for a, b in zip(vals, vals[1:])]
+    return diffs
+
+
+class DealerCommitments:
+    """
+    The commitments of one dealer's ACSS: `sc` vectors of t+1 points, decoded
+    from the serialized proposal on first access. Indexing by secret yields
+    that secret's vector, like the nested list it stands in for.
+    """
+    def __init__(self, sr, sc, t, data=None, commits=None):
+        self.sr, self.sc, self.t = sr, sc, t
+        self._data, self._commits = data, commits
+
+    @property
+    def decoded(self):
+        return self._commits is not None
+
+    @property
+    def commits(self):
+        if self._commits is None:
+            flat = self.sr.deserialize_gs(self._data)
+            self._commits = [flat[i*(self.t+1):(i+1)*(self.t+1)] for i in range(self.sc)]
+            self._data = None
+        return self._commits
+
+    def __getitem__(self, sec):
+        return self.commits[sec]
+
+    def __len__(self):
+        return self.sc
+
+    def __iter__(self):
+        return iter(self.commits)
+
+    def __getstate__(self):
+        # `_data` may be a memoryview into the proposal, which cannot be pickled
+        state = self.__dict__.copy()
+        if state["_data"] is not None:
+            state["_data"] = bytes(state["_data"])
+        return state
+
+
+class CommitmentStore:
+    """
+    Per-dealer ACSS commitments shared by all phases of one ADKG instance.
+
+    Each dealer's commitments are decoded at most once (see
+    `DealerCommitments`). The aggregates later phases need, namely the
+    commitment to the sum of a set of dealers' polynomials and its evaluation
+    at a node's point (or at all of them), are computed once and cached, so
+    e.g. the n ABA instances deriving coin keys from the same dealer set
+    share the work.
+    """
+    def __init__(self, sr, sc, t, ZR=None, multiexp=None):
+        self.sr, self.sc, self.t = sr, sc, t
+        self.ZR, self.multiexp = ZR, multiexp
+        self.dealers = {}
+        self._sums = {}
+        self._evals = {}
+
+    def add(self, dealer, commits):
+        self.dealers[dealer] = commits
+
+    def __getitem__(self, dealer):
+        return self.dealers[dealer]
+
+    def __contains__(self, dealer):
+        return dealer in self.dealers
+
+    def sum_coeffs(self, dealers, sec):
+        """
+        Coefficient-wise product of secret `sec`'s commitments over `dealers`,
+        i.e. the commitment to the sum of their polynomials.
+        """
+        key = (frozenset(dealers), sec)
+        if key not in self._sums:
+            coeffs = [self.sr.G1.identity() for _ in range(self.t + 1)]
+            for dealer in key[0]:
+                coeffs = [c * d for c, d in zip(coeffs, self.dealers[dealer][sec])]
+            self._sums[key] = coeffs
+        return self._sums[key]
+
+    def eval_sum(self, dealers, sec, x):
+        """
+        `sum_coeffs(dealers, sec)` evaluated in the exponent at point `x`.
+        """
+        key = (frozenset(dealers), sec, x)
+        if key not in self._evals:
+            coeffs = self.sum_coeffs(dealers, sec)
+            x = self.ZR(x)
+            powers = [self.ZR(1)]
+            for _ in range(1, len(coeffs)):
+                powers.append(powers[-1] * x)
+            self._evals[key] = self.multiexp(coeffs, powers)
+        return self._evals[key]
+
+    def eval_sum_all(self, dealers, sec, n):
+        """
+        `eval_sum(dealers, sec, x)` for x = 1..n, e.g. the verification keys
+        of all nodes. Uses t+1 multiexps for the forward-difference table at
+        x = 1 and then t group operations per point, rather than a multiexp
+        per point.
+        """
+        dealers = frozenset(dealers)
+        if all((dealers, sec, x) in self._evals for x in range(1, n + 1)):
+            return [self._evals[(dealers, sec, x)] for x in range(1, n + 1)]
+        coeffs = self.sum_coeffs(dealers, sec)
+        table = [self.multiexp(coeffs, row) for row in forward_differences(self.ZR, self.t)]
+        out = []
+        for x in range(1, n + 1):
+            out.append(table[0])
+            self._evals[(dealers, sec, x)] = table[0]
+            # step the table from x to x+1, in place from the lowest order
+            for k in range(self.t):
+                table[k] = table[k] * table[k + 1]
+        return out
@@ -0,0 +1,47 @@
+# Fixed-base exponentiation tables for generators that never change during a
+# deployment (e.g. the `g` and `h` of the polynomial commitment).
+#
+# The tables are built with the native `preprocess`/`pow` support of
+# `G1` and `Curve25519G`. Note that `base ** x` passes the base by value and
+# would copy the whole table, so exponentiations must go through `pow`.
+
+DEFAULT_LEVEL = 8
+
+# (group, encoded base, level) -> FixedBase, shared by all protocol instances
+_table_cache = {}
+
+
+class FixedBase:
+    def __init__(self, base, level=DEFAULT_LEVEL):
+        # the **1 creates a private copy, so the caller's element stays light
+        self.base = base ** 1
+        self.base.preprocess(level)
+
+    def pow(self, exp):
+        return self.base.pow(exp)
+
+
+class FixedBasePair:
+    """
+    Computes the two-base commitment form g^a h^b from fixed-base tables.
+    """
+    def __init__(self, g, h, level=DEFAULT_LEVEL):
+        self.g = fixed_base(g, level)
+        self.h = fixed_base(h, level)
+
+    def commit(self, a, b):
+        return self.g.pow(a) * self.h.pow(b)
+
+
+def fixed_base(base, level=DEFAULT_LEVEL):
+    """
+    Returns the (cached) fixed-base table for `base`.
+    """
+    key = (type(base), base.__getstate__(), level)
+    if key not in _table_cache:
+        _table_cache[key] = FixedBase(base, level)
+    return _table_cache[key]
+
+
+def clear_cache():
+    _table_cache.clear()
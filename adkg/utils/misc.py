@@ -1,9 +1,10 @@
 from .typecheck import TypeCheck
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from asyncio import Queue
 import asyncio
 from typing import Callable
 import logging
+import sys
 
 
 def print_exception_callback(future):
@@ -70,34 +71,144 @@ def transpose_lists(lists: list):
     return [[lists[j][i] for j in range(rows)] for i in range(cols)]
 
 
-def subscribe_recv(recv):
+def approx_size(o):
+    """ Cheap estimate of the bytes held by a received message: the
+    payload of bytes-like objects and strings, `sys.getsizeof` for other
+    leaves, summed over tuples and lists.
+    """
+    if isinstance(o, (bytes, bytearray, str)):
+        return len(o)
+    if isinstance(o, (tuple, list)):
+        return sum(approx_size(x) for x in o)
+    return sys.getsizeof(o)
+
+
+class TagRouter:
+    """ Per-tag queues for the messages of one `recv` channel.
+
+    Calling the router with a tag subscribes to it and returns the getter of
+    its queue; messages that arrive before the subscription are buffered, up
+    to `max_pending_bytes` over all such tags. `unsubscribe` drops the queue
+    and every later message for that tag, so a finished protocol instance
+    holds no memory; only the last `max_closed` closed tags are remembered.
+    At most `max_queue` messages (or the `maxsize` given on subscription)
+    are buffered per tag, further ones are dropped.
+    """
+
+    def __init__(self, max_queue=None, sizeof=approx_size, max_pending_bytes=1 << 26, max_closed=4096):
+        self.max_queue, self.sizeof = max_queue, sizeof
+        self.max_pending_bytes, self.max_closed = max_pending_bytes, max_closed
+        self.queues = {}
+        self.limits = {}
+        self.held = defaultdict(int)  # tag -> approximate bytes queued
+        self.pending_bytes = 0  # bytes queued for tags not subscribed yet
+        self.dropped = defaultdict(int)  # tag -> messages dropped while open
+        self.dropped_pending = 0  # messages over the max_pending_bytes cap
+        self.dropped_closed = 0  # messages for unsubscribed tags
+        self.taken = set()
+        self.closed = OrderedDict()  # used as an LRU set of closed tags
+
+    def _queue(self, tag):
+        queue = self.queues.get(tag)
+        if queue is None:
+            queue = self.queues[tag] = Queue()
+        return queue
+
+    def deliver(self, sender, tag, o):
+        if tag in self.closed:
+            self.dropped_closed += 1
+            return
+        size = self.sizeof(o)
+        subscribed = tag in self.taken
+        if not subscribed and self.pending_bytes + size > self.max_pending_bytes:
+            # nobody may ever subscribe to this tag
+            self.dropped_pending += 1
+            return
+        queue = self._queue(tag)
+        limit = self.limits.get(tag, self.max_queue)
+        if limit is not None and queue.qsize() >= limit:
+            self.dropped[tag] += 1
+            return
+        self.held[tag] += size
+        if not subscribed:
+            self.pending_bytes += size
+        queue.put_nowait((sender, o, size))
+
+    def __call__(self, tag, maxsize=None):
+        # TODO: make this raise an exception
+        # Ensure that this tag has not been subscribed to already
+        assert tag not in self.taken and tag not in self.closed
+        self.taken.add(tag)
+        self.pending_bytes -= self.held.get(tag, 0)
+        if maxsize is not None:
+            self.limits[tag] = maxsize
+        queue = self._queue(tag)
+
+        async def get():
+            sender, o, size = await queue.get()
+            if tag in self.held:
+                self.held[tag] -= size
+            return sender, o
+
+        return get
+
+    def unsubscribe(self, tag):
+        """ Frees the queue of `tag` and drops its future messages. A pending
+        getter of the tag never returns, so its reader must be cancelled.
+        """
+        self.closed[tag] = None
+        self.closed.move_to_end(tag)
+        if len(self.closed) > self.max_closed:
+            self.closed.popitem(last=False)
+        if tag in self.taken:
+            self.taken.discard(tag)
+        else:
+            self.pending_bytes -= self.held.get(tag, 0)
+        self.queues.pop(tag, None)
+        self.limits.pop(tag, None)
+        self.held.pop(tag, None)
+        self.dropped_closed += self.dropped.pop(tag, 0)
+
+    def close(self):
+        """ Unsubscribes from every tag. """
+        for tag in list(self.queues):
+            self.unsubscribe(tag)
+
+    def stats(self):
+        """ Messages and approximate bytes queued, and messages dropped,
+        for every open tag.
+        """
+        return {
+            tag: {
+                "queued": queue.qsize(),
+                "bytes": self.held.get(tag, 0),
+                "dropped": self.dropped.get(tag, 0),
+            }
+            for tag, queue in self.queues.items()
+        }
+
+    def held_bytes(self):
+        return sum(self.held.values())
+
+
+def subscribe_recv(recv, max_queue=None, sizeof=approx_size, max_pending_bytes=1 << 26):
     """ Given the recv method for this batch reconstruction,
     create a background loop to put the received events into
     the appropriate queue for the tag
 
     Returns _task and subscribe, where _task is to be run in
     the background to forward events to the associated queue,
-    and subscribe, which is used to register a new tag/queue pair
+    and subscribe, a `TagRouter` which is called to register a new
+    tag/queue pair and can later unsubscribe it
     """
-    # Stores the queues for each subscribed tag
-    tag_table = defaultdict(Queue)
-    taken = set()  # Replace this with a bloom filter?
+    router = TagRouter(max_queue, sizeof, max_pending_bytes)
 
     async def _recv_loop():
         while True:
             # Whenever we receive a share array, directly put it in the
             # appropriate queue for that round
             j, (tag, o) = await recv()
-            tag_table[tag].put_nowait((j, o))
-
-    def subscribe(tag):
-        # TODO: make this raise an exception
-        # Ensure that this tag has not been subscribed to already
-        assert tag not in taken
-        taken.add(tag)
-
-        # Return the getter of the queue for this tag
-        return tag_table[tag].get
+            router.deliver(j, tag, o)
 
     _task = asyncio.create_task(_recv_loop())
-    return _task, subscribe
+    return _task, router
@@ -0,0 +1,55 @@
+import asyncio
+
+
+class PrecomputePool:
+    """
+    Keeps up to `depth` items made by `make()` ready ahead of time, e.g. the
+    `DealerBundle`s of upcoming ACSS instances.
+
+    Items are made one at a time on `executor` (the loop's default thread
+    pool if None), and a new one is started whenever one is taken. Every
+    item is handed out at most once.
+    """
+    def __init__(self, make, depth, executor=None):
+        assert depth > 0
+        self.make, self.depth, self.executor = make, depth, executor
+        self.ready = asyncio.Queue(maxsize=depth)
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._refill())
+        return self
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def _refill(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            item = await loop.run_in_executor(self.executor, self.make)
+            await self.ready.put(item)
+
+    async def fill(self):
+        """
+        Waits until the pool holds `depth` items.
+        """
+        self.start()
+        while not self.ready.full():
+            await asyncio.sleep(0.01)
+
+    async def get(self):
+        self.start()
+        return await self.ready.get()
+
+    def get_nowait(self):
+        """
+        Returns a ready item, or None if the pool is empty.
+        """
+        self.start()
+        try:
+            return self.ready.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
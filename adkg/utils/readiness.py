@@ -0,0 +1,72 @@
+import asyncio
+from collections import defaultdict
+
+
+class _SubsetWaiter:
+    __slots__ = ("remaining", "future")
+
+    def __init__(self, remaining, future):
+        self.remaining = remaining
+        self.future = future
+
+
+class DealerReadiness:
+    """
+    Tracks which dealers have completed (e.g. their ACSS instance has output).
+
+    Waiters register for a single dealer, a subset of dealers, or a count of
+    completed dealers. Each waiter holds a counter of missing dealers and is
+    woken exactly once, when the last of them completes, so there is no shared
+    event to clear and no rescanning of the completed set.
+    """
+    def __init__(self, n):
+        self.n = n
+        self.ready = set()
+        self._subset_waiters = defaultdict(list)  # dealer -> [_SubsetWaiter]
+        self._count_waiters = defaultdict(list)  # count -> [future]
+
+    def is_ready(self, dealer):
+        return dealer in self.ready
+
+    def mark_ready(self, dealer):
+        if dealer in self.ready:
+            return
+        self.ready.add(dealer)
+        for waiter in self._subset_waiters.pop(dealer, []):
+            waiter.remaining -= 1
+            if waiter.remaining == 0 and not waiter.future.done():
+                waiter.future.set_result(True)
+        for future in self._count_waiters.pop(len(self.ready), []):
+            if not future.done():
+                future.set_result(True)
+
+    def wait_subset(self, dealers):
+        """
+        Returns a future resolved once every dealer in `dealers` is ready.
+        """
+        future = asyncio.get_event_loop().create_future()
+        missing = set(dealers) - self.ready
+        if not missing:
+            future.set_result(True)
+            return future
+        waiter = _SubsetWaiter(len(missing), future)
+        for dealer in missing:
+            self._subset_waiters[dealer].append(waiter)
+        return future
+
+    def wait_for(self, dealer):
+        """
+        Returns a future resolved once `dealer` is ready.
+        """
+        return self.wait_subset([dealer])
+
+    def wait_count(self, count):
+        """
+        Returns a future resolved once at least `count` dealers are ready.
+        """
+        future = asyncio.get_event_loop().create_future()
+        if len(self.ready) >= count:
+            future.set_result(True)
+        else:
+            self._count_waiters[count].append(future)
+        return future
@@ -21,22 +21,13 @@ class Serial:
         g.__setstate__(data)
         return g
 
+    # The bulk methods accept any buffer (e.g. a memoryview into a message)
+    # and decode it in one native call.
     def deserialize_gs(self, data):
-        n = len(data)//self.g_size
-        gs = [None for _ in range(n)]
-        for i in range(n):            
-            g = self.G1()
-            g.__setstate__(data[i*self.g_size:(i+1)*self.g_size])
-            gs[i] = g
-        return gs
+        return self.G1.from_bytes_many(data)
 
     def serialize_gs(self, g_list):    
-        n = len(g_list)
-        data = bytearray()
-        for i in range(n):
-            g = g_list[i]
-            data.extend(g.__getstate__())
-        return data
+        return bytearray(self.G1.to_bytes_many(list(g_list)))
 
     def serialize_f(self, f):
         return f.__getstate__()
@@ -47,20 +38,9 @@ class Serial:
         return f
 
     def serialize_fs(self, f_list):    
-        n = len(f_list)
-        data = bytearray()
-        for i in range(n):
-            f = f_list[i]
-            data.extend(f.__getstate__())
-        return data
+        return bytearray(self.ZR.to_bytes_many(list(f_list)))
     
     def deserialize_fs(self, data):    
-        n = len(data)//self.f_size
-        fs = [None for _ in range(n)]
-        for i in range(n):            
-            f = self.ZR()
-            f.__setstate__(data[i*self.f_size:(i+1)*self.f_size])
-            fs[i] = f
-        return fs
+        return self.ZR.from_bytes_many(data)
 
 
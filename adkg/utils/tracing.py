@@ -0,0 +1,59 @@
+"""
+Structured per-node tracing of the ADKG pipeline.
+
+A `Tracer` records timestamped events tagged with a phase (e.g. "acss",
+"rbc", "aba", "coin", "prekey", "key") and milestones marking the end of a
+pipeline stage. `dump` writes them as one JSON document per node;
+`scripts/merge_traces.py` merges these into a cluster-wide view.
+"""
+import json
+import os
+import time
+
+
+class Tracer:
+    def __init__(self, node_id, clock=time.time):
+        self.node_id = node_id
+        self.clock = clock
+        self.events = []
+        self.milestones = {}
+
+    def event(self, phase, name, **fields):
+        fields.update({"t": self.clock(), "phase": phase, "event": name})
+        self.events.append(fields)
+
+    def mark(self, milestone):
+        """
+        Records the first time this node reaches `milestone`.
+        """
+        if milestone not in self.milestones:
+            self.milestones[milestone] = self.clock()
+            self.event("milestone", milestone)
+
+    def to_dict(self):
+        return {
+            "node_id": self.node_id,
+            "milestones": self.milestones,
+            "events": self.events,
+        }
+
+    def dump(self, path):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+
+class NullTracer:
+    """
+    Drop-in tracer that records nothing; used when tracing is disabled.
+    """
+    def event(self, phase, name, **fields):
+        pass
+
+    def mark(self, milestone):
+        pass
+
+
+NULL_TRACER = NullTracer()
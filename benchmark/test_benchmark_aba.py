@@ -0,0 +1,82 @@
+from adkg.broadcast.tylerba import tylerba
+from adkg.broadcast.vectorba import VectorABA
+from pytest import mark
+import asyncio
+
+
+def counting(sends, counter):
+    def _wrap(send):
+        def _send(dest, msg):
+            counter[0] += 1
+            send(dest, msg)
+        return _send
+    return [_wrap(send) for send in sends]
+
+
+async def run_tylerba(n, f, sends, recvs):
+    # one sub-channel per instance, as `ADKG` subscribes one tag per ABA
+    queues = [[asyncio.Queue() for _ in range(n)] for _ in range(n)]
+
+    def demux(i):
+        async def _demux():
+            while True:
+                sender, (j, msg) = await recvs[i]()
+                queues[i][j].put_nowait((sender, msg))
+        return asyncio.create_task(_demux())
+
+    def bcast(i, j):
+        def _bcast(o):
+            for k in range(n):
+                sends[i](k, (j, o))
+        return _bcast
+
+    demuxes = [demux(i) for i in range(n)]
+    outputs = [asyncio.Queue() for _ in range(n)]
+    inputs = [asyncio.Queue() for _ in range(n)]
+    tasks = []
+    for i in range(n):
+        for j in range(n):
+            inputs[i].put_nowait(1)
+            tasks.append(asyncio.create_task(tylerba(
+                "B" + str(j), i, n, f, asyncio.Queue().get, inputs[i].get,
+                outputs[i].put_nowait, bcast(i, j), queues[i][j].get,
+            )))
+    await asyncio.gather(*[outputs[i].get() for i in range(n) for _ in range(n)])
+    await asyncio.gather(*tasks)
+    for task in demuxes:
+        task.cancel()
+
+
+async def run_vectorba(n, f, sends, recvs):
+    outputs = [asyncio.Queue() for _ in range(n)]
+    abas = [
+        VectorABA("B", i, n, f, [asyncio.Queue().get] * n, [outputs[i].put_nowait] * n, sends[i], recvs[i])
+        for i in range(n)
+    ]
+    tasks = [asyncio.create_task(aba.run()) for aba in abas]
+    for aba in abas:
+        for j in range(n):
+            aba.input(j, 1)
+    await asyncio.gather(*[outputs[i].get() for i in range(n) for _ in range(n)])
+    await asyncio.gather(*tasks)
+
+
+@mark.parametrize("mode", ["tylerba", "vector"])
+@mark.parametrize("t", [1, 2, 5])
+def test_benchmark_aba(benchmark_router, benchmark, mode, t):
+    """
+    The n ABAs of one common subset, all with input 1. The number of
+    messages sent is in `extra_info`.
+    """
+    loop = asyncio.get_event_loop()
+    n = 3 * t + 1
+    run = run_tylerba if mode == "tylerba" else run_vectorba
+    counter = [0]
+
+    def _prog():
+        counter[0] = 0
+        sends, recvs, _ = benchmark_router(n)
+        loop.run_until_complete(run(n, t, counting(sends, counter), recvs))
+
+    benchmark(_prog)
+    benchmark.extra_info["messages"] = counter[0]
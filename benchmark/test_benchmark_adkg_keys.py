@@ -0,0 +1,56 @@
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+from adkg.extraction_matrix import get_extraction_matrices
+from adkg.adkg import ADKG
+from pytest import mark
+import asyncio
+import time
+from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod, matvec
+
+
+def get_avss_params(n):
+    g, h = G1.rand(b'g'), G1.rand(b'h')
+    public_keys, private_keys = [None] * n, [None] * n
+    for i in range(n):
+        private_keys[i] = ZR.hash(str(i).encode())
+        public_keys[i] = pow(g, private_keys[i])
+    return g, h, public_keys, private_keys
+
+
+async def run_adkg(params):
+    (sends, recvs, t, n, deg, g, h, pks, sks, pc, matrices, batches) = params
+    curve_params = (ZR, G1, multiexp, dotprod, matvec)
+    dkg_list = [
+        ADKG(pks, sks[i], g, h, n, t, deg, i, sends[i], recvs[i], pc, curve_params, matrices, batches=batches)
+        for i in range(n)
+    ]
+    start_time = time.time()
+    tasks = [asyncio.create_task(dkg.run_adkg(start_time)) for dkg in dkg_list]
+    await asyncio.gather(
+        *[dkg.output_queue.get() for dkg in dkg_list for _ in range(batches)]
+    )
+    for dkg in dkg_list:
+        dkg.kill()
+    for task in tasks:
+        task.cancel()
+
+
+@mark.parametrize("batches", [1, 4, 16, 64])
+@mark.parametrize("t", [1, 2])
+def test_benchmark_adkg_keys(benchmark_router, benchmark, t, batches):
+    """
+    One ADKG run producing `batches` keys; keys/s is in `extra_info`.
+    """
+    loop = asyncio.get_event_loop()
+    n, deg = 3 * t + 1, t
+    g, h, pks, sks = get_avss_params(n)
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+    matrices = get_extraction_matrices(ZR, n, t, deg)
+
+    def _prog():
+        sends, recvs, _ = benchmark_router(n)
+        params = (sends, recvs, t, n, deg, g, h, pks, sks, pc, matrices, batches)
+        loop.run_until_complete(run_adkg(params))
+
+    benchmark(_prog)
+    benchmark.extra_info["keys"] = batches
+    benchmark.extra_info["keys_per_sec"] = batches / benchmark.stats.stats.mean
@@ -0,0 +1,85 @@
+from adkg.adkg import CP
+from adkg.broadcast.dleqcoin import dleq_coin, ThresholdCoinKey
+from adkg.polynomial import polynomials_over
+from adkg.utils.poly_misc import interpolate_g1_at_x
+from pytest import mark
+import asyncio
+import hashlib
+import pypairing
+
+
+def shares(ZR, n, t):
+    phi = polynomials_over(ZR).random(t)
+    return [phi(i + 1) for i in range(n)]
+
+
+@mark.parametrize("scheme", ["bls", "dleq"])
+@mark.parametrize("t", [1, 3, 5, 10, 16])
+def test_benchmark_coin_share_work(benchmark, scheme, t):
+    """
+    One node's computation for one coin round: its own share, checking f+1
+    shares (the BLS coin combines first and checks the result with two
+    pairings; the DLEQ coin batch-verifies the proofs) and combining them.
+    """
+    n = 3 * t + 1
+    if scheme == "bls":
+        ZR, G1, G2 = pypairing.ZR, pypairing.G1, pypairing.G2
+        sks = shares(ZR, n, t)
+        g2 = G2.rand()
+        vk = g2 ** sks[0]  # any key, only the cost matters
+        h = G1.hash(b"sidA0")
+        sigs = [[i + 1, h ** sks[i]] for i in range(t + 1)]
+
+        def _prog():
+            h ** sks[0]
+            sig = interpolate_g1_at_x(sigs, 0, G1, ZR)
+            pypairing.pair(sig, g2) == pypairing.pair(h, vk)
+    else:
+        ZR, G1 = pypairing.Curve25519ZR, pypairing.Curve25519G
+        multiexp = pypairing.curve25519multiexp
+        sks = shares(ZR, n, t)
+        g = G1.hash(b"g")
+        vks = [g ** sk for sk in sks]
+        h = G1.hash(b"sidA0")
+        cp = CP(g, h, ZR, multiexp, fixed_h=False)
+        sigs = [h ** sks[i] for i in range(t + 1)]
+        proofs = [(vks[i], sigs[i], cp.dleq_prove(sks[i], vks[i], sigs[i])) for i in range(t + 1)]
+
+        def _prog():
+            share = h ** sks[0]
+            cp.dleq_prove(sks[0], vks[0], share)
+            cp.dleq_batch_verify(proofs)
+            interpolate_g1_at_x([[i + 1, s] for i, s in enumerate(sigs)], 0, G1, ZR)
+
+    benchmark(_prog)
+
+
+async def run_dleq_coin(n, t, broadcasts, recvs, keys, rounds):
+    result = await asyncio.gather(
+        *[dleq_coin("sidA", i, n, t, keys[i], broadcasts[i], recvs[i]) for i in range(n)]
+    )
+    coins, recv_tasks = zip(*result)
+    for r in range(rounds):
+        await asyncio.gather(*[coin(r) for coin in coins])
+    for task in recv_tasks:
+        task.cancel()
+
+
+@mark.parametrize("t", [1, 3, 5])
+def test_benchmark_dleq_coin(benchmark_router, benchmark, t):
+    """
+    Ten rounds of the DLEQ coin between n = 3t+1 nodes.
+    """
+    loop = asyncio.get_event_loop()
+    n = 3 * t + 1
+    ZR, G1 = pypairing.Curve25519ZR, pypairing.Curve25519G
+    g = G1.hash(hashlib.sha256(b"g").digest())
+    sks = shares(ZR, n, t)
+    vks = [g ** sk for sk in sks]
+    keys = [ThresholdCoinKey(g, vks, sk, ZR, pypairing.curve25519multiexp) for sk in sks]
+
+    def _prog():
+        _, recvs, broadcasts = benchmark_router(n)
+        loop.run_until_complete(run_dleq_coin(n, t, broadcasts, recvs, keys, 10))
+
+    benchmark(_prog)
@@ -0,0 +1,135 @@
+from adkg.broadcast.optqrbc import optqrbc
+from adkg.broadcast.ecdispersal import ECDispersal
+from adkg.router import SimpleRouter
+from pickle import dumps
+from pytest import mark
+import asyncio
+import os
+
+# Sizes of an ACSS proposal over BLS12-381: sc vectors of t+1 commitments and
+# one ephemeral key (48 bytes each), plus a 64*sc byte ciphertext per node
+G_SIZE = 48
+
+
+def acss_payload(n, t, sc):
+    header = os.urandom(G_SIZE * ((t + 1) * sc + 1))
+    pieces = [os.urandom(64 * sc) for _ in range(n)]
+    return header, pieces
+
+
+def counting(sends, counter):
+    def _wrap(send):
+        def _send(dest, msg):
+            counter[0] += len(dumps(msg))
+            send(dest, msg)
+        return _send
+    return [_wrap(send) for send in sends]
+
+
+class UplinkRouter(SimpleRouter):
+    """
+    Models each party's uplink: a message leaves once the sender has finished
+    sending its earlier ones, takes `size / bandwidth` seconds to upload and
+    `latency` seconds to arrive. Bytes sent are counted per party.
+    """
+    def __init__(self, num_parties, bandwidth, latency):
+        super().__init__(num_parties)
+        self.bandwidth, self.latency = bandwidth, latency
+        self.busy_until = [0.0] * num_parties
+        self.bytes_sent = [0] * num_parties
+
+    def send(self, player_id: int, dest_id: int, message: object):
+        size = len(dumps(message))
+        self.bytes_sent[player_id] += size
+        loop = asyncio.get_event_loop()
+        if dest_id == player_id:
+            return super().send(player_id, dest_id, message)
+        start = max(loop.time(), self.busy_until[player_id])
+        self.busy_until[player_id] = start + size / self.bandwidth
+        loop.call_at(self.busy_until[player_id] + self.latency, super().send, player_id, dest_id, message)
+
+
+async def run_optqrbc(sends, recvs, n, t, header, pieces, stripe_threshold=None):
+    msg = header + b"".join(pieces)
+
+    async def predicate(_m):
+        return True
+
+    outputs = [asyncio.Queue() for _ in range(n)]
+    tasks = [
+        asyncio.create_task(optqrbc(
+            "sidA", i, n, t, 0, predicate, msg if i == 0 else None,
+            outputs[i].put_nowait, sends[i], recvs[i], stripe_threshold=stripe_threshold,
+        ))
+        for i in range(n)
+    ]
+    await asyncio.gather(*[q.get() for q in outputs])
+    for task in tasks:
+        task.cancel()
+
+
+async def run_ecdispersal(sends, recvs, n, t, header, pieces):
+    async def predicate(header, piece):
+        return True
+
+    outputs = [asyncio.Queue() for _ in range(n)]
+    tasks = [
+        asyncio.create_task(ECDispersal("sidA", i, n, t, 0, sends[i], recvs[i]).disperse(
+            predicate, (header, pieces) if i == 0 else None,
+            lambda h, p, q=outputs[i]: q.put_nowait(p),
+        ))
+        for i in range(n)
+    ]
+    await asyncio.gather(*[q.get() for q in outputs])
+    for task in tasks:
+        task.cancel()
+
+
+@mark.parametrize("mode", ["rbc", "avid"])
+@mark.parametrize("t", [1, 3, 5, 10, 16])
+def test_benchmark_acss_dispersal(benchmark_router, benchmark, mode, t):
+    """
+    Bytes sent by all nodes to disperse one ACSS proposal (with deg = t, so
+    sc = 2), reported in `extra_info`.
+    """
+    loop = asyncio.get_event_loop()
+    n, sc = 3 * t + 1, 2
+    header, pieces = acss_payload(n, t, sc)
+    run = run_optqrbc if mode == "rbc" else run_ecdispersal
+    counter = [0]
+
+    def _prog():
+        counter[0] = 0
+        sends, recvs, _ = benchmark_router(n)
+        loop.run_until_complete(run(counting(sends, counter), recvs, n, t, header, pieces))
+
+    benchmark(_prog)
+    benchmark.extra_info["bytes_sent"] = counter[0]
+    benchmark.extra_info["payload_bytes"] = len(header) + sum(len(p) for p in pieces)
+
+
+@mark.parametrize("mode", ["propose", "stripes"])
+@mark.parametrize("size", [1 << 10, 1 << 16, 1 << 20])
+@mark.parametrize("t", [1, 3, 5])
+def test_benchmark_optqrbc_stripes(benchmark, mode, size, t):
+    """
+    Latency of one optqrbc broadcast of `size` bytes over 100 Mbit/s uplinks
+    with 10 ms latency, with the leader sending the whole proposal to everyone
+    or one stripe each. Leader and total bytes are in `extra_info`.
+    """
+    loop = asyncio.get_event_loop()
+    n = 3 * t + 1
+    msg = os.urandom(size)
+    stripe_threshold = None if mode == "propose" else 0
+    router = None
+
+    def _prog():
+        nonlocal router
+        router = UplinkRouter(n, bandwidth=12.5e6, latency=0.01)
+        loop.run_until_complete(
+            run_optqrbc(router.sends, router.recvs, n, t, msg, [], stripe_threshold)
+        )
+
+    benchmark(_prog)
+    benchmark.extra_info["leader_bytes"] = router.bytes_sent[0]
+    benchmark.extra_info["bytes_sent"] = sum(router.bytes_sent)
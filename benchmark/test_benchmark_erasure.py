@@ -0,0 +1,24 @@
+from adkg.broadcast.erasure import encode, decode
+from pytest import mark
+import os
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+@mark.parametrize("size", SIZES)
+@mark.parametrize("t", [1, 10, 33])
+def test_benchmark_erasure_encode(benchmark, t, size):
+    n, k = 3 * t + 1, t + 1
+    m = os.urandom(size)
+    benchmark(encode, k, n, m)
+
+
+@mark.parametrize("size", SIZES)
+@mark.parametrize("t", [1, 10, 33])
+def test_benchmark_erasure_decode(benchmark, t, size):
+    n, k = 3 * t + 1, t + 1
+    m = os.urandom(size)
+    stripes = encode(k, n, m)
+    # the worst case for a systematic code: only parity stripes
+    parity = {i: stripes[i] for i in range(n - k, n)}
+    benchmark(decode, k, n, parity)
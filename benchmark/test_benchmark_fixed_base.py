@@ -0,0 +1,39 @@
+from pytest import mark
+from pypairing import ZR, G1, blsmultiexp
+from pypairing import Curve25519ZR, Curve25519G, curve25519multiexp
+from adkg.utils.fixed_base import fixed_base, FixedBasePair
+
+CURVES = {
+    "bls12_381": (ZR, G1, blsmultiexp),
+    "curve25519": (Curve25519ZR, Curve25519G, curve25519multiexp),
+}
+
+
+@mark.parametrize("curve", list(CURVES))
+def test_benchmark_variable_base_exp(benchmark, curve):
+    field, group, _ = CURVES[curve]
+    g, x = group.hash(b"g"), field.rand()
+    benchmark(pow, g, x)
+
+
+@mark.parametrize("curve", list(CURVES))
+def test_benchmark_fixed_base_exp(benchmark, curve):
+    field, group, _ = CURVES[curve]
+    fg, x = fixed_base(group.hash(b"g")), field.rand()
+    benchmark(fg.pow, x)
+
+
+@mark.parametrize("curve", list(CURVES))
+def test_benchmark_multiexp_commit(benchmark, curve):
+    field, group, multiexp = CURVES[curve]
+    g, h = group.hash(b"g"), group.hash(b"h")
+    a, b = field.rand(), field.rand()
+    benchmark(multiexp, [g, h], [a, b])
+
+
+@mark.parametrize("curve", list(CURVES))
+def test_benchmark_fixed_base_commit(benchmark, curve):
+    field, group, _ = CURVES[curve]
+    gh = FixedBasePair(group.hash(b"g"), group.hash(b"h"))
+    a, b = field.rand(), field.rand()
+    benchmark(gh.commit, a, b)
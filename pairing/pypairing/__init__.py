@@ -23,7 +23,15 @@ from .pypairing import (
     hashcurve25519gsbn,
     curve25519dotprod,
     curve25519multiexp,
-    blsmultiexp
+    curve25519batchpow,
+    curve25519matvec,
+    curve25519extraction_matrices,
+    curve25519polyevalmany,
+    blsmultiexp,
+    blsbatchpow,
+    matvec,
+    extraction_matrices,
+    polyevalmany
 )
 
 __all__ = [
@@ -49,5 +57,13 @@ __all__ = [
     "hashcurve25519gsbn",
     "curve25519dotprod",
     "curve25519multiexp",
-    "blsmultiexp"
+    "curve25519batchpow",
+    "curve25519matvec",
+    "curve25519extraction_matrices",
+    "curve25519polyevalmany",
+    "blsmultiexp",
+    "blsbatchpow",
+    "matvec",
+    "extraction_matrices",
+    "polyevalmany"
 ]
@@ -20,6 +20,7 @@ use pyo3::types::PyList;
 use pyo3::types::PyBool;
 use pyo3::types::PyBytes;
 use pyo3::types::PyLong;
+use pyo3::buffer::PyBuffer;
 use pyo3::PyNumberProtocol;
 use pyo3::basic::CompareOp;
 use pyo3::PyErr;
@@ -444,6 +445,35 @@ impl PyG1 {
         self.g1 = ga.into_projective();
         Ok(())*/
     }
+
+    /// Decodes a buffer of back-to-back compressed points (as produced by
+    /// `to_bytes_many`). Accepts any buffer-protocol object, e.g. a
+    /// memoryview into a larger message.
+    #[staticmethod]
+    fn from_bytes_many(data: &PyAny, py: Python) -> PyResult<Vec<PyG1>>{
+        let bytes = buffer_bytes(py, data, 48, "G1.from_bytes_many")?;
+        let mut out = Vec::with_capacity(bytes.len() / 48);
+        for chunk in bytes.chunks(48){
+            let mut arr = [0u8; 48];
+            arr.copy_from_slice(chunk);
+            let aff = G1Compressed(arr).into_affine()
+                .map_err(|_| PyErr::new::<exceptions::ValueError, _>("G1.from_bytes_many: invalid point encoding"))?;
+            out.push(PyG1{ g1: aff.into_projective(), pp: Vec::new(), pplevel: 0 });
+        }
+        Ok(out)
+    }
+
+    /// Concatenates the `__getstate__` encodings of `gs`.
+    #[staticmethod]
+    fn to_bytes_many<'p>(gs: &PyList, py: Python<'p>) -> PyResult<&'p PyBytes>{
+        let mut out: Vec<u8> = Vec::with_capacity(gs.len() * 48);
+        for gi in gs.iter(){
+            let gicel: &PyCell<PyG1> = gi.downcast()?;
+            let gif: &PyG1 = &gicel.borrow();
+            out.extend_from_slice(gif.g1.into_affine().into_compressed().as_ref());
+        }
+        Ok(PyBytes::new(py, &out))
+    }
     
     //Creates preprocessing elements to allow fast scalar multiplication.
     //Level determines extent of precomputation
@@ -1219,6 +1249,38 @@ impl PyFr {
         self.fr = myfr;
         Ok(())
     }
+
+    /// Decodes a buffer of back-to-back 32-byte little-endian scalars (as
+    /// produced by `to_bytes_many`). Accepts any buffer-protocol object.
+    #[staticmethod]
+    fn from_bytes_many(data: &PyAny, py: Python) -> PyResult<Vec<PyFr>>{
+        let bytes = buffer_bytes(py, data, 32, "ZR.from_bytes_many")?;
+        let mut out = Vec::with_capacity(bytes.len() / 32);
+        for chunk in bytes.chunks(32){
+            let mut repr = [0u64; 4];
+            for (limb, word) in repr.iter_mut().zip(chunk.chunks(8)){
+                *limb = u64::from_le_bytes(word.try_into().unwrap());
+            }
+            let fr = Fr::from_repr(FrRepr(repr))
+                .map_err(|_| PyErr::new::<exceptions::ValueError, _>("ZR.from_bytes_many: non-canonical scalar encoding"))?;
+            out.push(PyFr{ fr: fr });
+        }
+        Ok(out)
+    }
+
+    /// Concatenates the `__getstate__` encodings of `frs`.
+    #[staticmethod]
+    fn to_bytes_many<'p>(frs: &PyList, py: Python<'p>) -> PyResult<&'p PyBytes>{
+        let mut out: Vec<u8> = Vec::with_capacity(frs.len() * 32);
+        for fi in frs.iter(){
+            let ficel: &PyCell<PyFr> = fi.downcast()?;
+            let fif: &PyFr = &ficel.borrow();
+            for limb in FrRepr::from(fif.fr).as_ref().iter(){
+                out.extend_from_slice(&limb.to_le_bytes());
+            }
+        }
+        Ok(PyBytes::new(py, &out))
+    }
     
     fn __eq__<'p>(&self, other: &PyAny, py: Python<'p>) -> PyResult<&'p PyBool> {
         let otherresult = pyfr_from_pyany(other);
@@ -1972,6 +2034,32 @@ impl PyRistG {
         self.g = decompressed;
         Ok(())
     }
+
+    /// Decodes a buffer of back-to-back compressed Ristretto points (as
+    /// produced by `to_bytes_many`). Accepts any buffer-protocol object.
+    #[staticmethod]
+    fn from_bytes_many(data: &PyAny, py: Python) -> PyResult<Vec<PyRistG>>{
+        let bytes = buffer_bytes(py, data, 32, "Curve25519G.from_bytes_many")?;
+        let mut out = Vec::with_capacity(bytes.len() / 32);
+        for chunk in bytes.chunks(32){
+            let point = CompressedRistretto::from_slice(chunk).decompress()
+                .ok_or_else(|| PyErr::new::<exceptions::ValueError, _>("Curve25519G.from_bytes_many: invalid point encoding"))?;
+            out.push(PyRistG{ g: point, pp: Vec::new(), pplevel: 0 });
+        }
+        Ok(out)
+    }
+
+    /// Concatenates the `__getstate__` encodings of `gs`.
+    #[staticmethod]
+    fn to_bytes_many<'p>(gs: &PyList, py: Python<'p>) -> PyResult<&'p PyBytes>{
+        let mut out: Vec<u8> = Vec::with_capacity(gs.len() * 32);
+        for gi in gs.iter(){
+            let gicel: &PyCell<PyRistG> = gi.downcast()?;
+            let gif: &PyRistG = &gicel.borrow();
+            out.extend_from_slice(&gif.g.compress().to_bytes());
+        }
+        Ok(PyBytes::new(py, &out))
+    }
     
     //Creates preprocessing elements to allow fast scalar multiplication.
     //Level determines extent of precomputation
@@ -2421,6 +2509,32 @@ impl PyRistScalar {
         self.scalar = myscalar;
         Ok(())
     }
+
+    /// Decodes a buffer of back-to-back 32-byte scalars (as produced by
+    /// `to_bytes_many`). Accepts any buffer-protocol object.
+    #[staticmethod]
+    fn from_bytes_many(data: &PyAny, py: Python) -> PyResult<Vec<PyRistScalar>>{
+        let bytes = buffer_bytes(py, data, 32, "Curve25519ZR.from_bytes_many")?;
+        let mut out = Vec::with_capacity(bytes.len() / 32);
+        for chunk in bytes.chunks(32){
+            let mut arr = [0u8; 32];
+            arr.copy_from_slice(chunk);
+            out.push(PyRistScalar{ scalar: Scalar::from_bytes_mod_order(arr) });
+        }
+        Ok(out)
+    }
+
+    /// Concatenates the `__getstate__` encodings of `scalars`.
+    #[staticmethod]
+    fn to_bytes_many<'p>(scalars: &PyList, py: Python<'p>) -> PyResult<&'p PyBytes>{
+        let mut out: Vec<u8> = Vec::with_capacity(scalars.len() * 32);
+        for si in scalars.iter(){
+            let sicel: &PyCell<PyRistScalar> = si.downcast()?;
+            let sif: &PyRistScalar = &sicel.borrow();
+            out.extend_from_slice(&sif.scalar.to_bytes());
+        }
+        Ok(PyBytes::new(py, &out))
+    }
     
     #[staticmethod]
     fn hash(bytestr: &PyBytes) -> PyResult<PyRistScalar>{
@@ -2783,17 +2897,355 @@ fn curve25519dotprod(a: &PyList, b: &PyList) -> PyResult<PyRistScalar>{
     Ok(output)
 }
 
+/// Multiplies a matrix (a list of rows) by a vector in one native pass.
+/// The vector is unpacked once and every row is reduced without creating
+/// intermediate Python objects; returns one ZR per row.
 #[pyfunction]
-fn blsmultiexp(gs: &PyList, zrs: &PyList) -> PyResult<PyG1>{
+fn matvec(rows: &PyList, v: &PyList) -> PyResult<Vec<PyFr>>{
+    let mut vec: Vec<Fr> = Vec::with_capacity(v.len());
+    for vi in v.iter(){
+        let vicel: &PyCell<PyFr> = vi.downcast()?;
+        let vif: &PyFr = &vicel.borrow();
+        vec.push(vif.fr);
+    }
+    let mut out: Vec<PyFr> = Vec::with_capacity(rows.len());
+    let mut temp = Fr::zero();
+    for row in rows.iter(){
+        let rowlist: &PyList = row.downcast()?;
+        if rowlist.len() != vec.len() {
+            return Err(PyErr::new::<exceptions::ValueError, _>("matvec: row and vector lengths differ"));
+        }
+        let mut acc = Fr::zero();
+        for (ai, bi) in rowlist.iter().zip(vec.iter()){
+            let aicel: &PyCell<PyFr> = ai.downcast()?;
+            let aif: &PyFr = &aicel.borrow();
+            temp.clone_from(&aif.fr);
+            temp.mul_assign(bi);
+            acc.add_assign(&temp);
+        }
+        out.push(PyFr{ fr: acc });
+    }
+    Ok(out)
+}
+
+/// Curve25519 counterpart of `matvec`.
+#[pyfunction]
+fn curve25519matvec(rows: &PyList, v: &PyList) -> PyResult<Vec<PyRistScalar>>{
+    let mut vec: Vec<Scalar> = Vec::with_capacity(v.len());
+    for vi in v.iter(){
+        let vicel: &PyCell<PyRistScalar> = vi.downcast()?;
+        let vif: &PyRistScalar = &vicel.borrow();
+        vec.push(vif.scalar);
+    }
+    let mut out: Vec<PyRistScalar> = Vec::with_capacity(rows.len());
+    let mut temp = Scalar::zero();
+    for row in rows.iter(){
+        let rowlist: &PyList = row.downcast()?;
+        if rowlist.len() != vec.len() {
+            return Err(PyErr::new::<exceptions::ValueError, _>("curve25519matvec: row and vector lengths differ"));
+        }
+        let mut acc = Scalar::zero();
+        for (ai, bi) in rowlist.iter().zip(vec.iter()){
+            let aicel: &PyCell<PyRistScalar> = ai.downcast()?;
+            let aif: &PyRistScalar = &aicel.borrow();
+            temp.clone_from(&aif.scalar);
+            temp.mul_assign(bi);
+            acc.add_assign(&temp);
+        }
+        out.push(PyRistScalar{ scalar: acc });
+    }
+    Ok(out)
+}
+
+/// Generates the two randomness-extraction matrices used by ADKG,
+///     mat1[i][j] = sum_{c=0..t} (i+1)^c (c+1)^j
+///     mat2[i][j] = sum_{c=0..deg-t-1} (i+1)^(t+1+c) (c+1)^j
+/// and returns them back to back (mat1 then mat2, row-major) as 32-byte
+/// little-endian canonical ZR encodings.
+#[pyfunction]
+fn extraction_matrices<'p>(n: usize, t: usize, deg: usize, py: Python<'p>) -> PyResult<&'p PyBytes>{
+    if deg < t {
+        return Err(PyErr::new::<exceptions::ValueError, _>("extraction_matrices: deg must be at least t"));
+    }
+    let rows = std::cmp::max(t+1, deg-t);
+    let xs: Vec<Fr> = (0..std::cmp::max(n, rows)).map(|i| Fr::from_repr(FrRepr::from((i+1) as u64)).unwrap()).collect();
+    // coef[i][c] = (i+1)^c, pw[c][j] = (c+1)^j
+    let mut coef: Vec<Vec<Fr>> = Vec::with_capacity(n);
+    for i in 0..n {
+        let mut row = Vec::with_capacity(deg+1);
+        let mut p = Fr::one();
+        for _ in 0..deg+1 {
+            row.push(p);
+            p.mul_assign(&xs[i]);
+        }
+        coef.push(row);
+    }
+    let mut pw: Vec<Vec<Fr>> = Vec::with_capacity(rows);
+    for c in 0..rows {
+        let mut row = Vec::with_capacity(n);
+        let mut p = Fr::one();
+        for _ in 0..n {
+            row.push(p);
+            p.mul_assign(&xs[c]);
+        }
+        pw.push(row);
+    }
+    let mut out: Vec<u8> = Vec::with_capacity(2*n*n*32);
+    let mut temp = Fr::zero();
+    for (offset, count) in [(0, t+1), (t+1, deg-t)].iter() {
+        for i in 0..n {
+            for j in 0..n {
+                let mut acc = Fr::zero();
+                for c in 0..*count {
+                    temp.clone_from(&coef[i][offset+c]);
+                    temp.mul_assign(&pw[c][j]);
+                    acc.add_assign(&temp);
+                }
+                let repr = FrRepr::from(acc);
+                let limbs: &[u64] = repr.as_ref();
+                for limb in limbs.iter() {
+                    out.extend_from_slice(&limb.to_le_bytes());
+                }
+            }
+        }
+    }
+    Ok(PyBytes::new(py, &out))
+}
+
+/// Curve25519 counterpart of `extraction_matrices`.
+#[pyfunction]
+fn curve25519extraction_matrices<'p>(n: usize, t: usize, deg: usize, py: Python<'p>) -> PyResult<&'p PyBytes>{
+    if deg < t {
+        return Err(PyErr::new::<exceptions::ValueError, _>("curve25519extraction_matrices: deg must be at least t"));
+    }
+    let rows = std::cmp::max(t+1, deg-t);
+    let xs: Vec<Scalar> = (0..std::cmp::max(n, rows)).map(|i| Scalar::from((i+1) as u64)).collect();
+    let mut coef: Vec<Vec<Scalar>> = Vec::with_capacity(n);
+    for i in 0..n {
+        let mut row = Vec::with_capacity(deg+1);
+        let mut p = Scalar::one();
+        for _ in 0..deg+1 {
+            row.push(p);
+            p.mul_assign(&xs[i]);
+        }
+        coef.push(row);
+    }
+    let mut pw: Vec<Vec<Scalar>> = Vec::with_capacity(rows);
+    for c in 0..rows {
+        let mut row = Vec::with_capacity(n);
+        let mut p = Scalar::one();
+        for _ in 0..n {
+            row.push(p);
+            p.mul_assign(&xs[c]);
+        }
+        pw.push(row);
+    }
+    let mut out: Vec<u8> = Vec::with_capacity(2*n*n*32);
+    let mut temp = Scalar::zero();
+    for (offset, count) in [(0, t+1), (t+1, deg-t)].iter() {
+        for i in 0..n {
+            for j in 0..n {
+                let mut acc = Scalar::zero();
+                for c in 0..*count {
+                    temp.clone_from(&coef[i][offset+c]);
+                    temp.mul_assign(&pw[c][j]);
+                    acc.add_assign(&temp);
+                }
+                out.extend_from_slice(&acc.to_bytes());
+            }
+        }
+    }
+    Ok(PyBytes::new(py, &out))
+}
+
+fn horner_fr(coeffs: &[Fr], x: &Fr) -> Fr{
+    let mut acc = Fr::zero();
+    for c in coeffs.iter().rev(){
+        acc.mul_assign(x);
+        acc.add_assign(c);
+    }
+    acc
+}
+
+/// Evaluates one polynomial at every point of `xs`. When `xs` are the
+/// consecutive integers 1, 2, ... and there are more points than
+/// coefficients, only the first d = len(coeffs) points are evaluated directly;
+/// the rest are extended with a backward-difference table, one addition per
+/// coefficient and point.
+fn evaluate_fr(coeffs: &[Fr], xs: &[Fr], consecutive: bool) -> Vec<Fr>{
+    let d = coeffs.len();
+    if !consecutive || d == 0 || xs.len() <= d {
+        return xs.iter().map(|x| horner_fr(coeffs, x)).collect();
+    }
+    let mut out: Vec<Fr> = Vec::with_capacity(xs.len());
+    for x in xs[..d].iter(){
+        out.push(horner_fr(coeffs, x));
+    }
+    // diff[j] = j-th backward difference at x = d
+    let mut diff: Vec<Fr> = out.iter().rev().cloned().collect();
+    for j in 1..d {
+        for i in (j..d).rev(){
+            let mut temp = diff[i-1];
+            temp.sub_assign(&diff[i]);
+            diff[i] = temp;
+        }
+    }
+    while out.len() < xs.len() {
+        for j in (0..d-1).rev(){
+            let next = diff[j+1];
+            diff[j].add_assign(&next);
+        }
+        out.push(diff[0]);
+    }
+    out
+}
+
+/// Evaluates every polynomial in `polys` (each a list of coefficients, lowest
+/// degree first) at every point in `xs` and returns evals with
+/// evals[k][i] = polys[k](xs[i]).
+#[pyfunction]
+fn polyevalmany(polys: &PyList, xs: &PyList, py: Python) -> PyResult<Vec<Vec<PyFr>>>{
+    let mut points: Vec<Fr> = Vec::with_capacity(xs.len());
+    for x in xs.iter(){
+        let xcel: &PyCell<PyFr> = x.downcast()?;
+        let xf: &PyFr = &xcel.borrow();
+        points.push(xf.fr);
+    }
+    let mut coeffs: Vec<Vec<Fr>> = Vec::with_capacity(polys.len());
+    for poly in polys.iter(){
+        let polylist: &PyList = poly.downcast()?;
+        let mut row: Vec<Fr> = Vec::with_capacity(polylist.len());
+        for c in polylist.iter(){
+            let ccel: &PyCell<PyFr> = c.downcast()?;
+            let cf: &PyFr = &ccel.borrow();
+            row.push(cf.fr);
+        }
+        coeffs.push(row);
+    }
+    let mut consecutive = true;
+    let mut expected = Fr::one();
+    for x in points.iter(){
+        if *x != expected {
+            consecutive = false;
+            break;
+        }
+        expected.add_assign(&Fr::one());
+    }
+    let evals: Vec<Vec<Fr>> = py.allow_threads(|| coeffs.iter().map(|c| evaluate_fr(c, &points, consecutive)).collect());
+    Ok(evals.into_iter().map(|row| row.into_iter().map(|fr| PyFr{ fr: fr }).collect()).collect())
+}
+
+fn horner_scalar(coeffs: &[Scalar], x: &Scalar) -> Scalar{
+    let mut acc = Scalar::zero();
+    for c in coeffs.iter().rev(){
+        acc.mul_assign(x);
+        acc.add_assign(c);
+    }
+    acc
+}
+
+/// Curve25519 counterpart of `evaluate_fr`.
+fn evaluate_scalar(coeffs: &[Scalar], xs: &[Scalar], consecutive: bool) -> Vec<Scalar>{
+    let d = coeffs.len();
+    if !consecutive || d == 0 || xs.len() <= d {
+        return xs.iter().map(|x| horner_scalar(coeffs, x)).collect();
+    }
+    let mut out: Vec<Scalar> = Vec::with_capacity(xs.len());
+    for x in xs[..d].iter(){
+        out.push(horner_scalar(coeffs, x));
+    }
+    let mut diff: Vec<Scalar> = out.iter().rev().cloned().collect();
+    for j in 1..d {
+        for i in (j..d).rev(){
+            let mut temp = diff[i-1];
+            temp.sub_assign(&diff[i]);
+            diff[i] = temp;
+        }
+    }
+    while out.len() < xs.len() {
+        for j in (0..d-1).rev(){
+            let next = diff[j+1];
+            diff[j].add_assign(&next);
+        }
+        out.push(diff[0]);
+    }
+    out
+}
+
+/// Curve25519 counterpart of `polyevalmany`.
+#[pyfunction]
+fn curve25519polyevalmany(polys: &PyList, xs: &PyList, py: Python) -> PyResult<Vec<Vec<PyRistScalar>>>{
+    let mut points: Vec<Scalar> = Vec::with_capacity(xs.len());
+    for x in xs.iter(){
+        let xcel: &PyCell<PyRistScalar> = x.downcast()?;
+        let xf: &PyRistScalar = &xcel.borrow();
+        points.push(xf.scalar);
+    }
+    let mut coeffs: Vec<Vec<Scalar>> = Vec::with_capacity(polys.len());
+    for poly in polys.iter(){
+        let polylist: &PyList = poly.downcast()?;
+        let mut row: Vec<Scalar> = Vec::with_capacity(polylist.len());
+        for c in polylist.iter(){
+            let ccel: &PyCell<PyRistScalar> = c.downcast()?;
+            let cf: &PyRistScalar = &ccel.borrow();
+            row.push(cf.scalar);
+        }
+        coeffs.push(row);
+    }
+    let consecutive = points.iter().enumerate().all(|(i, x)| *x == Scalar::from((i+1) as u64));
+    let evals: Vec<Vec<Scalar>> = py.allow_threads(|| coeffs.iter().map(|c| evaluate_scalar(c, &points, consecutive)).collect());
+    Ok(evals.into_iter().map(|row| row.into_iter().map(|scalar| PyRistScalar{ scalar: scalar }).collect()).collect())
+}
+
+/// Raises every point in `gs` to the same exponent `zr`, e.g. to derive the
+/// Diffie-Hellman keys with all recipients from one ephemeral secret. The
+/// scalar multiplications run without the GIL.
+#[pyfunction]
+fn blsbatchpow(gs: &PyList, zr: &PyAny, py: Python) -> PyResult<Vec<PyG1>>{
+    let exp = pyfr_from_pyany(zr)?;
+    let mut points: Vec<G1> = Vec::with_capacity(gs.len());
+    for gi in gs.iter(){
+        let gicel: &PyCell<PyG1> = gi.downcast()?;
+        let gif: &PyG1 = &gicel.borrow();
+        points.push(gif.g1);
+    }
+    let fr = exp.fr;
+    let powers: Vec<G1> = py.allow_threads(move || {
+        points.into_iter().map(|mut point| { point.mul_assign(fr); point }).collect()
+    });
+    Ok(powers.into_iter().map(|g1| PyG1{ g1: g1, pp: Vec::new(), pplevel: 0 }).collect())
+}
+
+#[pyfunction]
+fn blsmultiexp(gs: &PyList, zrs: &PyList, py: Python) -> PyResult<PyG1>{
     let mut output = PyG1{ g1: G1::zero(), pp: Vec::new(), pplevel:0 };
+    let mut terms: Vec<(G1, Fr)> = Vec::new();
     for (ai, bi) in gs.iter().zip(zrs){
         //let aif: &PyFr = ai.try_into().unwrap();
         //let bif: &PyFr = bi.try_into().unwrap();
         let aicel: &PyCell<PyG1> = ai.downcast()?;
         let aif: &PyG1 = &aicel.borrow();
-        let temp = aif.pow(bi)?;
-        output.add_assign(&temp);
+        if aif.pp.len() > 0 {
+            // Table lookups are cheap, keep them under the GIL
+            let temp = aif.pow(bi)?;
+            output.add_assign(&temp);
+        }
+        else {
+            let exp = pyfr_from_pyany(bi)?;
+            terms.push((aif.g1.clone(), exp.fr));
+        }
     }
+    // The variable-base products run without the GIL so that callers can
+    // verify in parallel from a thread pool.
+    let sum = py.allow_threads(move || {
+        let mut acc = G1::zero();
+        for (mut point, exp) in terms {
+            point.mul_assign(exp);
+            acc.add_assign(&point);
+        }
+        acc
+    });
+    output.g1.add_assign(&sum);
     Ok(output)
 }
 
@@ -2819,8 +3271,25 @@ fn blsmultiexp(gs: &PyList, zrs: &PyList) -> PyResult<PyG1>{
     })
 }*/
 
+/// Curve25519 counterpart of `blsbatchpow`.
 #[pyfunction]
-fn curve25519multiexp(gs: &PyList, zrs: &PyList) -> PyResult<PyRistG>{
+fn curve25519batchpow(gs: &PyList, zr: &PyAny, py: Python) -> PyResult<Vec<PyRistG>>{
+    let exp = pyscalar_from_pyany(zr)?;
+    let mut points: Vec<RistrettoPoint> = Vec::with_capacity(gs.len());
+    for gi in gs.iter(){
+        let gicel: &PyCell<PyRistG> = gi.downcast()?;
+        let gif: &PyRistG = &gicel.borrow();
+        points.push(gif.g);
+    }
+    let scalar = exp.scalar;
+    let powers: Vec<RistrettoPoint> = py.allow_threads(move || {
+        points.iter().map(|point| point * scalar).collect()
+    });
+    Ok(powers.into_iter().map(|g| PyRistG{ g: g, pp: Vec::new(), pplevel: 0 }).collect())
+}
+
+#[pyfunction]
+fn curve25519multiexp(gs: &PyList, zrs: &PyList, py: Python) -> PyResult<PyRistG>{
     let mut scalars: Vec<Scalar> = Vec::new();
     let mut points: Vec<RistrettoPoint> = Vec::new();
     for (ai, bi) in gs.iter().zip(zrs){
@@ -2833,8 +3302,10 @@ fn curve25519multiexp(gs: &PyList, zrs: &PyList) -> PyResult<PyRistG>{
         let bif: &PyRistScalar = &bicel.borrow();
         scalars.push(bif.scalar);
     }
+    // Released GIL lets callers verify in parallel from a thread pool
+    let g = py.allow_threads(move || RistrettoPoint::vartime_multiscalar_mul(scalars, points));
     Ok(PyRistG{
-        g: RistrettoPoint::vartime_multiscalar_mul(scalars, points), 
+        g: g, 
         pp: Vec::new(),
         pplevel : 0
     })
@@ -3153,6 +3624,18 @@ fn swap_seed_format(inarr: [u32;8]) -> [u8;32] {
     out
 }
 
+/// Copies the contents of a buffer-protocol object (bytes, bytearray,
+/// memoryview, ...) in one pass and checks that it holds whole elements of
+/// `size` bytes.
+fn buffer_bytes(py: Python, data: &PyAny, size: usize, name: &str) -> PyResult<Vec<u8>> {
+    let buf = PyBuffer::get(py, data)?;
+    let bytes: Vec<u8> = buf.to_vec(py)?;
+    if bytes.len() % size != 0 {
+        return Err(PyErr::new::<exceptions::ValueError, _>(format!("{}: length is not a multiple of {}", name, size)));
+    }
+    Ok(bytes)
+}
+
 fn pyfr_from_pyany(any: &PyAny) -> PyResult<PyFr> {
     let mut out = PyFr{
         fr: Fr::one()
@@ -3225,12 +3708,20 @@ fn pypairing(py: Python, m: &PyModule) -> PyResult<()> {
     m.add_wrapped(wrap_pyfunction!(dotprod))?;
     m.add_wrapped(wrap_pyfunction!(condense_list))?;
     m.add_wrapped(wrap_pyfunction!(blsmultiexp))?;
+    m.add_wrapped(wrap_pyfunction!(blsbatchpow))?;
+    m.add_wrapped(wrap_pyfunction!(matvec))?;
+    m.add_wrapped(wrap_pyfunction!(extraction_matrices))?;
+    m.add_wrapped(wrap_pyfunction!(polyevalmany))?;
 
     m.add_wrapped(wrap_pyfunction!(hashcurve25519zrs))?;
     m.add_wrapped(wrap_pyfunction!(hashcurve25519gs))?;
     m.add_wrapped(wrap_pyfunction!(hashcurve25519gsbn))?;
     m.add_wrapped(wrap_pyfunction!(curve25519dotprod))?;
     m.add_wrapped(wrap_pyfunction!(curve25519multiexp))?;
+    m.add_wrapped(wrap_pyfunction!(curve25519batchpow))?;
+    m.add_wrapped(wrap_pyfunction!(curve25519matvec))?;
+    m.add_wrapped(wrap_pyfunction!(curve25519extraction_matrices))?;
+    m.add_wrapped(wrap_pyfunction!(curve25519polyevalmany))?;
     Ok(())
 }
 
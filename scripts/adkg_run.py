@@ -1,14 +1,15 @@
 from adkg.config import HbmpcConfig
 from adkg.ipc import ProcessProgramRunner
-from adkg.adkg import ADKG
+from adkg.adkg import ADKG, dealer_pool
 from adkg.poly_commit_hybrid import PolyCommitHybrid
-# from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod
-from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp, curve25519dotprod as dotprod
+from adkg.extraction_matrix import get_extraction_matrices
+from adkg.utils.tracing import Tracer, NULL_TRACER
+# from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod, matvec
+from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp, curve25519dotprod as dotprod, curve25519matvec as matvec
 import asyncio
 import time
 import logging
 import uvloop
-import numpy as np
 
 logger = logging.getLogger("benchmark_logger")
 logger.setLevel(logging.ERROR)
@@ -23,22 +24,12 @@ def get_avss_params(n, G1):
         public_keys[i] = pow(g, private_keys[i])
     return g, h, public_keys, private_keys
 
-def gen_vector(t, deg, n):
-    coeff_1 = np.array([[ZR(i+1)**j for j in range(t+1)] for i in range(n)])
-    coeff_2 = np.array([[ZR(i+1)**j for j in range(t+1, deg+1)] for i in range(n)])
-    hm_1 = np.array([[ZR(i+1)**j for j in range(n)] for i in range(t+1)])
-    hm_2 = np.array([[ZR(i+1)**j for j in range(n)] for i in range(deg-t)])
-    rm_1 = np.matmul(coeff_1, hm_1)
-    rm_2 = np.matmul(coeff_2, hm_2)
-
-    return (rm_1.tolist(), rm_2.tolist())
-
-async def _run(peers, n, t, k, my_id, start_time):
+async def _run(peers, n, t, k, my_id, start_time, trace_dir=None, verify_workers=0, verify_mode="thread", dispersal="rbc", precompute_depth=0, batches=1, stripe_threshold=None, flush_delay=0, aba="tylerba", encrypt_workers=1):
     g, h, pks, sks = get_avss_params(n, G1)
     pc = PolyCommitHybrid(g, h, ZR, multiexp)
     deg = k
-    mat1, mat2 = gen_vector(t, deg, n)
-    async with ProcessProgramRunner(peers, n, t, my_id) as runner:
+    mat1, mat2 = get_extraction_matrices(ZR, n, t, deg)
+    async with ProcessProgramRunner(peers, n, t, my_id, flush_delay=flush_delay) as runner:
         send, recv = runner.get_send_recv("")
         logging.debug(f"Starting ADKG: {(my_id)}")
         logging.debug(f"Start time: {(start_time)}, diff {(start_time-int(time.time()))}")
@@ -46,8 +37,14 @@ async def _run(peers, n, t, k, my_id, start_time):
         benchmark_logger = logging.LoggerAdapter(
            logging.getLogger("benchmark_logger"), {"node_id": my_id}
         )
-        curve_params = (ZR, G1, multiexp, dotprod)
-        with ADKG(pks, sks[my_id], g, h, n, t, deg, my_id, send, recv, pc, curve_params, (mat1, mat2)) as adkg:
+        curve_params = (ZR, G1, multiexp, dotprod, matvec)
+        tracer = Tracer(my_id) if trace_dir else NULL_TRACER
+        pool = None
+        if precompute_depth > 0:
+            # the dealer work is done while waiting for the start time
+            pool = dealer_pool(pks, g, n, t, deg, pc, curve_params, precompute_depth, batches=batches)
+            await pool.fill()
+        with ADKG(pks, sks[my_id], g, h, n, t, deg, my_id, send, recv, pc, curve_params, (mat1, mat2), tracer, verify_workers, verify_mode, dispersal, pool, batches, stripe_threshold, aba, encrypt_workers) as adkg:
             while True:
                 if time.time() > start_time:
                     break
@@ -58,6 +55,10 @@ async def _run(peers, n, t, k, my_id, start_time):
             await adkg_task
             adkg.kill()
             adkg_task.cancel()
+        if pool is not None:
+            pool.stop()
+        if trace_dir:
+            tracer.dump(f"{trace_dir}/adkg-{my_id}.json")
         bytes_sent = runner.node_communicator.bytes_sent
         for k,v in runner.node_communicator.bytes_count.items():
             logging.info(f"[{my_id}] Bytes Sent: {k}:{v} which is {round((100*v)/bytes_sent,3)}%")
@@ -67,6 +68,7 @@ if __name__ == "__main__":
     from adkg.config import HbmpcConfig
     logging.info("Running ADKG ...")
     HbmpcConfig.load_config()
+    extras = HbmpcConfig.extras or {}
 
     loop = uvloop.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -79,6 +81,16 @@ if __name__ == "__main__":
                 HbmpcConfig.k,
                 HbmpcConfig.my_id,
                 HbmpcConfig.time,
+                extras.get("trace_dir"),
+                extras.get("verify_workers", 0),
+                extras.get("verify_mode", "thread"),
+                extras.get("dispersal", "rbc"),
+                extras.get("precompute_depth", 0),
+                extras.get("batches", 1),
+                extras.get("stripe_threshold"),
+                extras.get("flush_delay", 0),
+                extras.get("aba", "tylerba"),
+                extras.get("encrypt_workers", 1),
             )
         )
     finally:
@@ -0,0 +1,62 @@
+from adkg.config import HbmpcConfig
+from adkg.ipc import ProcessProgramRunner
+from adkg.adkg_service import ADKGService
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+from adkg.extraction_matrix import get_extraction_matrices
+from scripts.adkg_run import get_avss_params
+# from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod, matvec
+from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp, curve25519dotprod as dotprod, curve25519matvec as matvec
+import asyncio
+import time
+import logging
+import uvloop
+
+logger = logging.getLogger("benchmark_logger")
+logger.setLevel(logging.ERROR)
+# Uncomment this when you want logs from this file.
+logger.setLevel(logging.NOTSET)
+
+async def _run(peers, n, t, k, my_id, start_time, sessions, max_in_flight, precompute_depth=0):
+    g, h, pks, sks = get_avss_params(n, G1)
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+    deg = k
+    mat1, mat2 = get_extraction_matrices(ZR, n, t, deg)
+    async with ProcessProgramRunner(peers, n, t, my_id) as runner:
+        curve_params = (ZR, G1, multiexp, dotprod, matvec)
+        with ADKGService(runner.get_send_recv, pks, sks[my_id], g, h, n, t, deg, my_id, pc, curve_params, (mat1, mat2), max_in_flight, precompute_depth, runner.unsubscribe) as service:
+            while True:
+                if time.time() > start_time:
+                    break
+                time.sleep(0.1)
+            logging.info(f"ADKG service start time: {(time.time())}")
+            await service.run(list(range(sessions)))
+            for sid, stat in sorted(service.stats.items()):
+                logging.info(f"[{my_id}] Session {sid} latency: {stat['latency']}")
+            logging.info(f"[{my_id}] Throughput: {service.throughput()} keys/s")
+        bytes_sent = runner.node_communicator.bytes_sent
+        logging.info(f"[{my_id}] Total bytes sent out aa: {bytes_sent}")
+
+if __name__ == "__main__":
+    from adkg.config import HbmpcConfig
+    logging.info("Running ADKG service ...")
+    HbmpcConfig.load_config()
+    extras = HbmpcConfig.extras or {}
+
+    loop = uvloop.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(
+            _run(
+                HbmpcConfig.peers,
+                HbmpcConfig.N,
+                HbmpcConfig.t,
+                HbmpcConfig.k,
+                HbmpcConfig.my_id,
+                HbmpcConfig.time,
+                extras.get("sessions", 16),
+                extras.get("max_in_flight", 8),
+                extras.get("precompute_depth", 0),
+            )
+        )
+    finally:
+        loop.close()
@@ -0,0 +1,129 @@
+"""
+Merges the per-node JSON traces written by `adkg.utils.tracing.Tracer` into a
+cluster-wide view of the ADKG pipeline.
+
+Usage: python -m scripts.merge_traces traces/*.json [--json merged.json]
+
+Times are reported relative to the earliest "start" milestone across nodes,
+so node clocks are assumed to be roughly synchronised.
+"""
+from argparse import ArgumentParser
+from collections import defaultdict
+from statistics import median
+import json
+
+# Pipeline stages in the order a node goes through them
+MILESTONES = ["start", "acss_quorum", "acs_done", "prekey_sent", "prekey_done", "key_done"]
+
+
+def load_traces(paths):
+    traces = []
+    for path in paths:
+        with open(path) as f:
+            traces.append(json.load(f))
+    return traces
+
+
+def _spread(values):
+    return {"min": min(values), "median": median(values), "max": max(values)}
+
+
+def merge(traces):
+    origin = min(t["milestones"]["start"] for t in traces if "start" in t["milestones"])
+
+    milestones = {}
+    for m in MILESTONES:
+        times = [t["milestones"][m] - origin for t in traces if m in t["milestones"]]
+        if times:
+            milestones[m] = dict(_spread(times), nodes=len(times))
+
+    # The phase between two milestones is bounded by the slowest node; this
+    # is the critical path of the run.
+    critical_path = []
+    reached = [m for m in MILESTONES if m in milestones]
+    for prev, cur in zip(reached, reached[1:]):
+        durations = {
+            t["node_id"]: t["milestones"][cur] - t["milestones"][prev]
+            for t in traces if prev in t["milestones"] and cur in t["milestones"]
+        }
+        slowest = max(durations, key=durations.get)
+        critical_path.append({
+            "phase": f"{prev}->{cur}",
+            "critical": milestones[cur]["max"] - milestones[prev]["max"],
+            "median": median(durations.values()),
+            "slowest_node": slowest,
+            "slowest": durations[slowest],
+        })
+
+    acss_latency = defaultdict(list)
+    rbc_paths = defaultdict(int)
+    aba_rounds = defaultdict(int)
+    aba_decide = defaultdict(list)
+    coin_requests = 0
+    prekey_rejected = 0
+    key_batches, key_invalid = 0, 0
+    for t in traces:
+        start = t["milestones"].get("start", origin)
+        for e in t["events"]:
+            phase, name = e["phase"], e["event"]
+            if phase == "acss" and name == "output":
+                acss_latency[e["dealer"]].append(e["t"] - start)
+            elif phase == "rbc" and name == "deliver":
+                rbc_paths[e["path"]] += 1
+            elif phase == "aba" and name == "round":
+                aba_rounds[e["sid"]] = max(aba_rounds[e["sid"]], e["round"] + 1)
+            elif phase == "aba" and name == "decide":
+                aba_decide[e["sid"]].append(e["t"] - origin)
+            elif phase == "coin" and name == "request":
+                coin_requests += 1
+            elif phase == "prekey" and name == "share" and not e["accepted"]:
+                prekey_rejected += 1
+            elif phase == "key" and name == "verify":
+                key_batches += 1
+                key_invalid += e["size"] - e["valid"]
+
+    return {
+        "nodes": len(traces),
+        "milestones": milestones,
+        "critical_path": critical_path,
+        "acss_dealers": {d: _spread(v) for d, v in sorted(acss_latency.items())},
+        "rbc_deliveries": dict(rbc_paths),
+        "aba_max_rounds": dict(aba_rounds),
+        "aba_decide": {sid: _spread(v) for sid, v in aba_decide.items()},
+        "coin_requests": coin_requests,
+        "prekey_rejected_shares": prekey_rejected,
+        "key_verify_batches": key_batches,
+        "key_invalid_proofs": key_invalid,
+    }
+
+
+def print_report(merged):
+    print(f"Nodes: {merged['nodes']}")
+    print("Milestones (s since first start):   min     median  max")
+    for m, s in merged["milestones"].items():
+        print(f"  {m:<32}{s['min']:8.3f}{s['median']:8.3f}{s['max']:8.3f}")
+    print("Critical path:")
+    for p in merged["critical_path"]:
+        print(f"  {p['phase']:<28} critical {p['critical']:8.3f}  median {p['median']:8.3f}  slowest node {p['slowest_node']} ({p['slowest']:.3f})")
+    if merged["acss_dealers"]:
+        slowest = max(merged["acss_dealers"].items(), key=lambda kv: kv[1]["median"])
+        print(f"Slowest ACSS dealer: {slowest[0]} (median {slowest[1]['median']:.3f})")
+    print(f"RBC deliveries: {merged['rbc_deliveries']}")
+    if merged["aba_max_rounds"]:
+        print(f"ABA max rounds: {max(merged['aba_max_rounds'].values())}")
+    print(f"Coin requests: {merged['coin_requests']}")
+    print(f"PREKEY rejected shares: {merged['prekey_rejected_shares']}")
+    print(f"KEY verify batches: {merged['key_verify_batches']}, invalid proofs: {merged['key_invalid_proofs']}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Merges per-node ADKG traces.")
+    parser.add_argument("traces", nargs="+", help="Per-node JSON trace files.")
+    parser.add_argument("--json", dest="json_path", help="Write the merged view to this file.")
+    args = parser.parse_args()
+
+    merged = merge(load_traces(args.traces))
+    print_report(merged)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(merged, f, indent=2)
@@ -1,13 +1,13 @@
 from adkg.poly_commit_hybrid import PolyCommitHybrid
 from pytest import mark
 from adkg.polynomial import polynomials_over
-from adkg.adkg import ADKG
+from adkg.adkg import ADKG, dealer_pool
 import asyncio
 import numpy as np
 import uvloop
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod
-# from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp, curve25519dotprod as dotprod
+from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod, matvec
+# from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp, curve25519dotprod as dotprod, curve25519matvec as matvec
     
 import time
 
@@ -45,7 +45,7 @@ async def test_adkg(test_router):
     dkg_list = [None] * n #
 
     start_time = time.time()
-    curve_params = (ZR, G1, multiexp, dotprod)
+    curve_params = (ZR, G1, multiexp, dotprod, matvec)
 
     for i in range(n):
         dkg = ADKG(pks, sks[i], g, h, n, t, deg, i, sends[i], recvs[i], pc, curve_params, (mat1, mat2))
@@ -108,4 +108,147 @@ async def test_adkg(test_router):
     
 
     assert not check_degree(deg-1, shares)
-    assert check_degree(deg, shares)
\ No newline at end of file
+    assert check_degree(deg, shares)
+
+def test_batch_pok_verify():
+    from adkg.adkg import PoK, CP
+    g, h = G1.rand(b'g'), G1.rand(b'h')
+    pok = PoK(g, ZR, multiexp)
+    alphas = [ZR.rand() for _ in range(4)]
+    proofs = [(g**alpha, pok.pok_prove(alpha, g**alpha)) for alpha in alphas]
+    assert pok.batch_pok_verify(proofs) == [True]*4
+    a, res = proofs[2][1]
+    proofs[2] = (proofs[2][0], (a, res + ZR(1)))
+    assert pok.batch_pok_verify(proofs) == [True, True, False, True]
+
+    cp = CP(g, h, ZR, multiexp)
+    proofs = [(g**alpha, h**alpha, cp.dleq_prove(alpha, g**alpha, h**alpha)) for alpha in alphas]
+    assert cp.dleq_batch_verify(proofs) == [True]*4
+    proofs[1] = (proofs[1][0], h**alphas[0], proofs[1][2])
+    assert cp.dleq_batch_verify(proofs) == [True, False, True, True]
+
+
+def adkg_params(n):
+    g, h, pks, sks = get_avss_params(n, G1)
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+    curve_params = (ZR, G1, multiexp, dotprod, matvec)
+    return g, h, pks, sks, pc, curve_params
+
+
+async def run_adkgs(test_router, t, deg, outputs_per_node=1, params=None, node_kwargs=None, **adkg_kwargs):
+    """
+    Runs an ADKG between n = 3t+1 nodes and returns each node's outputs: one
+    (secret, mks, sk, pk) per node, or a list of `outputs_per_node` of them.
+    `node_kwargs(i)` gives extra ADKG kwargs for node i.
+    """
+    n = 3 * t + 1
+    g, h, pks, sks, pc, curve_params = params or adkg_params(n)
+    sends, recvs, _ = test_router(n, maxdelay=0.01)
+    mat1, mat2 = gen_vector(t, deg, n)
+
+    dkg_list = [
+        ADKG(
+            pks, sks[i], g, h, n, t, deg, i, sends[i], recvs[i], pc, curve_params, (mat1, mat2),
+            **adkg_kwargs, **(node_kwargs(i) if node_kwargs else {}),
+        )
+        for i in range(n)
+    ]
+    start_time = time.time()
+    dkg_tasks = [asyncio.create_task(dkg.run_adkg(start_time)) for dkg in dkg_list]
+    outputs = await asyncio.gather(
+        *[asyncio.gather(*[dkg.output_queue.get() for _ in range(outputs_per_node)]) for dkg in dkg_list]
+    )
+    for dkg in dkg_list:
+        dkg.kill()
+    for task in dkg_tasks:
+        task.cancel()
+    if outputs_per_node == 1:
+        return [out[0] for out in outputs]
+    return outputs
+
+
+def check_outputs(outputs, g):
+    n = len(outputs)
+    shares = [[i + 1, outputs[i][2]] for i in range(n)]
+    msk = polynomials_over(ZR).interpolate_at(shares, 0)
+    for i in range(n):
+        assert outputs[i][3] == g**msk
+        assert outputs[i][1] == outputs[0][1]
+    return msk
+
+
+@mark.asyncio
+async def test_adkg_verify_workers(test_router):
+    t = 1
+    outputs = await run_adkgs(test_router, t, t, verify_workers=2)
+    for i in range(1, 3 * t + 1):
+        assert outputs[i][3] == outputs[0][3]
+        assert outputs[i][1] == outputs[0][1]
+
+
+@mark.asyncio
+async def test_adkg_encrypt_workers(test_router):
+    t = 1
+    params = adkg_params(3 * t + 1)
+    outputs = await run_adkgs(test_router, t, t, params=params, encrypt_workers=2)
+    check_outputs(outputs, params[0])
+
+
+@mark.asyncio
+async def test_adkg_avid_dispersal(test_router):
+    t = 1
+    params = adkg_params(3 * t + 1)
+    outputs = await run_adkgs(test_router, t, t, params=params, dispersal="avid")
+    check_outputs(outputs, params[0])
+
+
+@mark.asyncio
+async def test_adkg_vector_aba(test_router):
+    t = 2
+    params = adkg_params(3 * t + 1)
+    outputs = await run_adkgs(test_router, t, t, params=params, aba="vector")
+    check_outputs(outputs, params[0])
+
+
+@mark.asyncio
+async def test_adkg_dealer_pool(test_router):
+    t = 1
+    deg = t
+    n = 3 * t + 1
+    params = adkg_params(n)
+    g, _, pks, _, pc, curve_params = params
+
+    pools = [dealer_pool(pks, g, n, t, deg, pc, curve_params, 1) for _ in range(n)]
+    await asyncio.gather(*[pool.fill() for pool in pools])
+    bundles = [pool.ready.get_nowait() for pool in pools]
+    for pool, bundle in zip(pools, bundles):
+        pool.ready.put_nowait(bundle)
+    outputs = await run_adkgs(
+        test_router, t, deg, params=params, node_kwargs=lambda i: {"dealer_pool": pools[i]}
+    )
+    for pool in pools:
+        pool.stop()
+
+    # each node dealt the secret of its precomputed bundle
+    for i in range(n):
+        assert outputs[i][0] == bundles[i].secrets[1]
+        assert outputs[i][3] == outputs[0][3]
+
+
+@mark.asyncio
+async def test_adkg_batches(test_router):
+    t = 1
+    n = 3 * t + 1
+    batches = 3
+    params = adkg_params(n)
+    g = params[0]
+
+    # each node outputs one (secret, mks, sk, pk) per key, in batch order
+    outputs = await run_adkgs(test_router, t, 2 * t, outputs_per_node=batches, params=params, batches=batches)
+
+    pks_out = []
+    for b in range(batches):
+        msk = check_outputs([outputs[i][b] for i in range(n)], g)
+        assert msk == sum((outputs[node][b][0] for node in outputs[0][b][1]), ZR(0))
+        pks_out.append(outputs[0][b][3])
+    assert len(set(pk.__getstate__() for pk in pks_out)) == batches
@@ -0,0 +1,49 @@
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+from pytest import mark
+from adkg.adkg_service import ADKGService
+from adkg.utils.misc import wrap_send, subscribe_recv
+import asyncio
+from pypairing import ZR, G1, blsmultiexp as multiexp, dotprod, matvec
+from tests.test_adkg import get_avss_params, gen_vector
+
+
+@mark.asyncio
+async def test_adkg_service(test_router):
+    t = 1
+    deg = t
+    n = 3 * t + 1
+    sids = list(range(3))
+
+    g, h, pks, sks = get_avss_params(n, G1)
+    sends, recvs, _ = test_router(n, maxdelay=0.001)
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+    mat1, mat2 = gen_vector(t, deg, n)
+    curve_params = (ZR, G1, multiexp, dotprod, matvec)
+
+    services, dispatchers, routers = [None] * n, [None] * n, [None] * n
+    for i in range(n):
+        task, subscribe = subscribe_recv(recvs[i])
+        dispatchers[i], routers[i] = task, subscribe
+
+        def get_send_recv(tag, send=sends[i], subscribe=subscribe):
+            return wrap_send(tag, send), subscribe(tag)
+
+        services[i] = ADKGService(get_send_recv, pks, sks[i], g, h, n, t, deg, i, pc, curve_params, (mat1, mat2), max_in_flight=2, unsubscribe=subscribe.unsubscribe)
+
+    outputs = await asyncio.gather(*[service.run(sids) for service in services])
+    # finished sessions release their channels
+    for router, service in zip(routers, services):
+        assert all(service.session_tag(sid) in router.closed for sid in sids)
+    for service in services:
+        service.kill()
+    for task in dispatchers:
+        task.cancel()
+
+    for sid in sids:
+        pk = outputs[0][sid][3]
+        for i in range(n):
+            assert outputs[i][sid][3] == pk
+        assert all(sid in service.stats for service in services)
+    # Different sessions produce independent keys
+    assert outputs[0][0][3] != outputs[0][1][3]
+    assert services[0].throughput() > 0
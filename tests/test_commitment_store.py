@@ -0,0 +1,60 @@
+import pickle
+from pypairing import ZR, G1, blsmultiexp as multiexp
+from adkg.polynomial import polynomials_over
+from adkg.utils.serilization import Serial
+from adkg.utils.commitment_store import CommitmentStore, DealerCommitments
+
+
+def _dealer(sr, g, sc, t):
+    poly = polynomials_over(ZR)
+    phis = [poly.random(t) for _ in range(sc)]
+    commits = [[g ** c for c in phi.coeffs] for phi in phis]
+    data = sr.serialize_gs([c for vec in commits for c in vec])
+    return phis, commits, memoryview(bytes(data))
+
+
+def test_dealer_commitments_decode_lazily():
+    sc, t = 3, 2
+    sr, g = Serial(G1), G1.rand()
+    _, commits, data = _dealer(sr, g, sc, t)
+    entry = DealerCommitments(sr, sc, t, data)
+    assert not entry.decoded
+    # a pickled copy carries the raw bytes and decodes independently
+    copy = pickle.loads(pickle.dumps(entry))
+    assert not entry.decoded
+    assert entry[1] == commits[1]
+    assert entry.decoded
+    assert list(copy) == commits
+
+
+def test_commitment_store_aggregates():
+    sc, t = 2, 3
+    sr, g = Serial(G1), G1.rand()
+    store = CommitmentStore(sr, sc, t, ZR, multiexp)
+    phis = {}
+    for dealer in range(4):
+        phis[dealer], _, data = _dealer(sr, g, sc, t)
+        store.add(dealer, DealerCommitments(sr, sc, t, data))
+
+    dealers = [0, 2, 3]
+    total = phis[0][1] + phis[2][1] + phis[3][1]
+    assert store.sum_coeffs(dealers, 1) == [g ** c for c in total.coeffs]
+    assert store.eval_sum(dealers, 1, 5) == g ** total(5)
+    # cached per dealer set, in any order
+    assert store.eval_sum([3, 0, 2], 1, 5) is store.eval_sum(dealers, 1, 5)
+
+
+def test_commitment_store_eval_sum_all():
+    sc, t, n = 1, 3, 10
+    sr, g = Serial(G1), G1.rand()
+    store = CommitmentStore(sr, sc, t, ZR, multiexp)
+    phis = {}
+    for dealer in range(3):
+        phis[dealer], _, data = _dealer(sr, g, sc, t)
+        store.add(dealer, DealerCommitments(sr, sc, t, data))
+
+    total = phis[0][0] + phis[1][0] + phis[2][0]
+    evals = store.eval_sum_all(range(3), 0, n)
+    assert evals == [g ** total(x) for x in range(1, n + 1)]
+    # shares the per-point cache with eval_sum
+    assert store.eval_sum([2, 1, 0], 0, 7) is evals[6]
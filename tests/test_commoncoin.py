@@ -105,3 +105,14 @@ async def test_when_redundant_signature_share_is_received():
         assert len(set(await asyncio.gather(*[c(i) for c in coins]))) == 1
     for task in recv_tasks:
         task.cancel()
+
+
+def test_verify_shares():
+    n, f = 7, 2
+    pk, sks = dealer(n, f + 1)
+    h = pk.hash_message(str(("sidA", 0)))
+    sigs = {i: sk.sign(h) for i, sk in enumerate(sks)}
+    assert pk.verify_shares(sigs, h) == set()
+    # a share for another message is caught among the good ones
+    sigs[1], sigs[5] = sks[1].sign(pk.hash_message("x")), sks[5].sign(pk.hash_message("y"))
+    assert pk.verify_shares(sigs, h) == {1, 5}
@@ -86,4 +86,26 @@ def test_hashing():
     assert c == c2
     g = G.hash(pickle.dumps(crs))
     g2 = G.hash(pickle.dumps(crs))
-    assert g == g2
\ No newline at end of file
+    assert g == g2
+
+def test_matvec():
+    from pypairing import Curve25519ZR as ZR, curve25519dotprod, curve25519matvec
+    from pypairing import ZR as BlsZR, dotprod, matvec
+
+    for F, dot, mv in [(ZR, curve25519dotprod, curve25519matvec), (BlsZR, dotprod, matvec)]:
+        rows = [[F.rand() for _ in range(5)] for _ in range(4)]
+        v = [F.rand() for _ in range(5)]
+        out = mv(rows, v)
+        assert len(out) == 4
+        for row, o in zip(rows, out):
+            assert o == dot(row, v)
+
+
+def test_batchpow():
+    from pypairing import Curve25519ZR as ZR, Curve25519G as G, curve25519batchpow
+    from pypairing import ZR as BlsZR, G1 as BlsG1, blsbatchpow
+
+    for F, Group, batchpow in [(ZR, G, curve25519batchpow), (BlsZR, BlsG1, blsbatchpow)]:
+        gs = [Group.rand() for _ in range(5)]
+        x = F.rand()
+        assert batchpow(gs, x) == [g ** x for g in gs]
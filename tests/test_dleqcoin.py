@@ -0,0 +1,83 @@
+from adkg.broadcast.dleqcoin import dleq_coin, ThresholdCoinKey
+from adkg.polynomial import polynomials_over
+from pytest import mark
+from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp
+import asyncio
+
+
+def coin_keys(n, f):
+    g = G1.hash(b"g")
+    phi = polynomials_over(ZR).random(f)
+    vks = [g ** phi(i + 1) for i in range(n)]
+    return [ThresholdCoinKey(g, vks, phi(i + 1), ZR, multiexp) for i in range(n)]
+
+
+async def _coins(n, f, sends, recvs, keys):
+    def bcast(i):
+        def _bcast(o):
+            for j in range(n):
+                sends[i](j, o)
+        return _bcast
+
+    result = await asyncio.gather(
+        *[dleq_coin("sidA", i, n, f, keys[i], bcast(i), recvs[i]) for i in range(n)]
+    )
+    return zip(*result)
+
+
+@mark.asyncio
+async def test_dleq_coin(test_router):
+    n, f = 4, 1
+    sends, recvs, _ = test_router(n)
+    coins, recv_tasks = await _coins(n, f, sends, recvs, coin_keys(n, f))
+
+    bits = [set(await asyncio.gather(*[c(r) for c in coins])) for r in range(10)]
+    assert all(len(b) == 1 for b in bits)
+    # the coin is not constant
+    assert len(set.union(*bits)) == 2
+    for task in recv_tasks:
+        task.cancel()
+
+
+@mark.asyncio
+async def test_dleq_coin_bad_share(test_router):
+    n, f = 4, 1
+    sends, recvs, _ = test_router(n)
+    keys = coin_keys(n, f)
+    # node 3 signs with the wrong key, so its proofs fail
+    keys[3] = ThresholdCoinKey(keys[3].g, keys[3].vks, ZR.rand(), ZR, multiexp)
+    coins, recv_tasks = await _coins(n, f, sends, recvs, keys)
+
+    for r in range(5):
+        bits = await asyncio.gather(*[c(r) for c in coins[:3]])
+        assert len(set(bits)) == 1
+    for task in recv_tasks:
+        task.cancel()
+
+
+@mark.asyncio
+async def test_dleq_coin_malformed(test_router):
+    n, f = 4, 1
+    sends, recvs, _ = test_router(n)
+    keys = coin_keys(n, f)
+    share = keys[3].g ** keys[3].sk
+    malformed = [
+        "junk",
+        ("COIN", 0),
+        ("COIN", -1, (share, None)),
+        ("COIN", "0", (share, None)),
+        ("COIN", 0, (b"share", (share, share, ZR(1)))),
+        ("COIN", 0, (share, (share, share))),
+        ("COIN", 0, (share, (share, b"a2", ZR(1)))),
+    ]
+    # a faulty node 3 sends malformed messages instead of its shares
+    for msg in malformed:
+        for i in range(n):
+            sends[3](i, msg)
+    coins, recv_tasks = await _coins(n, f, sends, recvs, keys)
+
+    for r in range(3):
+        bits = await asyncio.wait_for(asyncio.gather(*[c(r) for c in coins[:3]]), 5)
+        assert len(set(bits)) == 1
+    for task in recv_tasks:
+        task.cancel()
@@ -0,0 +1,75 @@
+from adkg.broadcast.ecdispersal import ECDispersal, DispersalMsgType, pack_pieces, unpack_pieces
+from random import randint
+from pytest import mark, raises
+from asyncio import create_task, Queue
+import os
+
+
+def test_pack_pieces():
+    pieces = [b"header", b"", os.urandom(100)]
+    assert unpack_pieces(pack_pieces(pieces)) == pieces
+    with raises(ValueError):
+        unpack_pieces(pack_pieces(pieces)[:-1])
+
+
+async def _disperse(n, t, dealer_id, sends, recvs, header, pieces):
+    outputs = [Queue() for _ in range(n)]
+    parties = [ECDispersal("sidA", i, n, t, dealer_id, sends[i], recvs[i]) for i in range(n)]
+
+    async def predicate(header, piece):
+        return True
+
+    tasks = [
+        create_task(parties[i].disperse(
+            predicate,
+            (header, pieces) if i == dealer_id else None,
+            lambda h, p, q=outputs[i]: q.put_nowait((h, p)),
+        ))
+        for i in range(n)
+    ]
+    outs = [await outputs[i].get() for i in range(n)]
+    return parties, tasks, outs
+
+
+@mark.asyncio
+async def test_ecdispersal(test_router):
+    n, t = 4, 1
+    sends, recvs, _ = test_router(n)
+    dealer_id = randint(0, n - 1)
+    header = os.urandom(40)
+    pieces = [os.urandom(64) for _ in range(n)]
+
+    parties, tasks, outs = await _disperse(n, t, dealer_id, sends, recvs, header, pieces)
+    for i in range(n):
+        assert outs[i] == (header, pieces[i])
+
+    # any party can rebuild all the pieces from the stripes
+    retrieved = await parties[(dealer_id + 1) % n].retrieve()
+    assert retrieved == [header] + pieces
+    for task in tasks:
+        task.cancel()
+
+
+@mark.asyncio
+async def test_ecdispersal_missing_piece(test_router):
+    n, t = 4, 1
+    sends, recvs, _ = test_router(n)
+    dealer_id = 0
+    victim = 3
+    header = os.urandom(40)
+    pieces = [os.urandom(64) for _ in range(n)]
+
+    # the dealer never sends the victim its VAL message
+    dealer_send = sends[dealer_id]
+
+    def faulty_send(i, msg):
+        if i != victim or msg[0] != DispersalMsgType.VAL:
+            dealer_send(i, msg)
+    sends = list(sends)
+    sends[dealer_id] = faulty_send
+
+    parties, tasks, outs = await _disperse(n, t, dealer_id, sends, recvs, header, pieces)
+    for i in range(n):
+        assert outs[i] == (header, pieces[i])
+    for task in tasks:
+        task.cancel()
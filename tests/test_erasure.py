@@ -0,0 +1,32 @@
+from adkg.broadcast.erasure import encode, decode
+from pytest import mark, raises
+import random
+import os
+
+
+@mark.parametrize("k, n, size", [(1, 1, 0), (2, 4, 1), (3, 10, 100), (11, 32, 10000), (86, 256, 1234)])
+def test_encode_decode(k, n, size):
+    m = os.urandom(size)
+    stripes = encode(k, n, m)
+    assert len(stripes) == n
+    assert all(isinstance(s, bytes) and len(s) == len(stripes[0]) for s in stripes)
+    # systematic: the data stripes are the padded message
+    assert b"".join(stripes[:k])[:size] == m
+
+    assert decode(k, n, list(stripes)) == m
+    for _ in range(5):
+        subset = random.sample(range(n), k)
+        assert decode(k, n, [s if i in subset else None for i, s in enumerate(stripes)]) == m
+        assert decode(k, n, {i: stripes[i] for i in subset}) == m
+
+
+def test_decode_errors():
+    k, n = 2, 4
+    stripes = encode(k, n, b"hello world")
+    with raises(ValueError):
+        decode(k, n, {0: stripes[0]})
+    with raises(ValueError):
+        decode(k, n, {0: stripes[0], 1: b"\xff" * len(stripes[1])})
+    # e.g. a faulty leader committing to stripes of different lengths
+    with raises(ValueError):
+        decode(k, n, [None, stripes[1], stripes[2] + b"x", None])
@@ -0,0 +1,30 @@
+from pytest import mark
+import os
+from pypairing import ZR, Curve25519ZR
+from adkg.extraction_matrix import get_extraction_matrices, matrix_cache_path
+from tests.test_adkg import gen_vector
+
+
+@mark.parametrize("t, deg", [(1, 1), (1, 2), (2, 4)])
+def test_extraction_matrices_match_gen_vector(t, deg):
+    n = 3 * t + 1
+    mat1, mat2 = get_extraction_matrices(ZR, n, t, deg, cache_dir=None)
+    rm_1, rm_2 = gen_vector(t, deg, n)
+    assert mat1 == rm_1
+    if deg > t:
+        assert mat2 == rm_2
+    else:
+        assert mat2 == [[ZR(0)] * n for _ in range(n)]
+
+
+@mark.parametrize("field", [ZR, Curve25519ZR])
+def test_extraction_matrices_cache(tmp_path, field):
+    n, t, deg = 4, 1, 2
+    cache_dir = str(tmp_path)
+    expected = get_extraction_matrices(field, n, t, deg, cache_dir=None)
+    path = matrix_cache_path(field, n, t, deg, cache_dir)
+    assert not os.path.exists(path)
+    assert get_extraction_matrices(field, n, t, deg, cache_dir=cache_dir) == expected
+    assert os.path.getsize(path) == 2 * n * n * 32
+    # The second call is served from the cached file
+    assert get_extraction_matrices(field, n, t, deg, cache_dir=cache_dir) == expected
@@ -0,0 +1,18 @@
+from pytest import mark
+from pypairing import ZR, G1, blsmultiexp
+from pypairing import Curve25519ZR, Curve25519G, curve25519multiexp
+from adkg.utils.fixed_base import fixed_base, FixedBasePair
+
+
+@mark.parametrize(
+    "field, group, multiexp",
+    [(ZR, G1, blsmultiexp), (Curve25519ZR, Curve25519G, curve25519multiexp)],
+)
+def test_fixed_base(field, group, multiexp):
+    g, h = group.hash(b"g"), group.hash(b"h")
+    a, b = field.rand(), field.rand()
+    assert fixed_base(g).pow(a) == g ** a
+    assert fixed_base(g) is fixed_base(group.hash(b"g"))
+    assert FixedBasePair(g, h).commit(a, b) == multiexp([g, h], [a, b])
+    # the caller's element is left without a table
+    assert g.get_pplevel() == 0
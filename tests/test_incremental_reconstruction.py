@@ -0,0 +1,27 @@
+from adkg.incremental_reconstruction import IncrementalReconstruction
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+from adkg.polynomial import polynomials_over
+from pypairing import ZR, G1, blsmultiexp as multiexp
+
+
+def test_incremental_reconstruction():
+    t = 2
+    g, h = G1.rand(b'g'), G1.rand(b'h')
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+    poly = polynomials_over(ZR)
+    phi, phi_hat = poly.random(t), poly.random(t)
+    commits = pc.commit(phi, phi_hat)
+
+    recon = IncrementalReconstruction(commits, g, h, t, ZR, multiexp)
+    # A bad share is rejected without affecting the reconstruction
+    assert not recon.add_share(1, phi(1) + ZR(1), phi_hat(1))
+    assert not recon.add_share(1, phi(1), phi_hat(1))
+    for x in [5, 2, 7]:
+        assert not recon.done()
+        assert recon.add_share(x, phi(x), phi_hat(x))
+    assert recon.done()
+    assert not recon.add_share(3, phi(3), phi_hat(3))
+
+    secret, random = recon.reconstruct()
+    assert secret == phi(0)
+    assert random == phi_hat(0)
@@ -0,0 +1,37 @@
+from adkg.ipc import NodeCommunicator
+from adkg.config import NodeDetails
+from pytest import mark
+import asyncio
+import socket
+
+
+def free_ports(k):
+    socks = [socket.socket() for _ in range(k)]
+    for s in socks:
+        s.bind(("127.0.0.1", 0))
+    ports = [s.getsockname()[1] for s in socks]
+    for s in socks:
+        s.close()
+    return ports
+
+
+@mark.asyncio
+async def test_node_communicator_coalescing():
+    n, count = 2, 100
+    peers = {i: NodeDetails("127.0.0.1", port) for i, port in enumerate(free_ports(n))}
+    async with NodeCommunicator(peers, 0, 0) as node0, NodeCommunicator(peers, 1, 0) as node1:
+        # queued within one tick, so they go out as a single frame
+        for j in range(count):
+            node0.send(1, ("tag", (b"x", j)))
+        received = [await asyncio.wait_for(node1.recv(), 5) for _ in range(count)]
+        assert received == [(0, ("tag", (b"x", j))) for j in range(count)]
+        assert node0.msgs_sent == count
+        assert node0.frames_sent == 1
+
+        # a small byte budget splits them up, still in order
+        node1.max_frame_bytes = 1
+        for j in range(3):
+            node1.send(0, ("tag", (b"y", j)))
+        received = [await asyncio.wait_for(node0.recv(), 5) for _ in range(3)]
+        assert received == [(1, ("tag", (b"y", j))) for j in range(3)]
+        assert node1.frames_sent == 3
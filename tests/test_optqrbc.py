@@ -1,5 +1,5 @@
 from benchmark.test_benchmark_rbc import rbc
-from adkg.broadcast.optqrbc import optqrbc
+from adkg.broadcast.optqrbc import optqrbc, RBCMsgType, hash
 from random import randint
 from pytest import mark
 from asyncio import create_task, gather
@@ -45,3 +45,82 @@ async def test_rbc(test_router):
         task.cancel()
     
 
+
+
+async def _run_with_faults(test_router, filters, stripe_threshold=None):
+    """ Runs optqrbc from leader 0 with n=4, dropping (or rewriting) the
+    messages matched by `filters[sender]`, and returns the outputs. """
+    n, t = 4, 1
+    sends, recvs, _ = test_router(n)
+    msg = os.urandom(1000)
+    outputs = [Queue() for _ in range(n)]
+
+    async def predicate(m=None):
+        return True
+
+    def faulty(i):
+        def _send(dest, o):
+            o = filters[i](dest, o) if i in filters else o
+            if o is not None:
+                sends[i](dest, o)
+        return _send
+
+    tasks = [
+        create_task(optqrbc("sidA", i, n, t, 0, predicate, msg, outputs[i].put_nowait, faulty(i), recvs[i], stripe_threshold=stripe_threshold))
+        for i in range(n)
+    ]
+    outs = [await outputs[i].get() for i in range(n)]
+    for task in tasks:
+        task.cancel()
+    return msg, outs
+
+
+@mark.asyncio
+async def test_rbc_add_fallback(test_router):
+    # the leader never proposes to node 3, which rebuilds the message
+    def leader(dest, o):
+        return None if dest == 3 and o[0] == RBCMsgType.PROPOSE else o
+
+    msg, outs = await _run_with_faults(test_router, {0: leader})
+    assert outs == [msg] * 4
+
+
+@mark.asyncio
+async def test_rbc_add_fallback_bad_stripes(test_router):
+    def leader(dest, o):
+        return None if dest == 3 and o[0] == RBCMsgType.PROPOSE else o
+
+    # node 1 answers the fallback with garbage under its own root
+    def corrupt(dest, o):
+        if o[0] != RBCMsgType.ADD_DISPERSE:
+            return o
+        junk = os.urandom(len(o[2]))
+        return (o[0], hash(junk), junk, o[3], junk, o[5])
+
+    msg, outs = await _run_with_faults(test_router, {0: leader, 1: corrupt})
+    assert outs == [msg] * 4
+
+
+@mark.asyncio
+async def test_rbc_stripes(test_router):
+    # the leader disperses stripes instead of proposing
+    def leader(dest, o):
+        assert o[0] != RBCMsgType.PROPOSE
+        return o
+
+    msg, outs = await _run_with_faults(test_router, {0: leader}, stripe_threshold=100)
+    assert outs == [msg] * 4
+
+
+@mark.asyncio
+async def test_rbc_stripes_missing(test_router):
+    # node 3 gets no stripe from the leader and node 2 never echoes its own,
+    # yet f+1 echoed stripes suffice
+    def leader(dest, o):
+        return None if dest == 3 and o[0] == RBCMsgType.STRIPE else o
+
+    def silent(dest, o):
+        return None if o[0] == RBCMsgType.STRIPE_ECHO else o
+
+    msg, outs = await _run_with_faults(test_router, {0: leader, 2: silent}, stripe_threshold=0)
+    assert outs == [msg] * 4
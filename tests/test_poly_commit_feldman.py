@@ -31,4 +31,12 @@ def test_pc_const():
     assert pc.verify_eval(c, 20, phi(20))
     assert pc.verify_eval(c, 0, phi(0))
     assert not pc.verify_eval(c, 3, phi(4))
-    assert not pc.verify_eval(c, 3, ZR.rand())
\ No newline at end of file
+    assert not pc.verify_eval(c, 3, ZR.rand())
+
+def test_verify_eval_many():
+    t = 5
+    pc = PolyCommitFeldman(G1.rand())
+    phis = [polynomials_over(ZR).random(t) for _ in range(3)]
+    cs = [pc.commit(phi) for phi in phis]
+    assert pc.verify_eval_many(cs, 3, [phi(3) for phi in phis])
+    assert not pc.verify_eval_many(cs, 3, [phis[0](3), phis[1](4), phis[2](3)])
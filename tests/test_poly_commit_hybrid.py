@@ -0,0 +1,17 @@
+from pypairing import ZR, G1, blsmultiexp as multiexp
+from adkg.polynomial import polynomials_over
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+
+
+def test_verify_eval_many():
+    t = 5
+    pc = PolyCommitHybrid(G1.rand(), G1.rand(), ZR, multiexp)
+    poly = polynomials_over(ZR)
+    phis = [poly.random(t) for _ in range(3)]
+    phis_hat = [None] + [poly.random(t) for _ in range(2)]
+    cs = [pc.commit(phi, phi_hat) for phi, phi_hat in zip(phis, phis_hat)]
+    hats_at_3 = [None] + [phi_hat(3) for phi_hat in phis_hat[1:]]
+
+    assert pc.verify_eval_many(cs, 3, [phi(3) for phi in phis], hats_at_3)
+    assert not pc.verify_eval_many(cs, 3, [phi(3) for phi in phis], [None, hats_at_3[2], hats_at_3[1]])
+    assert not pc.verify_eval_many(cs, 3, [phis[0](4), phis[1](3), phis[2](3)], hats_at_3)
@@ -151,3 +151,22 @@ def test_rust_poly_interpolate_at_random(rust_field, rust_polynomial):
     values = [(i, random_poly(i)) for i in range(t + 1)]
     k = rust_field.random()
     assert rust_polynomial.interpolate_at(values, k) == random_poly(k)
+
+
+def test_evaluate_many(galois_field, polynomial):
+    polys = [polynomial.random(randint(0, 10)) for _ in range(4)]
+    xs = [galois_field.random() for _ in range(8)]
+    evals = polynomial.evaluate_many(polys, xs)
+    assert evals == [[p(x) for x in xs] for p in polys]
+
+
+def test_rust_poly_evaluate_many(rust_field, rust_polynomial):
+    t = randint(1, 10)
+    polys = [rust_polynomial.random(t) for _ in range(4)]
+    # consecutive points, as used by the ACSS dealer
+    evals = rust_polynomial.evaluate_many(polys, range(1, 4 * t + 1))
+    assert evals == [[p(x) for x in range(1, 4 * t + 1)] for p in polys]
+
+    xs = [rust_field.random() for _ in range(8)]
+    evals = rust_polynomial.evaluate_many(polys, xs)
+    assert evals == [[p(x) for x in xs] for p in polys]
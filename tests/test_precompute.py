@@ -0,0 +1,43 @@
+from pytest import mark
+from itertools import count
+from adkg.utils.precompute import PrecomputePool
+from adkg.acss_ht import prepare_dealer_bundle
+from adkg.polynomial import polynomials_over
+from adkg.utils.fixed_base import fixed_base
+from adkg.poly_commit_hybrid import PolyCommitHybrid
+from pypairing import ZR, G1, blsmultiexp as multiexp
+
+
+@mark.asyncio
+async def test_precompute_pool():
+    pool = PrecomputePool(count().__next__, 2)
+    assert pool.get_nowait() is None
+    await pool.fill()
+    assert pool.ready.qsize() == 2
+    items = [pool.get_nowait(), await pool.get(), await pool.get()]
+    assert items == [0, 1, 2]
+    pool.stop()
+
+
+def test_dealer_bundle_with_values():
+    n, t, sc = 4, 1, 3
+    g, h = G1.rand(b'g'), G1.rand(b'h')
+    sks = [ZR.random() for _ in range(n)]
+    pks = [g**sk for sk in sks]
+    pc = PolyCommitHybrid(g, h, ZR, multiexp)
+
+    bundle = prepare_dealer_bundle(pks, g, n, t, sc, pc, ZR, G1)
+    assert bundle.shared_keys == [bundle.ephemeral_public_key**sk for sk in sks]
+    values = [ZR.random(), bundle.secrets[1], ZR.random()]
+    bundle.with_values(values, fixed_base(g))
+    assert bundle.secrets == values
+
+    phis, phis_hat = bundle.evals[:sc], bundle.evals[sc:]
+    for i in range(n):
+        assert pc.verify_eval_many(
+            bundle.commitments, i + 1, [phi[i] for phi in phis], [None] + [phi_hat[i] for phi_hat in phis_hat]
+        )
+    # the shifted shares interpolate to the new secrets
+    poly = polynomials_over(ZR)
+    for k in range(sc):
+        assert poly.interpolate_at([(i + 1, phis[k][i]) for i in range(n)], 0) == values[k]
@@ -0,0 +1,25 @@
+from pytest import mark
+import asyncio
+from adkg.utils.readiness import DealerReadiness
+
+
+@mark.asyncio
+async def test_dealer_readiness():
+    ready = DealerReadiness(4)
+    ready.mark_ready(1)
+    subset = ready.wait_subset([0, 1, 2])
+    single = ready.wait_for(3)
+    count = ready.wait_count(3)
+    assert ready.wait_subset([1]).done()
+
+    ready.mark_ready(0)
+    ready.mark_ready(0)
+    await asyncio.sleep(0)
+    assert not subset.done() and not count.done()
+
+    ready.mark_ready(2)
+    assert subset.done() and count.done()
+    assert not single.done()
+    ready.mark_ready(3)
+    await asyncio.wait_for(single, 1)
+    assert ready.wait_count(4).done()
@@ -0,0 +1,26 @@
+from pytest import mark, raises
+from pypairing import ZR, G1, Curve25519ZR, Curve25519G
+from adkg.utils.serilization import Serial
+
+
+@mark.parametrize("G, F", [(G1, ZR), (Curve25519G, Curve25519ZR)])
+def test_serial_roundtrip(G, F):
+    sr = Serial(G)
+    gs = [G.rand() for _ in range(5)]
+    fs = [F.rand() for _ in range(7)]
+    gsb, fsb = sr.serialize_gs(gs), sr.serialize_fs(fs)
+    assert gsb == b"".join(g.__getstate__() for g in gs)
+    assert fsb == b"".join(f.__getstate__() for f in fs)
+
+    # decoding works on views into a larger message
+    msg = memoryview(bytes(gsb + fsb))
+    assert sr.deserialize_gs(msg[:len(gsb)]) == gs
+    assert sr.deserialize_fs(msg[len(gsb):]) == fs
+
+
+@mark.parametrize("G, F", [(G1, ZR), (Curve25519G, Curve25519ZR)])
+def test_from_bytes_many_rejects_partial_elements(G, F):
+    with raises(ValueError):
+        F.from_bytes_many(bytes(33))
+    with raises(ValueError):
+        G.from_bytes_many(G.rand().__getstate__()[:-1])
@@ -8,3 +8,15 @@ def test_encrypt_decrypt():
     ciphertext = SymmetricCrypto.encrypt(key, plaintext)
     plaintext_ = SymmetricCrypto.decrypt(key, ciphertext)
     assert plaintext_ == plaintext
+
+
+def test_encrypt_many():
+    keys = [uuid.uuid4().hex.encode("utf-8") for _ in range(7)]
+    plaintexts = [uuid.uuid4().bytes * 3 for _ in range(7)]
+    ct_size = SymmetricCrypto.ciphertext_size(len(plaintexts[0]))
+    for workers in [1, 3]:
+        ciphertexts = SymmetricCrypto.encrypt_many(keys, plaintexts, workers)
+        assert len(ciphertexts) == 7 * ct_size
+        for i in range(7):
+            ciphertext = bytes(ciphertexts[i * ct_size:(i + 1) * ct_size])
+            assert SymmetricCrypto.decrypt(keys[i], ciphertext) == plaintexts[i]
@@ -0,0 +1,32 @@
+import json
+from adkg.utils.tracing import Tracer
+from scripts.merge_traces import load_traces, merge
+
+
+def test_tracer_and_merge(tmp_path):
+    paths = []
+    for node in range(3):
+        clock = iter(range(node, node + 100)).__next__
+        tracer = Tracer(node, clock=clock)
+        tracer.mark("start")
+        tracer.event("acss", "output", dealer=1)
+        tracer.mark("acss_quorum")
+        tracer.mark("acss_quorum")
+        tracer.event("aba", "round", sid="B0", round=0)
+        tracer.event("aba", "decide", sid="B0", round=0, value=1)
+        tracer.event("prekey", "share", sender=2, accepted=False)
+        tracer.mark("key_done")
+        path = str(tmp_path / f"adkg-{node}.json")
+        tracer.dump(path)
+        paths.append(path)
+
+    with open(paths[0]) as f:
+        assert json.load(f)["milestones"] == {"start": 0, "acss_quorum": 3, "key_done": 8}
+
+    merged = merge(load_traces(paths))
+    assert merged["nodes"] == 3
+    assert merged["milestones"]["key_done"]["max"] == 10
+    phases = [p["phase"] for p in merged["critical_path"]]
+    assert phases == ["start->acss_quorum", "acss_quorum->key_done"]
+    assert merged["aba_max_rounds"] == {"B0": 1}
+    assert merged["prekey_rejected_shares"] == 3
@@ -1,5 +1,5 @@
 from pytest import mark
-from adkg.utils.misc import wrap_send
+from adkg.utils.misc import wrap_send, subscribe_recv
 from random import randint
 import asyncio
 
@@ -34,3 +34,66 @@ async def test_pool():
     for _ in range(10):
         pool.submit(work(q, max_tasks))
     await pool.close()
+
+
+@mark.asyncio
+async def test_subscribe_recv_lifecycle():
+    inbox = asyncio.Queue()
+    task, subscribe = subscribe_recv(inbox.get)
+
+    # messages that arrive before the subscription are buffered
+    inbox.put_nowait((1, ("a", b"x" * 10)))
+    await asyncio.sleep(0)
+    assert subscribe.stats()["a"] == {"queued": 1, "bytes": 10, "dropped": 0}
+    recv_a = subscribe("a")
+    assert await recv_a() == (1, b"x" * 10)
+    assert subscribe.held_bytes() == 0
+
+    # per-tag limits drop the excess
+    recv_b = subscribe("b", maxsize=2)
+    for i in range(3):
+        inbox.put_nowait((i, ("b", i)))
+    await asyncio.sleep(0)
+    assert subscribe.stats()["b"]["queued"] == 2
+    assert subscribe.stats()["b"]["dropped"] == 1
+    assert await recv_b() == (0, 0)
+
+    # closed tags hold nothing and drop late messages
+    subscribe.unsubscribe("b")
+    inbox.put_nowait((3, ("b", b"late")))
+    await asyncio.sleep(0)
+    assert "b" not in subscribe.stats()
+    assert subscribe.dropped_closed == 2
+
+    subscribe.close()
+    assert subscribe.stats() == {}
+    task.cancel()
+
+
+@mark.asyncio
+async def test_subscribe_recv_bounded():
+    inbox = asyncio.Queue()
+    task, subscribe = subscribe_recv(inbox.get, max_pending_bytes=1000)
+    subscribe.max_closed = 2
+
+    # messages for tags nobody subscribes to stop being buffered at the cap
+    for i in range(100):
+        inbox.put_nowait((0, ("unknown", b"x" * 100)))
+        inbox.put_nowait((0, (f"unknown{i}", b"x" * 100)))
+    await asyncio.sleep(0)
+    assert subscribe.held_bytes() <= 1000
+    assert subscribe.dropped_pending == 190
+
+    # subscribed tags do not count against it
+    recv_a = subscribe("unknown")
+    inbox.put_nowait((1, ("unknown", b"y" * 100)))
+    await asyncio.sleep(0)
+    assert subscribe.pending_bytes == 500
+    assert subscribe.stats()["unknown"]["queued"] == 6
+
+    # only the latest closed tags are remembered
+    for tag in ["unknown", "unknown0", "unknown1"]:
+        subscribe.unsubscribe(tag)
+    assert list(subscribe.closed) == ["unknown0", "unknown1"]
+    assert subscribe.pending_bytes == 300
+    task.cancel()
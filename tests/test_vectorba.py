@@ -0,0 +1,107 @@
+from adkg.broadcast.vectorba import VectorABA
+from adkg.broadcast.dleqcoin import ThresholdCoinKey
+from adkg.polynomial import polynomials_over
+from pytest import mark
+from pypairing import Curve25519ZR as ZR, Curve25519G as G1, curve25519multiexp as multiexp
+import asyncio
+import random
+
+
+class _CoinKeys:
+    def __init__(self, key):
+        self.key = key
+
+    def get(self, dealers):
+        return self.key
+
+
+def coin_keys(n, f):
+    g = G1.hash(b"g")
+    phi = polynomials_over(ZR).random(f)
+    vks = [g ** phi(i + 1) for i in range(n)]
+    return [_CoinKeys(ThresholdCoinKey(g, vks, phi(i + 1), ZR, multiexp)) for i in range(n)]
+
+
+async def _run(n, f, sends, recvs, inputs):
+    keys = coin_keys(n, f)
+    outputs = [[asyncio.Queue() for _ in range(n)] for _ in range(n)]
+    abas = []
+    for i in range(n):
+        getters = []
+        for _ in range(n):
+            q = asyncio.Queue()
+            q.put_nowait((keys[i], list(range(n))))
+            getters.append(q.get)
+        abas.append(VectorABA(
+            "B", i, n, f, getters, [q.put_nowait for q in outputs[i]], sends[i], recvs[i]
+        ))
+    tasks = [asyncio.create_task(aba.run()) for aba in abas]
+    for i in range(n):
+        for j in range(n):
+            abas[i].input(j, inputs[i][j])
+
+    async def _decisions():
+        decisions = [[await outputs[i][j].get() for j in range(n)] for i in range(n)]
+        await asyncio.gather(*tasks)
+        return decisions
+
+    return abas, await asyncio.wait_for(_decisions(), 10)
+
+
+@mark.parametrize("seed", range(4))
+@mark.asyncio
+async def test_vector_aba(seed, test_router):
+    n, f = 4, 1
+    rnd = random.Random(seed)
+    sends, recvs, _ = test_router(n, seed=seed)
+    # instance j gets unanimous inputs for even j and split inputs otherwise
+    inputs = [[(j // 2) % 2 if j % 2 == 0 else rnd.randint(0, 1) for j in range(n)] for _ in range(n)]
+
+    abas, decisions = await _run(n, f, sends, recvs, inputs)
+    for j in range(n):
+        assert len(set(decisions[i][j] for i in range(n))) == 1
+    # validity
+    for j in range(0, n, 2):
+        assert decisions[0][j] == (j // 2) % 2
+
+
+@mark.asyncio
+async def test_vector_aba_coalesces(test_router):
+    n, f = 7, 2
+    sends, recvs, _ = test_router(n, seed=0)
+    inputs = [[j % 2 for j in range(n)] for _ in range(n)]
+
+    abas, decisions = await _run(n, f, sends, recvs, inputs)
+    assert decisions == inputs
+    # Unanimous inputs decide in round 0 and terminate in round 1, with at
+    # most one flush per step (EST, AUX, AUXSET, EST2, AUX2) and round for
+    # all n instances together; one tylerba per instance sends n times that.
+    for aba in abas:
+        assert aba.messages_sent <= n * 5 * 2
+
+
+@mark.asyncio
+async def test_vector_aba_malformed(test_router):
+    n, f = 4, 1
+    rnd = random.Random(0)
+    sends, recvs, _ = test_router(n, seed=0)
+    inputs = [[j % 2 if j < 2 else rnd.randint(0, 1) for j in range(n)] for _ in range(n)]
+    # a faulty node 0 sends malformed messages next to its honest ones
+    malformed = [
+        "junk",
+        ((("x", 1),), ()),
+        (((3, 1 << n),), ()),
+        (((3, -1),), ()),
+        (((3,),), ()),
+        ((), ((n, ("COIN", 0, None)),)),
+        ((), ((0, "COIN"),)),
+        ([(3, 1)], ()),
+    ]
+    for msg in malformed:
+        for i in range(n):
+            sends[0](i, msg)
+
+    _, decisions = await _run(n, f, sends, recvs, inputs)
+    for j in range(n):
+        assert len(set(decisions[i][j] for i in range(n))) == 1
+    assert [decisions[0][j] for j in range(2)] == [0, 1]